@@ -0,0 +1,2 @@
+# Performance benchmarks. Each module can be run on its own with
+# `python -m App.benchmarks.<module>`.
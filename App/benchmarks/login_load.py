@@ -0,0 +1,101 @@
+import argparse, json, os, statistics, tempfile, threading, time
+
+# Measures /health latency while a burst of concurrent /api/login requests is
+# hashing passwords. If hashing blocked the worker, /health latency would
+# climb to the length of a hash; with hashing offloaded (App/passwords.py)
+# it should stay close to the idle baseline.
+#
+#   python -m App.benchmarks.login_load [--gevent] [--logins 40] [--concurrency 8]
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] * 1000 if samples else 0.0
+
+def summarize(samples):
+    return {
+        'count': len(samples),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+        'max_ms': round(max(samples) * 1000, 3) if samples else 0.0,
+    }
+
+def probe_health(client, stop, samples, interval):
+    while not stop.is_set():
+        start = time.perf_counter()
+        client.get('/health')
+        samples.append(time.perf_counter() - start)
+        time.sleep(interval)
+
+def run(app, logins=40, concurrency=8, interval=0.01):
+    from App.database import create_db
+    from App.controllers import create_user
+
+    with app.app_context():
+        create_db()
+        create_user('loadtest', 'loadtestpass')
+    client = app.test_client()
+
+    idle = []
+    stop = threading.Event()
+    prober = threading.Thread(target=probe_health, args=(client, stop, idle, interval))
+    prober.start()
+    time.sleep(interval * 50)
+    stop.set()
+    prober.join()
+
+    remaining = iter(range(logins))
+    lock = threading.Lock()
+    failures = []
+
+    def login_worker():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            response = client.post('/api/login', json={'username': 'loadtest', 'password': 'loadtestpass'})
+            if response.status_code != 200:
+                failures.append(response.status_code)
+
+    loaded = []
+    stop = threading.Event()
+    prober = threading.Thread(target=probe_health, args=(client, stop, loaded, interval))
+    prober.start()
+    start = time.perf_counter()
+    workers = [threading.Thread(target=login_worker) for _ in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    prober.join()
+
+    return {
+        'logins': logins,
+        'concurrency': concurrency,
+        'login_failures': len(failures),
+        'logins_per_second': round(logins / elapsed, 2),
+        'health_idle': summarize(idle),
+        'health_under_login_load': summarize(loaded),
+        'p50_slowdown': round(statistics.median(loaded) / statistics.median(idle), 2) if idle and loaded else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='/health latency during a login burst')
+    parser.add_argument('--gevent', action='store_true', help='monkey patch with gevent like the gunicorn workers')
+    parser.add_argument('--logins', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+    if args.gevent:
+        from gevent import monkey
+        monkey.patch_all()
+
+    from App.main import create_app
+    with tempfile.TemporaryDirectory() as tmp:
+        # measures hashing under load, so the login throttle is off
+        app = create_app({'TESTING': True, 'LOGIN_IP_BURST': 0, 'LOGIN_USERNAME_BURST': 0,
+                          'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}"})
+        print(json.dumps(run(app, args.logins, args.concurrency), indent=2))
+
+if __name__ == '__main__':
+    main()
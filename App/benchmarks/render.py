@@ -0,0 +1,71 @@
+import argparse, json, os, tempfile, time
+
+from .login_load import summarize
+
+# Server-rendered page throughput with the fragment cache off (every hit
+# queries and renders the whole users table) and on (the table is rendered
+# once and reused until the user table changes). Pages are requested
+# anonymously and logged in, since the header around the table differs.
+#
+#   python -m App.benchmarks.render [--users 2000] [--requests 200]
+
+PAGES = {
+    'users_anonymous': ('/users', False),
+    'users_logged_in': ('/users', True),
+    'unauthorized': ('/identify', False),
+}
+
+def time_page(client, path, headers, requests):
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        samples.append(time.perf_counter() - start)
+        if response.status_code >= 500:
+            raise RuntimeError(f'{path} returned {response.status_code}')
+    result = summarize(samples)
+    result['pages_per_second'] = round(len(samples) / sum(samples), 1)
+    return result
+
+def run_mode(database_uri, cache_type, users, requests):
+    from App.main import create_app
+    from App.database import create_db
+    from App.controllers import create_user, login
+    from .seed import seed_data
+    app = create_app({'TESTING': True, 'LOGIN_IP_BURST': 0, 'LOGIN_USERNAME_BURST': 0,
+                      'SQLALCHEMY_DATABASE_URI': database_uri, 'RESPONSE_CACHE_TYPE': cache_type})
+    with app.app_context():
+        create_db()
+        create_user('renderbench', 'renderbenchpass')
+        seed_data(users, 0, 0, prefix='render')
+        headers = {'Authorization': f"Bearer {login('renderbench', 'renderbenchpass')}"}
+    client = app.test_client()
+    results = {}
+    for name, (path, logged_in) in PAGES.items():
+        client.get(path, headers=headers if logged_in else None)  # warm up, fills the cache
+        results[name] = time_page(client, path, headers if logged_in else None, requests)
+    return results
+
+def run(users=2000, requests=200):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, cache_type in (('uncached', 'none'), ('fragment_cache', 'lru')):
+            uri = f"sqlite:///{os.path.join(tmp, mode + '.db')}"
+            results[mode] = run_mode(uri, cache_type, users, requests)
+    return {
+        'users': users,
+        'requests': requests,
+        **results,
+        'speedup': {name: round(results['fragment_cache'][name]['pages_per_second']
+                                / results['uncached'][name]['pages_per_second'], 2) for name in PAGES},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='server-rendered page throughput with and without fragment caching')
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.users, args.requests), indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import itertools, random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+
+from werkzeug.security import generate_password_hash
+
+from App.models import User, Internship, Application
+from App.database import db
+from App.controllers import rebuild_counts, rebuild_search_index
+from App.passwords import hash_method
+
+# Deterministic synthetic data for benchmarks. Popularity is skewed the way
+# real traffic is: a few employers post most internships and a few
+# internships attract most applications (Zipf-like weights), so indexes and
+# caches are exercised on hot and cold rows alike.
+
+FIELDS = ['software', 'data', 'marketing', 'finance', 'design', 'research', 'operations', 'sales',
+          'security', 'hardware', 'product', 'legal', 'health', 'education', 'energy', 'logistics']
+ROLES = ['intern', 'assistant', 'analyst', 'developer', 'engineer', 'associate', 'trainee']
+WORDS = ['python', 'excel', 'sql', 'java', 'cloud', 'writing', 'statistics', 'testing', 'figma', 'linux',
+         'customers', 'reports', 'dashboards', 'campaigns', 'research', 'teamwork', 'budgets', 'api',
+         'mobile', 'web', 'networks', 'compliance', 'modelling', 'presentations', 'automation', 'support']
+STATUS_WEIGHTS = {'pending': 70, 'shortlisted': 15, 'accepted': 5, 'rejected': 10}
+CHUNK = 1000
+
+
+def zipf_weights(count, skew=1.1):
+    return list(itertools.accumulate(1 / (rank + 1) ** skew for rank in range(count)))
+
+def insert_rows(model, rows):
+    ids = []
+    for start in range(0, len(rows), CHUNK):
+        ids.extend(db.session.scalars(db.insert(model).returning(model.id), rows[start:start + CHUNK]).all())
+    return ids
+
+# `count` timestamps within the last `days` days, oldest first, bunched
+# towards the present the way sign-ups and applications grow.
+def spread_timestamps(rng, count, days, now):
+    return sorted(now - timedelta(days=days * rng.random() ** 2) for _ in range(count))
+
+# Inserts `users` users (about 5% employers, 1% staff, the rest students),
+# `internships` internships and up to `applications` distinct applications,
+# all with the same password, created over the last `days` days. The
+# password is hashed once, so seeding cost does not depend on the hash
+# policy; `hash_each` gives every user their own salted hash instead,
+# computed in a process pool. Returns the ids that were created.
+def seed_data(users=2000, internships=500, applications=10000, seed=0, password='pass', prefix='bench',
+              days=365, hash_each=False):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    hashed = generate_password_hash(password, hash_method())
+    employer_count = max(1, users // 20)
+    staff_count = max(1, users // 100)
+    student_count = max(1, users - employer_count - staff_count)
+
+    def user_rows(role, count):
+        if hash_each:
+            with ProcessPoolExecutor() as pool:
+                hashes = list(pool.map(partial(generate_password_hash, method=hash_method()),
+                                       [password] * count, chunksize=max(1, count // 64)))
+        else:
+            hashes = [hashed] * count
+        return [{'username': f'{prefix}_{role}{number}', 'password': hashes[number - 1], 'role': role}
+                for number in range(1, count + 1)]
+
+    students = insert_rows(User, user_rows('student', student_count))
+    employers = insert_rows(User, user_rows('employer', employer_count))
+    staff = insert_rows(User, user_rows('staff', staff_count))
+
+    posters = rng.choices(employers, cum_weights=zipf_weights(len(employers)), k=internships)
+    posted = spread_timestamps(rng, internships, days, now)
+    internship_ids = insert_rows(Internship, [{
+        'employer_id': employer_id,
+        'title': f'{rng.choice(FIELDS).title()} {rng.choice(ROLES).title()}',
+        'description': ' '.join(rng.choices(WORDS, k=rng.randint(8, 30))),
+        'is_active': rng.random() > 0.1,
+        'created_at': created_at,
+    } for employer_id, created_at in zip(posters, posted)])
+    posted_at = dict(zip(internship_ids, posted))
+
+    # sampling skewed pairs gets slow near saturation, so stay well below it
+    applications = min(applications, len(students) * len(internship_ids) // 2)
+    popular = zipf_weights(len(internship_ids))
+    active = zipf_weights(len(students), skew=0.8)
+    statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+    pairs = set()
+    while len(pairs) < applications:
+        batch = zip(rng.choices(students, cum_weights=active, k=CHUNK),
+                    rng.choices(internship_ids, cum_weights=popular, k=CHUNK))
+        for pair in batch:
+            pairs.add(pair)
+            if len(pairs) == applications:
+                break
+    # rows are built a chunk at a time so a million applications never sit
+    # in memory as dicts; each is made after its internship was posted
+    ordered = sorted(pairs)
+    for start in range(0, len(ordered), CHUNK):
+        db.session.execute(db.insert(Application), [{
+            'student_id': student_id, 'internship_id': internship_id,
+            'status': rng.choices(statuses, status_weights)[0],
+            'created_at': posted_at[internship_id] + (now - posted_at[internship_id]) * rng.random(),
+        } for student_id, internship_id in ordered[start:start + CHUNK]])
+    db.session.commit()
+
+    rebuild_counts()
+    rebuild_search_index()
+    return {'students': students, 'employers': employers, 'staff': staff,
+            'internships': internship_ids, 'applied': pairs, 'password': password, 'prefix': prefix}
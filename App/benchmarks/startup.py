@@ -0,0 +1,57 @@
+import argparse, json, os, statistics, subprocess, sys
+
+# Cold start cost of a web worker: a fresh interpreter imports wsgi.py, as
+# gunicorn does, and serves its first request. Each run is a new process so
+# nothing is cached between runs; `python -X importtime` attributes the
+# import time to the slowest packages.
+#
+#   python -m App.benchmarks.startup [--runs 5] [--top 10]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIRST_REQUEST = '''
+import json, time
+start = time.perf_counter()
+import wsgi
+imported = time.perf_counter()
+wsgi.app.test_client().get('/health')
+served = time.perf_counter()
+print(json.dumps({'import_ms': (imported - start) * 1000, 'first_request_ms': (served - start) * 1000}))
+'''
+
+def run_once(extra_args=()):
+    result = subprocess.run([sys.executable, *extra_args, '-c', FIRST_REQUEST], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+# Sums the self time of every module in `-X importtime` output by top-level
+# package, e.g. all of sqlalchemy.* under "sqlalchemy".
+def slowest_imports(importtime_output, top):
+    packages = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(own)
+    return sorted(((us, name) for name, us in packages.items()), reverse=True)[:top]
+
+def run(runs=5, top=10):
+    samples = [run_once()[0] for _ in range(runs)]
+    _, importtime = run_once(['-X', 'importtime'])
+    return {
+        'runs': runs,
+        'import_ms': round(statistics.median(sample['import_ms'] for sample in samples), 1),
+        'first_request_ms': round(statistics.median(sample['first_request_ms'] for sample in samples), 1),
+        'slowest_imports_ms': {name: round(us / 1000, 1) for us, name in slowest_imports(importtime, top)},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='worker cold start: import time and time to first request')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.top), indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+import argparse, json, os, platform, random, sys, tempfile, time
+
+from .login_load import summarize
+from .seed import seed_data, FIELDS
+
+# Seeds a database with configurable volumes, then times the controllers and
+# the HTTP endpoints (through the Flask test client). Results are JSON; a
+# benchmark regresses when its median exceeds the baseline's median by more
+# than `tolerance` (and by at least NOISE_FLOOR_MS, so sub-millisecond
+# jitter never fails a run).
+#
+#   flask test bench [--users 2000 --internships 500 --applications 10000]
+#   python -m App.benchmarks.suite --baseline App/benchmarks/baseline.json
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_TOLERANCE = 0.25
+NOISE_FLOOR_MS = 1.0
+# password hashing is deliberately slow, so login benchmarks run fewer times
+LOGIN_ITERATIONS = 5
+
+
+def time_calls(fn, iterations):
+    samples = []
+    for number in range(iterations):
+        start = time.perf_counter()
+        fn(number)
+        samples.append(time.perf_counter() - start)
+    result = summarize(samples)
+    result['mean_ms'] = round(sum(samples) / len(samples) * 1000, 3)
+    return result
+
+def expect_ok(response):
+    if response.status_code != 200:
+        raise RuntimeError(f'{response.request.path} returned {response.status_code}')
+    return response
+
+def controller_benchmarks(data, rng):
+    from App.controllers import (login, create_application, get_student_applications, get_internships_page,
+                                 get_applications_page, get_users_page, search_internships)
+    students, internships = data['students'], data['internships']
+    fresh = iter(sorted(
+        {(rng.choice(students), rng.choice(internships)) for _ in range(5000)} - data['applied']
+    ))
+    username = f"{data['prefix']}_student1"
+    return {
+        'login': (lambda n: login(username, data['password']), LOGIN_ITERATIONS),
+        'create_application': (lambda n: create_application(*next(fresh)), None),
+        'get_student_applications': (lambda n: get_student_applications(rng.choice(students)), None),
+        'get_internships_page': (lambda n: get_internships_page(after=rng.choice(internships)), None),
+        'get_applications_page': (lambda n: get_applications_page(after=rng.randint(1, len(data['applied']))), None),
+        'get_users_page': (lambda n: get_users_page(role='student', after=rng.choice(students)), None),
+        'search_internships': (lambda n: search_internships(rng.choice(FIELDS)), None),
+    }
+
+def http_benchmarks(client, data, rng):
+    from App.controllers import login
+    staff = {'Authorization': f"Bearer {login(data['prefix'] + '_staff1', data['password'])}"}
+    student = {'Authorization': f"Bearer {login(data['prefix'] + '_student1', data['password'])}"}
+    students, internships = data['students'], data['internships']
+    credentials = {'username': f"{data['prefix']}_student1", 'password': data['password']}
+    return {
+        'http_login': (lambda n: expect_ok(client.post('/api/login', json=credentials)), LOGIN_ITERATIONS),
+        'http_internships': (lambda n: expect_ok(client.get(f'/api/internships?after={rng.choice(internships)}')), None),
+        'http_users': (lambda n: expect_ok(client.get(f'/api/users?role=student&after={rng.choice(students)}')), None),
+        'http_applications': (lambda n: expect_ok(client.get(
+            f"/api/applications?after={rng.randint(1, len(data['applied']))}", headers=staff)), None),
+        'http_student_applications': (lambda n: expect_ok(client.get('/api/applications', headers=student)), None),
+        'http_search': (lambda n: expect_ok(client.get(f'/api/internships/search?q={rng.choice(FIELDS)}')), None),
+        'http_users_page': (lambda n: expect_ok(client.get('/users')), None),
+        'http_users_page_logged_in': (lambda n: expect_ok(client.get('/users', headers=student)), None),
+    }
+
+def run(app, users=2000, internships=500, applications=10000, iterations=50, seed=0, only=None):
+    from App.database import create_db
+    rng = random.Random(seed)
+    with app.app_context():
+        create_db()
+        start = time.perf_counter()
+        data = seed_data(users, internships, applications, seed)
+        seconds = time.perf_counter() - start
+        benchmarks = controller_benchmarks(data, rng)
+        benchmarks.update(http_benchmarks(app.test_client(), data, rng))
+        results = {}
+        for name, (fn, count) in benchmarks.items():
+            if only and name not in only:
+                continue
+            results[name] = time_calls(fn, min(count or iterations, iterations))
+    return {
+        'meta': {
+            'users': users, 'internships': internships, 'applications': applications,
+            'iterations': iterations, 'seed': seed, 'seed_seconds': round(seconds, 2),
+            'python': platform.python_version(), 'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+        },
+        'results': results,
+    }
+
+# Returns (name, baseline p50, current p50) for every benchmark over budget.
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    for name, budget in baseline['results'].items():
+        result = current['results'].get(name)
+        if result is None:
+            continue
+        limit = max(budget['p50_ms'] * (1 + tolerance), budget['p50_ms'] + NOISE_FLOOR_MS)
+        if result['p50_ms'] > limit:
+            regressions.append((name, budget['p50_ms'], result['p50_ms']))
+    return regressions
+
+def volumes_differ(current, baseline):
+    return any(current['meta'][key] != baseline['meta'].get(key) for key in ('users', 'internships', 'applications'))
+
+def existing_tables(database_uri):
+    from sqlalchemy import create_engine, inspect
+    engine = create_engine(database_uri)
+    try:
+        return inspect(engine).get_table_names()
+    finally:
+        engine.dispose()
+
+# Runs the suite against a throwaway SQLite database (or `database_uri`, which
+# must be empty: it is seeded and its tables are dropped afterwards),
+# writes the results and returns the process exit status.
+def run_suite(users, internships, applications, iterations, seed, output, baseline_path, tolerance,
+              update_baseline=False, database_uri=None, only=None, echo=print):
+    from App.main import create_app
+    if database_uri:
+        existing = existing_tables(database_uri)
+        if existing:
+            echo(f"refusing to benchmark {database_uri}: it already has tables ({', '.join(existing)}). "
+                 "Point --database-uri at an empty database.")
+            return 2
+    with tempfile.TemporaryDirectory() as tmp:
+        # the login benchmarks would otherwise time the throttle's 429s
+        app = create_app({'TESTING': True, 'LOGIN_IP_BURST': 0, 'LOGIN_USERNAME_BURST': 0,
+                          'SQLALCHEMY_DATABASE_URI': database_uri or f"sqlite:///{os.path.join(tmp, 'bench.db')}"})
+        results = run(app, users, internships, applications, iterations, seed, only)
+        if database_uri:
+            # the database was empty, so every table in it is one the suite created
+            with app.app_context():
+                from App.database import db
+                db.drop_all()
+    if output:
+        with open(output, 'w') as out:
+            json.dump(results, out, indent=2)
+    for name, result in results['results'].items():
+        echo(f"{name:28} p50 {result['p50_ms']:9.3f} ms   p99 {result['p99_ms']:9.3f} ms")
+    if update_baseline:
+        with open(baseline_path, 'w') as out:
+            json.dump(results, out, indent=2)
+        echo(f'baseline written to {baseline_path}')
+        return 0
+    if not baseline_path or not os.path.exists(baseline_path):
+        return 0
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if volumes_differ(results, baseline):
+        echo('note: data volumes differ from the baseline, comparisons are approximate')
+    regressions = compare(results, baseline, tolerance)
+    for name, before, after in regressions:
+        echo(f'REGRESSION {name}: p50 {before} ms -> {after} ms')
+    return 1 if regressions else 0
+
+def main():
+    parser = argparse.ArgumentParser(description='seeded controller and endpoint benchmarks')
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--internships', type=int, default=500)
+    parser.add_argument('--applications', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench-results.json')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--database-uri')
+    args = parser.parse_args()
+    sys.exit(run_suite(args.users, args.internships, args.applications, args.iterations, args.seed, args.output,
+                       args.baseline, args.tolerance, args.update_baseline, args.database_uri))
+
+if __name__ == '__main__':
+    main()
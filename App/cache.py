@@ -0,0 +1,184 @@
+import hashlib, itertools, os, pickle, threading, time, uuid
+from collections import OrderedDict
+
+
+class LRUCache:
+    # Thread-safe in-process cache bounded by entry count and, optionally, by
+    # the total size callers report for their values. Entries may expire
+    # after a time to live. Counts hits and misses for monitoring.
+    #
+    # Version counters (see get_version/bump_version) live outside the LRU so
+    # they are never evicted.
+
+    def __init__(self, maxsize=1024, ttl=None, maxbytes=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._data = OrderedDict()  # key -> (expires_at, size, value)
+        self._versions = {}
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return default
+
+    def set(self, key, value, size=0):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (expires_at, size, value)
+            self.bytes += size
+            while len(self._data) > self.maxsize or (self.maxbytes and self.bytes > self.maxbytes and len(self._data) > 1):
+                self._remove(next(iter(self._data)))
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def get_version(self, name):
+        return self._versions.get(name, 0)
+
+    def bump_version(self, name):
+        with self._lock:
+            self._versions[name] = next(self._counter)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize,
+                'bytes': self.bytes}
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+
+class FileCache:
+    # Cache shared by every worker on the host through a directory, standing
+    # in for memcached/redis. Values are pickled into files named by the hash
+    # of their key and written atomically. When more than `maxbytes` have been
+    # written since the last sweep, the least recently written files are
+    # removed until the directory is back under the limit. A version bump
+    # writes a fresh random token, so concurrent bumps need no locking.
+
+    def __init__(self, directory, ttl=None, maxbytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self._written = 0
+        os.makedirs(os.path.join(directory, 'versions'), exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, key, default=None):
+        try:
+            with open(self._path(key), 'rb') as entry:
+                expires_at, value = pickle.load(entry)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return default
+        if expires_at is not None and expires_at <= time.time():
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key, value, size=0):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        data = pickle.dumps((expires_at, value), pickle.HIGHEST_PROTOCOL)
+        self._write(self._path(key), data)
+        self._written += len(data)
+        if self.maxbytes and self._written > self.maxbytes // 10:
+            self.sweep()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def get_version(self, name):
+        try:
+            with open(os.path.join(self.directory, 'versions', name), 'r') as version:
+                return version.read()
+        except FileNotFoundError:
+            return ''
+
+    def bump_version(self, name):
+        self._write(os.path.join(self.directory, 'versions', name), uuid.uuid4().hex.encode())
+
+    def sweep(self):
+        self._written = 0
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.maxbytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+    def _entries(self):
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir() or shard.name == 'versions':
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.tmp'):
+                    continue
+                stat = entry.stat()
+                yield entry.path, stat.st_mtime, stat.st_size
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'directory': self.directory}
+
+
+# RESPONSE_CACHE_TYPE is 'lru' (per worker), 'file' (shared by the workers on
+# this host) or 'none'.
+def create_cache(config):
+    kind = config.get('RESPONSE_CACHE_TYPE', 'lru')
+    ttl = config.get('RESPONSE_CACHE_TTL')
+    maxbytes = config.get('RESPONSE_CACHE_MAX_BYTES')
+    if kind == 'file':
+        return FileCache(config['RESPONSE_CACHE_DIR'], ttl, maxbytes)
+    if kind == 'lru':
+        return LRUCache(config.get('RESPONSE_CACHE_SIZE', 1024), ttl, maxbytes)
+    return None
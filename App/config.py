@@ -1,5 +1,13 @@
 import os
 
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # KiB
+}
+
 def load_config(app, overrides):
     if os.path.exists(os.path.join('./App', 'custom_config.py')):
         app.config.from_object('App.custom_config')
@@ -16,4 +24,64 @@ def load_config(app, overrides):
     app.config["JWT_COOKIE_CSRF_PROTECT"] = False
     app.config['FLASK_ADMIN_SWATCH'] = 'darkly'
     for key in overrides:
-        app.config[key] = overrides[key]
\ No newline at end of file
+        app.config[key] = overrides[key]
+    app.config.setdefault('DB_POOL_SIZE', 20)
+    app.config.setdefault('DB_MAX_OVERFLOW', 20)
+    app.config.setdefault('DB_POOL_TIMEOUT', 10)
+    app.config.setdefault('DB_POOL_RECYCLE', 1800)
+    app.config.setdefault('DB_POOL_PRE_PING', True)
+    app.config.setdefault('SQLITE_PRAGMAS', dict(SQLITE_PRAGMAS))
+    app.config.setdefault('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    app.config.setdefault('USER_CACHE_TTL', 30)
+    app.config.setdefault('USER_CACHE_SIZE', 1024)
+    # 'file' shares cached responses and table versions between the workers on
+    # this host; 'lru' keeps them per worker and 'none' turns caching off
+    app.config.setdefault('RESPONSE_CACHE_TYPE', 'lru' if app.testing else 'file')
+    app.config.setdefault('RESPONSE_CACHE_DIR', os.path.join(app.instance_path, 'response-cache'))
+    app.config.setdefault('RESPONSE_CACHE_SIZE', 1024)
+    app.config.setdefault('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+    app.config.setdefault('RESPONSE_CACHE_TTL', 3600)
+    # per-process metric files under METRICS_DIR are summed by /metrics
+    app.config.setdefault('METRICS_DIR', None if app.testing else os.path.join(app.instance_path, 'metrics'))
+    app.config.setdefault('METRICS_FLUSH_INTERVAL', 1.0)
+    # statements slower than this many milliseconds go to the App.slow_queries log (None disables)
+    app.config.setdefault('SLOW_QUERY_MS', 200)
+    app.config.setdefault('NOTIFICATION_SINKS', ['memory'] if app.testing else ['file'])
+    app.config.setdefault('NOTIFICATION_FILE', os.path.join(app.instance_path, 'notifications.jsonl'))
+    app.config.setdefault('SMTP_HOST', 'localhost')
+    app.config.setdefault('SMTP_PORT', 25)
+    app.config.setdefault('MAIL_SENDER', 'no-reply@localhost')
+    app.config.setdefault('MAIL_DOMAIN', 'localhost')
+    app.config.setdefault('OUTBOX_BATCH_SIZE', 100)
+    app.config.setdefault('OUTBOX_POLL_SECONDS', 1.0)
+    app.config.setdefault('OUTBOX_LEASE_SECONDS', 60)
+    app.config.setdefault('OUTBOX_MAX_ATTEMPTS', 10)
+    app.config.setdefault('OUTBOX_RETRY_BASE_SECONDS', 5)
+    app.config.setdefault('OUTBOX_RETRY_MAX_SECONDS', 3600)
+    app.config.setdefault('UPLOADED_RESUMES_DEST', os.path.join(app.instance_path, 'resumes'))
+    app.config.setdefault('RESUME_MAX_BYTES', 5 * 1024 * 1024)
+    # unreferenced uploads are kept this long before `flask uploads gc` deletes them
+    app.config.setdefault('UPLOAD_GC_GRACE_SECONDS', 3600)
+    app.config.setdefault('RESUME_EXTRACT_WORKERS', 0 if app.testing else min(4, os.cpu_count() or 1))
+    # proxies in front of the app whose X-Forwarded-For/-Proto are trusted
+    # (1 on Render); the login throttle keys on the client IP they report
+    app.config.setdefault('TRUSTED_PROXY_HOPS', 0)
+    # login attempts allowed in a burst and refilled per minute, per client IP
+    # and per username; the buckets live in LOGIN_THROTTLE_PATH, shared by all
+    # workers (in memory when unset)
+    app.config.setdefault('LOGIN_THROTTLE_PATH', None if app.testing else os.path.join(app.instance_path, 'login-throttle.db'))
+    app.config.setdefault('LOGIN_IP_BURST', 20)
+    app.config.setdefault('LOGIN_IP_PER_MINUTE', 30)
+    app.config.setdefault('LOGIN_USERNAME_BURST', 5)
+    app.config.setdefault('LOGIN_USERNAME_PER_MINUTE', 5)
+    # admin list pages show cached or estimated totals and count filtered
+    # results only up to a cap
+    app.config.setdefault('ADMIN_COUNT_TTL', 60)
+    app.config.setdefault('ADMIN_COUNT_CAP', 10000)
+    # `flask archive run` moves decided applications and closed internships
+    # older than this out of the hot tables
+    app.config.setdefault('ARCHIVE_AFTER_DAYS', 365)
+    app.config.setdefault('ARCHIVE_BATCH_SIZE', 1000)
+    # tests keep the search indexes in memory so runs never share state on disk
+    app.config.setdefault('SEARCH_INDEX_PATH', None if app.testing else os.path.join(app.instance_path, 'search-index'))
+    app.config.setdefault('APPLICANT_INDEX_PATH', None if app.testing else os.path.join(app.instance_path, 'applicant-index'))
\ No newline at end of file
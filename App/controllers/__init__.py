@@ -1,5 +1,18 @@
+from .pagination import *
 from .user import *
 from .auth import *
 from .initialize import *
 from .internship import *
 from .application import *
+from .search import *
+from .recommendation import *
+from .importer import *
+from .stats import *
+from .caching import *
+from .outbox import *
+from .notification import *
+from .export import *
+from .upload import *
+from .resume import *
+from .throttle import *
+from .archive import *
@@ -1,56 +1,219 @@
-from App.models import Application, User, Internship
-from App.database import db
+from datetime import datetime
+
+from sqlalchemy.orm import joinedload
+
+from App.models import Application, User, Internship, ArchivedApplication, ArchivedInternship
+from App.database import db, insert_ignore
+from .pagination import keyset_page, keyset_merged_page
+from .stats import bump_counts, move_counts
+from .outbox import enqueue_events
+from .resume import refresh_applicants_in_index
+
+STATUS_CHANGED = 'application.status_changed'
+
+# Submits a student's application in one INSERT ... SELECT: the row is only
+# produced when the student exists with the student role and the internship
+# exists and is open, and the unique (student, internship) index turns a
+# double submit into a no-op (ON CONFLICT DO NOTHING) instead of an error or
+# a second row. The internship's pending counter is bumped in the same
+# transaction. Returns (result, application_id) with result one of
+# 'created', 'duplicate' (the existing application's id) or 'ineligible'.
+#
+# It owns the transaction: whatever the outcome it commits the session,
+# including changes the caller left pending, and so expires loaded objects.
+# Callers should finish their own unit of work before submitting.
+def submit_application(student_id, internship_id):
+    statement = insert_ignore(Application).from_select(
+        ['student_id', 'internship_id', 'status', 'created_at'],
+        db.select(User.id, Internship.id, db.literal('pending'), db.literal(datetime.utcnow()))
+        .join(User, db.and_(User.id == student_id, User.role == 'student'))
+        .where(Internship.id == internship_id, Internship.is_active == True,
+               # an archived decision still counts for a reopened internship
+               ~db.select(ArchivedApplication.id)
+               .filter_by(student_id=student_id, internship_id=internship_id).exists())
+    ).returning(Application.id)
+    application_id = db.session.execute(statement).scalar()
+    if application_id is None:
+        # end the write transaction the no-op INSERT opened; committing
+        # rather than rolling back keeps anything the caller had pending
+        db.session.commit()
+        existing = db.session.scalar(
+            db.select(Application.id).filter_by(student_id=student_id, internship_id=internship_id)
+            .union_all(db.select(ArchivedApplication.id).filter_by(student_id=student_id, internship_id=internship_id))
+        )
+        return ('duplicate', existing) if existing is not None else ('ineligible', None)
+    bump_counts(internship_id, {'pending': 1})
+    db.session.commit()
+    # core inserts bypass the session events the applicant index listens to
+    refresh_applicants_in_index([application_id])
+    return 'created', application_id
 
 def create_application(student_id, internship_id):
-    student = User.query.get(student_id)
-    internship = Internship.query.get(internship_id)
-    
-    if not student or not student.is_student() or not internship:
+    result, application_id = submit_application(student_id, internship_id)
+    return db.session.get(Application, application_id) if result == 'created' else None
+
+def status_change(application_id, student_id, internship_id, from_status, status):
+    return {'application_id': application_id, 'student_id': student_id, 'internship_id': internship_id,
+            'from_status': from_status, 'status': status}
+
+# The single-application moves follow the same TRANSITIONS as
+# bulk_transition. Each returns the application, or None when it does not
+# exist or the actor may not make that move from its current status.
+def transition_application(application_id, actor_id, status):
+    if bulk_transition([application_id], actor_id, status)[application_id] != 'updated':
         return None
-    
-    application = Application(
-        student_id=student_id,
-        internship_id=internship_id,
-        status='pending'  
-    )
-    db.session.add(application)
-    db.session.commit()
-    return application
+    return db.session.get(Application, application_id)
 
 def shortlist_application(application_id, staff_id):
-    application = Application.query.get(application_id)
-    staff = User.query.get(staff_id)
-    
-    if not application or not staff or not staff.is_staff():
-        return None
-    
-    application.status = 'shortlisted'
-    db.session.commit()
-    return application
+    return transition_application(application_id, staff_id, 'shortlisted')
 
 def accept_application(application_id, employer_id):
-    application = Application.query.get(application_id)
-    employer = User.query.get(employer_id)
-    
-    if (not application or not employer or not employer.is_employer() or 
-        application.internship.employer_id != employer_id):
-        return None
-    
-    application.status = 'accepted'
-    db.session.commit()
-    return application
+    return transition_application(application_id, employer_id, 'accepted')
 
 def reject_application(application_id, employer_id):
-    application = Application.query.get(application_id)
-    employer = User.query.get(employer_id)
-    
-    if (not application or not employer or not employer.is_employer() or 
-        application.internship.employer_id != employer_id):
-        return None
-    
-    application.status = 'rejected'
-    db.session.commit()
+    return transition_application(application_id, employer_id, 'rejected')
+
+# Eager-load the relationships get_json() reads so a listing costs one query
+# instead of 2N+1 lazy loads.
+def with_application_relations(query):
+    return query.options(joinedload(Application.student), joinedload(Application.internship))
+
+# new status -> (role allowed to set it, statuses it may be reached from)
+TRANSITIONS = {
+    'shortlisted': ('staff', ('pending',)),
+    'accepted': ('employer', ('pending', 'shortlisted')),
+    'rejected': ('employer', ('pending', 'shortlisted')),
+}
+
+# Moves many applications to `new_status` at once. Authorization for the
+# whole set is checked with one query. The change is one
+# UPDATE ... WHERE id IN (...) per allowed source status, and its WHERE
+# clause (plus internship ownership for employers) means a concurrent change
+# can never produce an invalid transition. Counters and notifications are
+# written in the same transaction. Returns {application_id: result} with result one of
+# 'updated', 'not_found', 'forbidden' or 'invalid_transition'.
+def bulk_transition(application_ids, actor_id, new_status):
+    if new_status not in TRANSITIONS:
+        raise ValueError(f'cannot transition applications to {new_status!r}')
+    role, from_statuses = TRANSITIONS[new_status]
+    application_ids = list(dict.fromkeys(application_ids))
+    actor = db.session.get(User, actor_id)
+    if not actor or actor.role != role:
+        return {application_id: 'forbidden' for application_id in application_ids}
+
+    rows = db.session.execute(
+        db.select(Application.id, Application.status, Internship.employer_id)
+        .join(Internship, Internship.id == Application.internship_id)
+        .where(Application.id.in_(application_ids))
+    ).all()
+    found = {row.id: row for row in rows}
+    results, allowed = {}, []
+    for application_id in application_ids:
+        row = found.get(application_id)
+        if row is None:
+            results[application_id] = 'not_found'
+        elif role == 'employer' and row.employer_id != actor_id:
+            results[application_id] = 'forbidden'
+        elif row.status not in from_statuses:
+            results[application_id] = 'invalid_transition'
+        else:
+            allowed.append(application_id)
+
+    if allowed:
+        # one UPDATE per source status, so the counters know exactly which
+        # status each updated row came from
+        updated = set()
+        for from_status in from_statuses:
+            statement = (
+                db.update(Application)
+                .where(Application.id.in_(allowed), Application.status == from_status)
+                .values(status=new_status)
+                .returning(Application.id, Application.internship_id, Application.student_id)
+                .execution_options(synchronize_session=False)
+            )
+            if role == 'employer':
+                statement = statement.where(Application.internship_id.in_(
+                    db.select(Internship.id).where(Internship.employer_id == actor_id)
+                ))
+            moved, changes = {}, []
+            for application_id, internship_id, student_id in db.session.execute(statement):
+                updated.add(application_id)
+                moved[internship_id] = moved.get(internship_id, 0) + 1
+                changes.append(status_change(application_id, student_id, internship_id, from_status, new_status))
+            for internship_id, count in moved.items():
+                move_counts(internship_id, from_status, new_status, count)
+            enqueue_events(STATUS_CHANGED, changes)
+        db.session.commit()
+        for application_id in allowed:
+            # a row that changed status between our read and the update
+            results[application_id] = 'updated' if application_id in updated else 'invalid_transition'
+    return results
+
+def get_application(application_id, include_archived=False):
+    application = db.session.get(Application, application_id)
+    if application is None and include_archived:
+        application = db.session.scalar(db.select(ArchivedApplication).filter_by(id=application_id))
     return application
 
 def get_student_applications(student_id):
-    return Application.query.filter_by(student_id=student_id).all()
+    return with_application_relations(Application.query.filter_by(student_id=student_id)).all()
+
+def get_all_applications():
+    return with_application_relations(Application.query.order_by(Application.id)).all()
+
+# Same shape as Application.get_json(), but resolves student names and
+# internship titles for the whole batch in at most two queries.
+def serialize_applications(applications):
+    student_ids = {application.student_id for application in applications}
+    internship_ids = {application.internship_id for application in applications}
+    names = dict(db.session.execute(
+        db.select(User.id, User.username).where(User.id.in_(student_ids))
+    ).all()) if student_ids else {}
+    titles = dict(db.session.execute(
+        db.select(Internship.id, Internship.title).where(Internship.id.in_(internship_ids))
+    ).all()) if internship_ids else {}
+    return [{
+        'id': application.id,
+        'student_id': application.student_id,
+        'internship_id': application.internship_id,
+        'status': application.status,
+        'student_name': names.get(application.student_id),
+        'internship_title': titles.get(application.internship_id)
+    } for application in applications]
+
+def get_applications_page(limit=None, after=None, student_id=None, internship_id=None,
+                          employer_id=None, status=None, include_archived=False):
+    query = db.select(Application)
+    if student_id is not None:
+        query = query.filter_by(student_id=student_id)
+    if internship_id is not None:
+        query = query.filter_by(internship_id=internship_id)
+    if status:
+        query = query.filter_by(status=status)
+    if employer_id is not None:
+        query = query.join(Internship).where(Internship.employer_id == employer_id)
+    if not include_archived:
+        return keyset_page(with_application_relations(query), Application.id, limit, after)
+    return keyset_merged_page([
+        (with_application_relations(query), Application.id),
+        (archived_applications_query(student_id, internship_id, employer_id, status), ArchivedApplication.id),
+    ], limit, after)
+
+def archived_applications_query(student_id=None, internship_id=None, employer_id=None, status=None):
+    query = db.select(ArchivedApplication).options(
+        joinedload(ArchivedApplication.student), joinedload(ArchivedApplication.internship),
+        joinedload(ArchivedApplication.archived_internship)
+    )
+    if student_id is not None:
+        query = query.filter_by(student_id=student_id)
+    if internship_id is not None:
+        query = query.filter_by(internship_id=internship_id)
+    if status:
+        query = query.filter_by(status=status)
+    if employer_id is not None:
+        # an archived application's internship may be live or archived
+        query = query.where(ArchivedApplication.internship_id.in_(
+            db.select(Internship.id).where(Internship.employer_id == employer_id)
+            .union_all(db.select(ArchivedInternship.id).where(ArchivedInternship.employer_id == employer_id))
+        ))
+    return query
@@ -0,0 +1,164 @@
+import logging, time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func, or_
+
+from App.models import Application, Internship, InternshipStats, ArchivedApplication, ArchivedInternship
+from App.database import db
+from .stats import bump_counts
+from .search import refresh_internships_in_index
+from .resume import refresh_applicants_in_index
+
+log = logging.getLogger(__name__)
+
+# Applications whose outcome is final, and closed internships with no live
+# applications left, move to the *_archive tables once they are older than
+# ARCHIVE_AFTER_DAYS. Each batch is one transaction: the rows are deleted
+# from the hot table with RETURNING and inserted into the archive, so a row
+# that changed since it was picked (e.g. an internship reopened) is simply
+# left where it is. Counters keep covering the hot tables only.
+#
+# The row holding a table's highest id is never archived: SQLite hands out
+# max(id) + 1 for new rows, so removing it would let a new row reuse an
+# archived row's id.
+
+ARCHIVED_STATUSES = ('accepted', 'rejected')
+# academic terms by first month; the archive is partitioned per term on Postgres
+TERMS = ((1, 'spring'), (5, 'summer'), (9, 'fall'))
+
+APPLICATION_COLUMNS = ('id', 'student_id', 'internship_id', 'status', 'created_at', 'resume_id')
+INTERNSHIP_COLUMNS = ('id', 'title', 'description', 'employer_id', 'is_active', 'created_at')
+
+
+def older_than(model, cutoff):
+    # rows from before created_at was recorded count as old
+    return or_(model.created_at < cutoff, model.created_at.is_(None))
+
+def not_newest(model):
+    return model.id < db.select(func.max(model.id)).scalar_subquery()
+
+def application_candidates(cutoff):
+    return (Application.status.in_(ARCHIVED_STATUSES), older_than(Application, cutoff), not_newest(Application))
+
+def internship_candidates(cutoff):
+    return (
+        Internship.is_active == False,
+        older_than(Internship, cutoff),
+        not_newest(Internship),
+        ~db.select(Application.id).where(Application.internship_id == Internship.id).exists(),
+    )
+
+def archive_applications_batch(cutoff, batch_size, now):
+    ids = db.session.scalars(
+        db.select(Application.id).where(*application_candidates(cutoff)).order_by(Application.id).limit(batch_size)
+    ).all()
+    if not ids:
+        return 0
+    rows = [row._asdict() for row in db.session.execute(
+        db.delete(Application)
+        .where(Application.id.in_(ids), *application_candidates(cutoff))
+        .returning(*[getattr(Application, column) for column in APPLICATION_COLUMNS])
+        .execution_options(synchronize_session=False)
+    )]
+    if rows:
+        for row in rows:
+            row['created_at'] = row['created_at'] or now
+            row['archived_at'] = now
+        ensure_archive_partitions(min(row['created_at'] for row in rows), max(row['created_at'] for row in rows))
+        db.session.execute(db.insert(ArchivedApplication), rows)
+        moved = {}
+        for row in rows:
+            counts = moved.setdefault(row['internship_id'], {})
+            counts[row['status']] = counts.get(row['status'], 0) - 1
+        for internship_id, changes in moved.items():
+            bump_counts(internship_id, changes)
+    db.session.commit()
+    refresh_applicants_in_index([row['id'] for row in rows])
+    return len(rows)
+
+def archive_internships_batch(cutoff, batch_size, now):
+    ids = db.session.scalars(
+        db.select(Internship.id).where(*internship_candidates(cutoff)).order_by(Internship.id).limit(batch_size)
+    ).all()
+    if not ids:
+        return 0
+    # the counters of an internship without live applications are all zero,
+    # so dropping them is harmless even for a row that ends up staying
+    db.session.execute(
+        db.delete(InternshipStats).where(InternshipStats.internship_id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    rows = [dict(row._asdict(), archived_at=now) for row in db.session.execute(
+        db.delete(Internship)
+        .where(Internship.id.in_(ids), *internship_candidates(cutoff))
+        .returning(*[getattr(Internship, column) for column in INTERNSHIP_COLUMNS])
+        .execution_options(synchronize_session=False)
+    )]
+    if rows:
+        db.session.execute(db.insert(ArchivedInternship), rows)
+    db.session.commit()
+    refresh_internships_in_index(ids)
+    return len(rows)
+
+# Archives everything older than `days` days in batches of `batch_size`.
+# Returns {'applications': moved, 'internships': moved}.
+def run_archive(days=None, batch_size=None, now=None):
+    days = current_app.config['ARCHIVE_AFTER_DAYS'] if days is None else days
+    batch_size = batch_size or current_app.config['ARCHIVE_BATCH_SIZE']
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=days)
+    moved = {'applications': 0, 'internships': 0}
+    # applications first, so their internships have nothing left
+    for kind, archive_batch in (('applications', archive_applications_batch),
+                                ('internships', archive_internships_batch)):
+        while True:
+            count = archive_batch(cutoff, batch_size, now)
+            if not count:
+                break
+            moved[kind] += count
+    return moved
+
+def run_archive_schedule(stop, every, days=None, batch_size=None):
+    next_run = time.monotonic()
+    while not stop():
+        if time.monotonic() >= next_run:
+            moved = run_archive(days, batch_size)
+            log.info('archive: %s applications, %s internships', moved['applications'], moved['internships'])
+            db.session.remove()
+            next_run = time.monotonic() + every
+        time.sleep(min(1.0, every))
+
+
+'''
+Postgres term partitions
+'''
+
+def term_start(moment):
+    month = max(first for first, _ in TERMS if first <= moment.month)
+    return datetime(moment.year, month, 1)
+
+def next_term_start(start):
+    later = [first for first, _ in TERMS if first > start.month]
+    return datetime(start.year, later[0], 1) if later else datetime(start.year + 1, TERMS[0][0], 1)
+
+def term_name(start):
+    return f"{start.year}_{dict(TERMS)[start.month]}"
+
+# Creates the application_archive partitions for every term from `start` to
+# `end`. A no-op on databases without declarative partitioning.
+def ensure_archive_partitions(start, end):
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return []
+    names = []
+    term = term_start(start)
+    while term <= end:
+        following = next_term_start(term)
+        name = f'application_archive_{term_name(term)}'
+        db.session.execute(db.text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF application_archive "
+            f"FOR VALUES FROM ('{term.isoformat()}') TO ('{following.isoformat()}')"
+        ))
+        names.append(name)
+        term = following
+    return names
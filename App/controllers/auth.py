@@ -1,12 +1,21 @@
-from flask_jwt_extended import create_access_token, jwt_required, JWTManager, get_jwt_identity, verify_jwt_in_request
+from flask import current_app, g, has_app_context
+from flask_jwt_extended import create_access_token, jwt_required, JWTManager, get_jwt_identity, verify_jwt_in_request, get_current_user
+from sqlalchemy import event
+from werkzeug.local import LocalProxy
 
-from App.models import User
+from App.models import User, RoleMixin
 from App.database import db
+from App.cache import LRUCache
+from .caching import table_versions
 
 def login(username, password):
   result = db.session.execute(db.select(User).filter_by(username=username))
   user = result.scalar_one_or_none()
   if user and user.check_password(password):
+    # upgrade hashes made under an older PASSWORD_HASH_METHOD while we have the password
+    if user.password_needs_rehash():
+      user.set_password(password)
+      db.session.commit()
     # Store ONLY the user id as a string in JWT 'sub'
     return create_access_token(identity=str(user.id))
   return None
@@ -30,23 +39,106 @@ def setup_jwt(app):
       user_id = int(identity)
     except (TypeError, ValueError):
       return None
-    return db.session.get(User, user_id)
+    return load_user(user_id)
 
   return jwt
 
 
-# Context processor to make 'is_authenticated' available to all templates
+# Lightweight, session-independent copy of the fields requests need about the
+# logged in user. Safe to share between requests and threads.
+class CachedUser(RoleMixin):
+
+  def __init__(self, user):
+    self.id = user.id
+    self.username = user.username
+    self.role = user.role
+
+  def get_json(self):
+    return {'id': self.id, 'username': self.username, 'role': self.role}
+
+
+# USER_CACHE_TTL seconds (0 disables) and USER_CACHE_SIZE entries per worker.
+# Records are tagged with the `user` table version from the response cache,
+# which every worker shares (a directory in production), so a commit in any
+# worker retires every other worker's records on their next lookup. Without
+# a response cache only the committing worker drops its record at once.
+def get_user_cache():
+  cache = current_app.extensions.get('user_cache')
+  if cache is None:
+    cache = LRUCache(current_app.config['USER_CACHE_SIZE'], current_app.config['USER_CACHE_TTL'])
+    current_app.extensions['user_cache'] = cache
+  return cache
+
+def load_user(user_id):
+  if not current_app.config['USER_CACHE_TTL']:
+    return db.session.get(User, user_id)
+  cache = get_user_cache()
+  version = table_versions(['user'])
+  entry = cache.get(user_id)
+  if entry is None or entry[0] != version:
+    user = db.session.get(User, user_id)
+    if user is None:
+      return None
+    entry = (version, CachedUser(user))
+    cache.set(user_id, entry)
+  return entry[1]
+
+def invalidate_cached_user(user_id):
+  if has_app_context() and 'user_cache' in current_app.extensions:
+    current_app.extensions['user_cache'].delete(user_id)
+
+def user_cache_stats():
+  return get_user_cache().stats()
+
+# Any committed change to a user (update_user, role changes, admin edits,
+# deletes) drops that user's cached record.
+@event.listens_for(db.session, 'after_flush')
+def _collect_user_changes(session, flush_context):
+  changed = session.info.setdefault('changed_users', set())
+  for obj in (*session.dirty, *session.deleted):
+    if isinstance(obj, User):
+      changed.add(obj.id)
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_changed_users(session):
+  for user_id in session.info.pop('changed_users', ()):
+    invalidate_cached_user(user_id)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_user_changes(session):
+  session.info.pop('changed_users', None)
+
+
+# Resolves the logged in user at most once per request. Reuses the identity
+# jwt_required already verified and treats a missing, expired or invalid
+# token as anonymous.
+def get_request_user():
+  if 'auth_user' not in g:
+    try:
+      if g.get('_jwt_extended_jwt_user') is None:
+        verify_jwt_in_request(optional=True)
+      g.auth_user = get_current_user()
+    except Exception:
+      g.auth_user = None
+  return g.auth_user
+
+
+# create_app pushes an app context that requests reuse, so g outlives a
+# request; forget the previous request's user before handling the next one.
+def _reset_request_user():
+  for key in ('auth_user', '_jwt_extended_jwt', '_jwt_extended_jwt_header',
+              '_jwt_extended_jwt_user', '_jwt_extended_jwt_location'):
+    g.pop(key, None)
+
+
+# Context processor to make 'is_authenticated' available to all templates.
+# Both are resolved when a template first reads them, not on every render,
+# so pages and cached fragments that never look at the user skip the JWT
+# check and the user lookup.
 def add_auth_context(app):
+  app.before_request(_reset_request_user)
+
   @app.context_processor
   def inject_user():
-      try:
-          verify_jwt_in_request()
-          identity = get_jwt_identity()
-          user_id = int(identity) if identity is not None else None
-          current_user = db.session.get(User, user_id) if user_id is not None else None
-          is_authenticated = current_user is not None
-      except Exception as e:
-          print(e)
-          is_authenticated = False
-          current_user = None
-      return dict(is_authenticated=is_authenticated, current_user=current_user)
\ No newline at end of file
+      return dict(is_authenticated=LocalProxy(lambda: get_request_user() is not None),
+                  current_user=LocalProxy(get_request_user))
\ No newline at end of file
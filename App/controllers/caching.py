@@ -0,0 +1,59 @@
+from flask import current_app, has_app_context
+from sqlalchemy import event
+
+from App.database import db
+from App.cache import create_cache
+
+'''
+Response cache and per-table data versions
+'''
+
+def get_response_cache():
+    if 'response_cache' not in current_app.extensions:
+        current_app.extensions['response_cache'] = create_cache(current_app.config)
+    return current_app.extensions['response_cache']
+
+# A version changes every time a commit touches the table, so cache keys that
+# embed it stop matching as soon as the data they were built from changes.
+def table_versions(tables):
+    cache = get_response_cache()
+    if cache is None:
+        return None
+    return [cache.get_version(table) for table in tables]
+
+def bump_table_versions(tables):
+    cache = get_response_cache()
+    if cache is not None:
+        for table in tables:
+            cache.bump_version(table)
+
+def response_cache_stats():
+    cache = get_response_cache()
+    return cache.stats() if cache is not None else None
+
+
+# Covers unit-of-work changes (create_user, admin edits, ...) as
+# well as ORM-enabled insert/update/delete statements such as the importer's
+# batch inserts and bulk_transition. Versions are bumped only after commit.
+@event.listens_for(db.session, 'after_flush')
+def _collect_changed_tables(session, flush_context):
+    changed = session.info.setdefault('changed_tables', set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        changed.add(obj.__table__.name)
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _collect_statement_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            orm_execute_state.session.info.setdefault('changed_tables', set()).add(table.name)
+
+@event.listens_for(db.session, 'after_commit')
+def _bump_changed_tables(session):
+    changed = session.info.pop('changed_tables', None)
+    if changed and has_app_context():
+        bump_table_versions(changed)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_changed_tables(session):
+    session.info.pop('changed_tables', None)
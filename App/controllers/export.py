@@ -0,0 +1,89 @@
+import csv, io, json
+
+from sqlalchemy.orm import aliased
+
+from App.models import Application, User, Internship, ArchivedApplication, ArchivedInternship
+from App.database import db
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_COLUMNS = ('id', 'status', 'created_at', 'student_id', 'student_name', 'internship_id',
+                  'internship_title', 'employer_id', 'employer_name')
+# rows fetched from the cursor at a time, and rows per chunk of output
+EXPORT_BATCH_SIZE = 1000
+
+# One joined query over applications, their students, internships and
+# employers. Rows are read from a server-side cursor (stream_results) a
+# batch at a time, so memory does not grow with the size of the export.
+# include_archived adds the archived applications in the same query, in id
+# order with the live ones; their internship may be live or archived.
+def application_export_rows(internship_id=None, employer_id=None, status=None, since=None, until=None,
+                            include_archived=False, batch_size=EXPORT_BATCH_SIZE):
+    filters = dict(internship_id=internship_id, employer_id=employer_id, status=status, since=since, until=until)
+    query = _export_select(Application, Internship.__table__, **filters)
+    if include_archived:
+        internships = db.union_all(
+            db.select(Internship.id, Internship.title, Internship.employer_id),
+            db.select(ArchivedInternship.id, ArchivedInternship.title, ArchivedInternship.employer_id),
+        ).subquery()
+        query = db.union_all(query, _export_select(ArchivedApplication, internships, **filters))
+        query = query.order_by(query.selected_columns.id)
+    else:
+        query = query.order_by(Application.id)
+    for row in db.session.execute(query.execution_options(stream_results=True, yield_per=batch_size)):
+        yield row
+
+def _export_select(application, internship, internship_id, employer_id, status, since, until):
+    student = aliased(User)
+    employer = aliased(User)
+    query = (
+        db.select(
+            # labelled so a union of live and archived rows can order by them
+            application.id.label('id'), application.status.label('status'),
+            application.created_at.label('created_at'), application.student_id.label('student_id'),
+            student.username.label('student_name'), application.internship_id.label('internship_id'),
+            internship.c.title.label('internship_title'), internship.c.employer_id.label('employer_id'),
+            employer.username.label('employer_name'),
+        )
+        .join(student, student.id == application.student_id)
+        .join(internship, internship.c.id == application.internship_id)
+        .join(employer, employer.id == internship.c.employer_id)
+    )
+    if internship_id is not None:
+        query = query.where(application.internship_id == internship_id)
+    if employer_id is not None:
+        query = query.where(internship.c.employer_id == employer_id)
+    if status:
+        query = query.where(application.status == status)
+    if since is not None:
+        query = query.where(application.created_at >= since)
+    if until is not None:
+        query = query.where(application.created_at < until)
+    return query
+
+def _export_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+# Yields the export as text chunks of up to `batch_size` rows each, ready to
+# be written to a streaming response or a file.
+def export_applications(fmt='csv', batch_size=EXPORT_BATCH_SIZE, **filters):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(EXPORT_COLUMNS)
+    pending = 0
+    for row in application_export_rows(batch_size=batch_size, **filters):
+        values = [_export_value(value) for value in row]
+        if writer:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))) + '\n')
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
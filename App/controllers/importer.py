@@ -0,0 +1,248 @@
+import csv, json, os, time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from werkzeug.security import generate_password_hash
+
+from App.models import User, Internship, Application
+from App.database import db
+from App.passwords import hash_method
+from .search import refresh_internships_in_index
+from .stats import bump_counts
+
+VALID_ROLES = ('student', 'staff', 'employer')
+DEFAULT_BATCH_SIZE = 500
+
+
+class ImportReport:
+
+    def __init__(self):
+        self.created = 0
+        self.errors = []  # (row number, message)
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    @property
+    def rows(self):
+        return self.created + len(self.errors)
+
+    @property
+    def rate(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def error(self, number, message):
+        self.errors.append((number, message))
+
+    def finish(self):
+        self.errors.sort()
+        self.seconds = time.perf_counter() - self.started
+        return self
+
+
+# Yields (row number, dict) from a CSV file with a header row or from a JSON
+# lines file, one row at a time so large files are never fully in memory.
+def read_rows(stream, fmt):
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=2):
+            yield number, row
+        return
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            row = e
+        yield number, row
+
+def detect_format(path):
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+def batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+# Inserts a batch with one executemany. If the database rejects it (e.g. a
+# concurrent writer took a username) the batch is retried row by row so only
+# the offending rows are reported. `after_insert(rows)` runs in the same
+# transaction as the insert.
+def insert_batch(model, rows, report, after_insert=None):
+    if not rows:
+        return []
+    try:
+        ids = db.session.scalars(db.insert(model).returning(model.id), [row for _, row in rows]).all()
+        if after_insert:
+            after_insert([row for _, row in rows])
+        db.session.commit()
+        report.created += len(ids)
+        return ids
+    except Exception:
+        db.session.rollback()
+    ids = []
+    for number, row in rows:
+        try:
+            ids.append(db.session.execute(db.insert(model).returning(model.id), row).scalar_one())
+            if after_insert:
+                after_insert([row])
+            db.session.commit()
+            report.created += 1
+        except Exception as e:
+            db.session.rollback()
+            report.error(number, str(e.orig if hasattr(e, 'orig') else e))
+    return ids
+
+
+'''
+Users
+'''
+
+def validate_user(row, seen):
+    if not isinstance(row, dict):
+        return f'unreadable row: {row}'
+    for field in ('username', 'password', 'role'):
+        if row.get(field) is not None and not isinstance(row[field], str):
+            return f'{field} must be a string'
+    username = (row.get('username') or '').strip()
+    if not username or len(username) > 20:
+        return 'username is required and must be at most 20 characters'
+    if not row.get('password'):
+        return 'password is required'
+    if (row.get('role') or 'student') not in VALID_ROLES:
+        return f"role must be one of: {', '.join(VALID_ROLES)}"
+    if username in seen:
+        return f'duplicate username {username}'
+    return None
+
+# PBKDF2 is CPU bound, so password hashes for a batch are computed in a
+# process pool; workers=0 hashes in this process.
+def import_users(rows, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    report = ImportReport()
+    workers = os.cpu_count() if workers is None else workers
+    pool = ProcessPoolExecutor(workers) if workers else None
+    seen = set()
+    try:
+        for batch in batches(rows, batch_size):
+            valid = []
+            for number, row in batch:
+                message = validate_user(row, seen)
+                if message:
+                    report.error(number, message)
+                    continue
+                seen.add(row['username'].strip())
+                valid.append((number, row))
+            taken = set(db.session.scalars(db.select(User.username).where(
+                User.username.in_([row['username'].strip() for _, row in valid])
+            )))
+            for number, row in valid:
+                if row['username'].strip() in taken:
+                    report.error(number, f"username {row['username'].strip()} already exists")
+            valid = [(number, row) for number, row in valid if row['username'].strip() not in taken]
+            passwords = [row['password'] for _, row in valid]
+            hasher = partial(generate_password_hash, method=hash_method())
+            if pool:
+                hashes = list(pool.map(hasher, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+            else:
+                hashes = [hasher(password) for password in passwords]
+            insert_batch(User, [
+                (number, {'username': row['username'].strip(), 'password': hashed, 'role': row.get('role') or 'student'})
+                for (number, row), hashed in zip(valid, hashes)
+            ], report)
+    finally:
+        if pool:
+            pool.shutdown()
+    return report.finish()
+
+
+'''
+Internships
+'''
+
+def import_internships(rows, batch_size=DEFAULT_BATCH_SIZE):
+    report = ImportReport()
+    for batch in batches(rows, batch_size):
+        employer_ids = {parse_int(row.get('employer_id')) for _, row in batch if isinstance(row, dict)}
+        employers = set(db.session.scalars(db.select(User.id).where(
+            User.id.in_(employer_ids - {None}), User.role == 'employer'
+        )))
+        valid = []
+        for number, row in batch:
+            if not isinstance(row, dict):
+                report.error(number, f'unreadable row: {row}')
+                continue
+            title = row.get('title') or ''
+            employer_id = parse_int(row.get('employer_id'))
+            if not isinstance(title, str) or not isinstance(row.get('description') or '', str):
+                report.error(number, 'title and description must be strings')
+                continue
+            title = title.strip()
+            if not title or len(title) > 100:
+                report.error(number, 'title is required and must be at most 100 characters')
+            elif employer_id not in employers:
+                report.error(number, f"employer {row.get('employer_id')} not found")
+            else:
+                valid.append((number, {'title': title, 'description': row.get('description'), 'employer_id': employer_id}))
+        # core inserts bypass the session events, so tell the search index directly
+        refresh_internships_in_index(insert_batch(Internship, valid, report))
+    return report.finish()
+
+
+'''
+Applications
+'''
+
+def import_applications(rows, batch_size=DEFAULT_BATCH_SIZE):
+    report = ImportReport()
+    seen = set()
+    for batch in batches(rows, batch_size):
+        pairs = {}
+        for number, row in batch:
+            if not isinstance(row, dict):
+                report.error(number, f'unreadable row: {row}')
+                continue
+            pair = (parse_int(row.get('student_id')), parse_int(row.get('internship_id')))
+            if None in pair:
+                report.error(number, 'student_id and internship_id must be integers')
+            elif pair in seen:
+                report.error(number, f'duplicate application {pair}')
+            else:
+                seen.add(pair)
+                pairs[number] = pair
+        student_ids = {student_id for student_id, _ in pairs.values()}
+        internship_ids = {internship_id for _, internship_id in pairs.values()}
+        students = set(db.session.scalars(db.select(User.id).where(
+            User.id.in_(student_ids), User.role == 'student'
+        )))
+        internships = set(db.session.scalars(db.select(Internship.id).where(Internship.id.in_(internship_ids))))
+        existing = set(db.session.execute(db.select(Application.student_id, Application.internship_id).where(
+            Application.student_id.in_(student_ids), Application.internship_id.in_(internship_ids)
+        )).tuples())
+        valid = []
+        for number, (student_id, internship_id) in pairs.items():
+            if student_id not in students:
+                report.error(number, f'student {student_id} not found')
+            elif internship_id not in internships:
+                report.error(number, f'internship {internship_id} not found')
+            elif (student_id, internship_id) in existing:
+                report.error(number, f'student {student_id} already applied to internship {internship_id}')
+            else:
+                valid.append((number, {'student_id': student_id, 'internship_id': internship_id, 'status': 'pending'}))
+        insert_batch(Application, valid, report, count_pending)
+    return report.finish()
+
+def count_pending(rows):
+    per_internship = {}
+    for row in rows:
+        per_internship[row['internship_id']] = per_internship.get(row['internship_id'], 0) + 1
+    for internship_id, count in per_internship.items():
+        bump_counts(internship_id, {'pending': count})
@@ -1,4 +1,5 @@
 from .user import create_user
+from .search import rebuild_search_index
 from App.database import db
 
 
@@ -6,3 +7,4 @@ def initialize():
     db.drop_all()
     db.create_all()
     create_user('bob', 'bobpass')
+    rebuild_search_index()
@@ -1,5 +1,8 @@
-from App.models import Internship, User
+from sqlalchemy.orm import joinedload
+
+from App.models import Internship, User, ArchivedInternship
 from App.database import db
+from .pagination import keyset_page, keyset_merged_page
 
 def create_internship(title, description, employer_id):
     employer = User.query.get(employer_id)
@@ -15,11 +18,37 @@ def create_internship(title, description, employer_id):
     db.session.commit()
     return internship
 
+def set_internship_active(internship_id, employer_id, is_active):
+    internship = db.session.get(Internship, internship_id)
+    if not internship or internship.employer_id != employer_id:
+        return None
+    internship.is_active = is_active
+    db.session.commit()
+    return internship
+
 def get_all_internships():
-    return Internship.query.all()
+    return Internship.query.options(joinedload(Internship.employer)).all()
+
+def get_internships_page(limit=None, after=None, employer_id=None, is_active=None, include_archived=False):
+    query = db.select(Internship)
+    if employer_id is not None:
+        query = query.filter_by(employer_id=employer_id)
+    if is_active is not None:
+        query = query.filter_by(is_active=is_active)
+    query = query.options(joinedload(Internship.employer))
+    # archived internships are all closed
+    if not include_archived or is_active:
+        return keyset_page(query, Internship.id, limit, after)
+    archived = db.select(ArchivedInternship).options(joinedload(ArchivedInternship.employer))
+    if employer_id is not None:
+        archived = archived.filter_by(employer_id=employer_id)
+    return keyset_merged_page([(query, Internship.id), (archived, ArchivedInternship.id)], limit, after)
 
-def get_internship_by_id(internship_id):
-    return Internship.query.get(internship_id)
+def get_internship_by_id(internship_id, include_archived=False):
+    internship = Internship.query.get(internship_id)
+    if internship is None and include_archived:
+        internship = db.session.get(ArchivedInternship, internship_id)
+    return internship
 
 def get_employer_internships(employer_id):
-    return Internship.query.filter_by(employer_id=employer_id).all()
\ No newline at end of file
+    return Internship.query.options(joinedload(Internship.employer)).filter_by(employer_id=employer_id).all()
\ No newline at end of file
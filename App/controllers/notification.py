@@ -0,0 +1,34 @@
+from flask import current_app
+
+from App.models import User, Internship
+from App.database import db
+from App.notifications import create_sinks
+from .outbox import handles
+
+STATUS_MESSAGES = {
+    'shortlisted': 'Good news: you have been shortlisted for {title}.',
+    'accepted': 'Congratulations! Your application for {title} has been accepted.',
+    'rejected': 'Your application for {title} was not successful this time.',
+}
+
+def get_notification_sinks():
+    sinks = current_app.extensions.get('notification_sinks')
+    if sinks is None:
+        sinks = current_app.extensions['notification_sinks'] = create_sinks(current_app.config)
+    return sinks
+
+@handles('application.status_changed')
+def notify_status_change(payload):
+    student = db.session.get(User, payload['student_id'])
+    internship = db.session.get(Internship, payload['internship_id'])
+    if student is None or internship is None:
+        return
+    notification = {
+        'user_id': student.id,
+        'username': student.username,
+        'subject': f"Application {payload['status']}: {internship.title}",
+        'body': STATUS_MESSAGES[payload['status']].format(title=internship.title),
+        'event': payload,
+    }
+    for sink in get_notification_sinks():
+        sink.send(notification)
@@ -0,0 +1,145 @@
+import logging, os, random, socket, time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func, or_
+
+from App.models import OutboxEvent
+from App.database import db
+
+log = logging.getLogger(__name__)
+
+# topic -> handler(payload); a handler raises to have the event retried
+HANDLERS = {}
+
+def handles(topic):
+    def register(handler):
+        HANDLERS[topic] = handler
+        return handler
+    return register
+
+# Records an event in the caller's transaction; it is only visible to the
+# worker, and so only delivered, if that transaction commits.
+def enqueue_event(topic, payload):
+    db.session.add(OutboxEvent(topic=topic, payload=payload))
+
+def enqueue_events(topic, payloads):
+    if payloads:
+        now = datetime.utcnow()
+        db.session.execute(db.insert(OutboxEvent), [
+            {'topic': topic, 'payload': payload, 'created_at': now, 'available_at': now, 'attempts': 0}
+            for payload in payloads
+        ])
+
+
+'''
+Worker
+'''
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+# Exponential backoff with jitter: ~base, 2*base, 4*base ... capped.
+def retry_delay(attempts):
+    base = current_app.config['OUTBOX_RETRY_BASE_SECONDS']
+    delay = min(base * 2 ** (attempts - 1), current_app.config['OUTBOX_RETRY_MAX_SECONDS'])
+    return delay * random.uniform(0.5, 1.0)
+
+def unclaimed(now):
+    return db.and_(
+        OutboxEvent.delivered_at.is_(None),
+        OutboxEvent.failed_at.is_(None),
+        OutboxEvent.available_at <= now,
+        or_(OutboxEvent.claimed_until.is_(None), OutboxEvent.claimed_until < now),
+    )
+
+# Claims up to `limit` due events for `worker` for OUTBOX_LEASE_SECONDS. The
+# claim is a conditional UPDATE, so two workers racing for the same rows
+# never both win; a claim that is not finished in time can be taken over.
+def claim_events(worker, limit):
+    now = datetime.utcnow()
+    candidates = db.session.scalars(
+        db.select(OutboxEvent.id).where(unclaimed(now)).order_by(OutboxEvent.id).limit(limit)
+    ).all()
+    if not candidates:
+        db.session.commit()
+        return []
+    lease = now + timedelta(seconds=current_app.config['OUTBOX_LEASE_SECONDS'])
+    claimed = db.session.scalars(
+        db.update(OutboxEvent)
+        .where(OutboxEvent.id.in_(candidates), unclaimed(now))
+        .values(claimed_by=worker, claimed_until=lease)
+        .returning(OutboxEvent.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.session.commit()
+    return db.session.scalars(
+        db.select(OutboxEvent).where(OutboxEvent.id.in_(claimed)).order_by(OutboxEvent.id)
+    ).all()
+
+def process_event(event, worker):
+    event_id, topic, attempts = event.id, event.topic, event.attempts + 1
+    handler = HANDLERS.get(topic)
+    try:
+        if handler is None:
+            raise LookupError(f'no handler for topic {topic!r}')
+        handler(event.payload)
+    except Exception as e:
+        db.session.rollback()
+        values = {'attempts': attempts, 'claimed_by': None, 'claimed_until': None, 'last_error': repr(e)[:2000]}
+        if attempts >= current_app.config['OUTBOX_MAX_ATTEMPTS']:
+            values['failed_at'] = datetime.utcnow()
+            log.error('outbox event %s (%s) failed for good after %s attempts: %r', event_id, topic, attempts, e)
+        else:
+            values['available_at'] = datetime.utcnow() + timedelta(seconds=retry_delay(attempts))
+            log.warning('outbox event %s (%s) failed, attempt %s: %r', event_id, topic, attempts, e)
+        finish_event(event_id, worker, values)
+        return False
+    finish_event(event_id, worker, {'delivered_at': datetime.utcnow(), 'claimed_until': None})
+    return True
+
+# Only the worker that still holds the claim records the outcome.
+def finish_event(event_id, worker, values):
+    db.session.execute(
+        db.update(OutboxEvent)
+        .where(OutboxEvent.id == event_id, OutboxEvent.claimed_by == worker)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+# Claims and handles one batch. Returns (delivered, failed).
+def run_outbox_batch(worker=None, batch_size=None):
+    worker = worker or worker_name()
+    events = claim_events(worker, batch_size or current_app.config['OUTBOX_BATCH_SIZE'])
+    delivered = sum(process_event(event, worker) for event in events)
+    return delivered, len(events) - delivered
+
+def run_worker(stop, batch_size=None, poll_interval=None, worker=None):
+    worker = worker or worker_name()
+    poll_interval = poll_interval or current_app.config['OUTBOX_POLL_SECONDS']
+    while not stop():
+        delivered, failed = run_outbox_batch(worker, batch_size)
+        if delivered or failed:
+            log.info('outbox: %s delivered, %s failed', delivered, failed)
+        else:
+            db.session.remove()
+            time.sleep(poll_interval)
+
+def outbox_counts():
+    rows = db.session.execute(db.select(
+        func.count(OutboxEvent.id),
+        func.count(OutboxEvent.delivered_at),
+        func.count(OutboxEvent.failed_at),
+    )).one()
+    return {'total': rows[0], 'delivered': rows[1], 'failed': rows[2], 'pending': rows[0] - rows[1] - rows[2]}
+
+def retry_failed_events():
+    count = db.session.execute(
+        db.update(OutboxEvent)
+        .where(OutboxEvent.failed_at.is_not(None))
+        .values(failed_at=None, attempts=0, available_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return count
@@ -0,0 +1,40 @@
+from App.database import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def clamp_limit(limit):
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+# Keyset (seek) pagination: rows are ordered by a unique, indexed key and the
+# client passes back the last key it saw, so every page costs the same no
+# matter how deep into the table it is.
+def keyset_page(query, key, limit=None, after=None):
+    limit = clamp_limit(limit)
+    if after is not None:
+        query = query.where(key > after)
+    rows = db.session.scalars(query.order_by(key).limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = getattr(rows[-1], key.key)
+    return rows, next_cursor
+
+# The same over several queries that share one key space, e.g. a table and
+# its archive: each contributes at most a page, merged in key order.
+def keyset_merged_page(queries, limit=None, after=None):
+    limit = clamp_limit(limit)
+    rows = []
+    for query, key in queries:
+        if after is not None:
+            query = query.where(key > after)
+        rows.extend(db.session.scalars(query.order_by(key).limit(limit + 1)).unique())
+    name = queries[0][1].key
+    rows.sort(key=lambda row: getattr(row, name))
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = getattr(rows[-1], name)
+    return rows, next_cursor
@@ -0,0 +1,67 @@
+import heapq
+from operator import itemgetter
+
+from App.models import Application, Internship, User
+from App.database import db
+from .search import get_internship_index_store
+
+# only the strongest profile terms are used as the query
+PROFILE_TERMS = 50
+
+# Recommendations reuse the internship search index: a student's profile is
+# the sum of the TF-IDF (BM25) vectors of the internships they applied to,
+# and candidates are ranked by their dot product with that profile through
+# the index's postings, so only internships sharing a term are ever touched.
+# Closed internships are not in the index and are never recommended.
+
+def build_profile(index, internship_ids):
+    profile = {}
+    for internship_id in internship_ids:
+        for term, weight in index.vector(internship_id).items():
+            profile[term] = profile.get(term, 0.0) + weight
+    return dict(heapq.nlargest(PROFILE_TERMS, profile.items(), key=itemgetter(1)))
+
+def rank_for_profile(index, applied, k):
+    profile = build_profile(index, applied)
+    if not profile:
+        return []
+    hits = index.search_weighted(profile, k + len(applied))
+    return [(internship_id, score) for internship_id, score in hits if internship_id not in applied][:k]
+
+def recommend_internships(student_id, k=10):
+    applied = set(db.session.scalars(
+        db.select(Application.internship_id).filter_by(student_id=student_id)
+    ))
+    hits = rank_for_profile(get_internship_index_store().get(), applied, k)
+    internships = {internship.id: internship for internship in db.session.scalars(
+        db.select(Internship).where(Internship.id.in_([internship_id for internship_id, _ in hits]))
+    )}
+    return [(internships[internship_id], score) for internship_id, score in hits if internship_id in internships]
+
+# Scores every student with at least one application, e.g. for a nightly
+# digest. Returns {student_id: [(internship_id, score), ...]}. Each profile
+# term's postings are weighted once and shared by every student using it, and
+# a student's candidates are scored in one pass over those lists, so the cost
+# is the postings of each student's profile terms with no per-query setup.
+def recommend_for_all_students(k=10):
+    applied = {}
+    rows = db.session.execute(
+        db.select(Application.student_id, Application.internship_id)
+        .join(User, User.id == Application.student_id)
+        .where(User.role == 'student')
+    )
+    for student_id, internship_id in rows:
+        applied.setdefault(student_id, set()).add(internship_id)
+    index = get_internship_index_store().get()
+    postings, results = {}, {}
+    for student_id, internship_ids in applied.items():
+        scores = {}
+        for term, weight in build_profile(index, internship_ids).items():
+            if term not in postings:
+                postings[term] = index.term_postings(term)
+            for internship_id, term_weight in postings[term]:
+                scores[internship_id] = scores.get(internship_id, 0.0) + weight * term_weight
+        results[student_id] = heapq.nlargest(
+            k, ((internship_id, score) for internship_id, score in scores.items() if internship_id not in internship_ids),
+            key=itemgetter(1))
+    return results
@@ -0,0 +1,205 @@
+import logging, os, threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import joinedload
+
+from App.models import Application, Upload, User
+from App.database import db
+from App.documents import extract_text
+from App.uploads import content_path
+from .outbox import handles
+from .search import IndexStore, tokenize
+from .upload import RESUME_STORED, resume_root
+
+log = logging.getLogger(__name__)
+
+# a resume contributes at most this many tokens to the index
+MAX_TOKENS = 20000
+
+# Text extraction is CPU bound and parses untrusted files, so the outbox
+# worker hands it to a pool of processes; requests only store the upload and
+# queue a RESUME_STORED event. Tokens are saved on the Upload row, keyed by
+# content hash, so a file is extracted once however many applications use it
+# and re-uploading the same file costs nothing.
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _reset_pool():
+    global _pool
+    _pool = None
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pool)
+
+def _get_pool():
+    global _pool
+    workers = current_app.config['RESUME_EXTRACT_WORKERS']
+    if not workers:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(workers)
+    return _pool
+
+# Runs in the pool. Returns None when the file is not on disk (yet): uploads
+# are installed just after their transaction commits.
+def extract_tokens(path, filename=None):
+    try:
+        text = extract_text(path, filename)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning('could not extract text from %s: %r', filename or path, e)
+        return []
+    return tokenize(text)[:MAX_TOKENS]
+
+# Extracts every upload in `upload_ids` that is still linked and not yet
+# extracted, and refreshes the applications using them. Returns the ids
+# whose files were missing.
+def extract_uploads(upload_ids):
+    rows = db.session.execute(
+        db.select(Upload.id, Upload.sha256, Upload.filename)
+        .where(Upload.id.in_(upload_ids), Upload.extracted_at.is_(None), Upload.refcount > 0)
+    ).all()
+    if not rows:
+        return set()
+    root = resume_root()
+    paths = [content_path(root, row.sha256) for row in rows]
+    filenames = [row.filename for row in rows]
+    pool = _get_pool()
+    results = pool.map(extract_tokens, paths, filenames) if pool else map(extract_tokens, paths, filenames)
+    now = datetime.utcnow()
+    extracted, missing = [], set()
+    for row, tokens in zip(rows, results):
+        if tokens is None:
+            missing.add(row.id)
+        else:
+            extracted.append({'id': row.id, 'tokens': ' '.join(tokens), 'extracted_at': now})
+    if extracted:
+        db.session.execute(db.update(Upload), extracted)
+        db.session.commit()
+        refresh_applicants_in_index(applicant_ids_for_uploads([row['id'] for row in extracted]))
+    return missing
+
+# One event extracts its own upload plus any others still pending, so a
+# backlog is spread over the pool instead of handled one file at a time.
+@handles(RESUME_STORED)
+def extract_resume(payload):
+    pending = db.session.scalars(
+        db.select(Upload.id).where(Upload.extracted_at.is_(None), Upload.refcount > 0)
+        .order_by(Upload.id).limit(current_app.config['OUTBOX_BATCH_SIZE'])
+    ).all()
+    if payload['upload_id'] in extract_uploads({payload['upload_id'], *pending}):
+        raise FileNotFoundError(f"upload {payload['upload_id']} is not stored yet")
+
+# Extracts uploads that have none yet; with `force`, every linked upload.
+def extract_all_uploads(force=False, batch_size=100):
+    if force:
+        db.session.execute(db.update(Upload).values(extracted_at=None))
+        db.session.commit()
+    count = after = 0
+    while True:
+        ids = db.session.scalars(
+            db.select(Upload.id).where(Upload.extracted_at.is_(None), Upload.refcount > 0, Upload.id > after)
+            .order_by(Upload.id).limit(batch_size)
+        ).all()
+        if not ids:
+            return count
+        count += len(ids) - len(extract_uploads(ids))
+        after = ids[-1]
+
+
+'''
+Applicant search
+'''
+
+# An application is searched by its own resume or, failing that, the
+# student's profile resume.
+def applicant_resume_id():
+    return func.coalesce(Application.resume_id, User.resume_id)
+
+def applicant_query(*columns):
+    return (db.select(*columns)
+            .join(User, User.id == Application.student_id)
+            .join(Upload, Upload.id == applicant_resume_id())
+            .where(Upload.extracted_at.is_not(None), Upload.tokens != ''))
+
+def load_applicant_tokens(ids):
+    rows = db.session.execute(applicant_query(Application.id, Upload.tokens).where(Application.id.in_(ids)))
+    return {row.id: row.tokens.split() for row in rows}
+
+def indexed_applicant_ids():
+    return db.session.scalars(applicant_query(Application.id))
+
+def applicant_ids_for_uploads(upload_ids):
+    return db.session.scalars(
+        db.select(Application.id).join(User, User.id == Application.student_id)
+        .where(applicant_resume_id().in_(upload_ids))
+    ).all()
+
+def get_applicant_index_store():
+    store = current_app.extensions.get('applicant_search')
+    if store is None:
+        store = IndexStore(current_app.config.get('APPLICANT_INDEX_PATH'),
+                           load_applicant_tokens, indexed_applicant_ids)
+        current_app.extensions['applicant_search'] = store
+    return store
+
+def rebuild_applicant_index():
+    get_applicant_index_store().rebuild()
+
+def refresh_applicants_in_index(application_ids):
+    get_applicant_index_store().mark(application_ids)
+
+# Ranks an internship's applicants by how well their resumes match `skills`
+# (BM25). Returns [(application, score), ...], best first; applicants with no
+# matching words are left out.
+def rank_applicants(internship_id, skills, limit=20):
+    tokens = [token for skill in skills for token in tokenize(skill)]
+    if not tokens:
+        return []
+    candidates = db.session.scalars(db.select(Application.id).filter_by(internship_id=internship_id)).all()
+    hits = get_applicant_index_store().get().search(tokens, limit, candidates)
+    applications = {application.id: application for application in db.session.scalars(
+        db.select(Application)
+        .options(joinedload(Application.student), joinedload(Application.internship))
+        .where(Application.id.in_([application_id for application_id, _ in hits]))
+    )}
+    return [(applications[application_id], score) for application_id, score in hits
+            if application_id in applications]
+
+
+# New and deleted applications, relinked application resumes and changed
+# profile resumes are journalled once their transaction commits, like
+# internship edits in search.py.
+@event.listens_for(db.session, 'after_flush')
+def _collect_applicant_changes(session, flush_context):
+    changed = session.info.setdefault('changed_applicants', set())
+    students = set()
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, Application) and obj.id is not None:
+            changed.add(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, Application) and inspect(obj).attrs.resume_id.history.has_changes():
+            changed.add(obj.id)
+        elif isinstance(obj, User) and inspect(obj).attrs.resume_id.history.has_changes():
+            students.add(obj.id)
+    if students:
+        changed.update(session.scalars(
+            db.select(Application.id).where(Application.student_id.in_(students))
+        ))
+
+@event.listens_for(db.session, 'after_commit')
+def _publish_applicant_changes(session):
+    changed = session.info.pop('changed_applicants', None)
+    if changed and has_app_context():
+        refresh_applicants_in_index(changed)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_applicant_changes(session):
+    session.info.pop('changed_applicants', None)
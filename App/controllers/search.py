@@ -0,0 +1,421 @@
+import bisect, heapq, math, os, pickle, re
+from contextlib import contextmanager
+from operator import itemgetter
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+try:
+    import fcntl
+except ImportError:  # Windows: the journal is never rotated
+    fcntl = None
+
+from App.models import Internship
+from App.database import db
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has in is it its of on or that the to was will with'.split()
+)
+# title words count this many times more than description words
+TITLE_WEIGHT = 2
+# ids are looked up in chunks so the IN (...) lists stay a sane size
+REFRESH_CHUNK = 500
+# write a fresh snapshot once this many journal bytes are not covered by it
+SNAPSHOT_EVERY = 64 * 1024
+
+def tokenize(text):
+    if not text:
+        return []
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class SearchIndex:
+    # Okapi BM25 over an in-memory inverted index.
+    #
+    # The first query for a term caches its postings' BM25 weights and the
+    # documents ordered by weight; later adds and removes keep that cache up
+    # to date. Top-k queries walk the ordered lists together (Fagin's
+    # threshold algorithm) and stop once no unseen document could beat the
+    # current k-th score, instead of scoring every posting of a common term.
+    # Weights use a frozen average document length that is only refreshed,
+    # dropping the caches, when it drifts by more than 10%.
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings = {}  # term -> {doc_id: term frequency}
+        self.docs = {}      # doc_id -> distinct terms, needed to remove a document
+        self.lengths = {}   # doc_id -> number of tokens
+        self.total_length = 0
+        self.avgdl = 0.0
+        self._ranked = {}   # term -> ({doc_id: weight}, [-weight, ...], [doc_id, ...])
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_ranked'] = {}
+        return state
+
+    def add(self, doc_id, tokens):
+        self.remove(doc_id)
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        length = len(tokens)
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+            cached = self._ranked.get(term)
+            if cached is not None:
+                weights, order, doc_ids = cached
+                weight = weights[doc_id] = self._weight(tf, length)
+                position = bisect.bisect_right(order, -weight)
+                order.insert(position, -weight)
+                doc_ids.insert(position, doc_id)
+        self.docs[doc_id] = tuple(counts)
+        self.lengths[doc_id] = length
+        self.total_length += length
+
+    def remove(self, doc_id):
+        terms = self.docs.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            cached = self._ranked.get(term)
+            if cached is not None:
+                weights, order, doc_ids = cached
+                position = bisect.bisect_left(order, -weights.pop(doc_id))
+                position = doc_ids.index(doc_id, position)
+                del order[position], doc_ids[position]
+            if not postings:
+                del self.postings[term]
+                self._ranked.pop(term, None)
+        self.total_length -= self.lengths.pop(doc_id)
+
+    def idf(self, term):
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.lengths) - df + 0.5) / (df + 0.5))
+
+    def _weight(self, tf, length):
+        return tf * (self.K1 + 1) / (tf + self.K1 * (1 - self.B + self.B * length / self.avgdl))
+
+    def _refresh_avgdl(self):
+        current = self.total_length / len(self.lengths) or 1.0
+        if abs(current - self.avgdl) > 0.1 * self.avgdl:
+            self.avgdl = current
+            self._ranked.clear()
+
+    def _ranked_postings(self, term):
+        cached = self._ranked.get(term)
+        if cached is None:
+            k1, b, avgdl, lengths = self.K1, self.B, self.avgdl, self.lengths
+            weights = {
+                doc_id: tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[doc_id] / avgdl))
+                for doc_id, tf in self.postings[term].items()
+            }
+            doc_ids = sorted(weights, key=weights.__getitem__, reverse=True)
+            cached = self._ranked[term] = (weights, [-weights[doc_id] for doc_id in doc_ids], doc_ids)
+        return cached
+
+    # The document's BM25 vector: term -> idf * weight.
+    def vector(self, doc_id):
+        if doc_id not in self.lengths:
+            return {}
+        self._refresh_avgdl()
+        length = self.lengths[doc_id]
+        return {term: self.idf(term) * self._weight(self.postings[term][doc_id], length)
+                for term in self.docs[doc_id]}
+
+    # The term's postings as [(doc_id, idf * weight), ...], for callers that
+    # score many queries against the same terms.
+    def term_postings(self, term):
+        if term not in self.postings:
+            return []
+        self._refresh_avgdl()
+        idf = self.idf(term)
+        return [(doc_id, idf * weight) for doc_id, weight in self._ranked_postings(term)[0].items()]
+
+    # Returns up to `limit` (doc_id, score) pairs, best first. `candidates`
+    # restricts scoring to a subset of documents.
+    def search(self, tokens, limit=20, candidates=None):
+        return self.search_weighted(dict.fromkeys(tokens, 1.0), limit, candidates)
+
+    # Like search(), but each query term carries its own weight.
+    def search_weighted(self, query, limit=20, candidates=None):
+        if limit < 1 or not self.lengths:
+            return []
+        self._refresh_avgdl()
+        terms = [(self._ranked_postings(term), self.idf(term) * weight)
+                 for term, weight in query.items() if term in self.postings]
+        if not terms:
+            return []
+        if candidates is not None:
+            scored = []
+            for doc_id in candidates:
+                score = sum(factor * weights.get(doc_id, 0.0) for (weights, _, _), factor in terms)
+                if score > 0:
+                    scored.append((doc_id, score))
+            return heapq.nlargest(limit, scored, key=itemgetter(1))
+
+        lookups = [(weights.get, factor) for (weights, _, _), factor in terms]
+        lists = [(order, doc_ids, factor, len(order)) for (_, order, doc_ids), factor in terms]
+        top, seen = [], set()
+        depth = 0
+        while True:
+            threshold = 0.0
+            for order, doc_ids, factor, size in lists:
+                if depth >= size:
+                    continue
+                threshold -= factor * order[depth]
+                doc_id = doc_ids[depth]
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                score = 0.0
+                for get, term_factor in lookups:
+                    score += term_factor * get(doc_id, 0.0)
+                if len(top) < limit:
+                    heapq.heappush(top, (score, doc_id))
+                elif score > top[0][0]:
+                    heapq.heapreplace(top, (score, doc_id))
+            if not threshold or (len(top) == limit and top[0][0] >= threshold):
+                break
+            depth += 1
+        return [(doc_id, score) for score, doc_id in sorted(top, reverse=True)]
+
+
+class IndexStore:
+    # Keeps a SearchIndex in step with the database across processes.
+    #
+    # Writers append the ids of changed rows to `<path>.log`. Every process
+    # tails that journal and re-reads just those rows through `loader`, so
+    # replaying an id twice is harmless. `<path>.pickle` holds a snapshot plus
+    # the journal generation and offset it covers, so new workers start warm
+    # instead of rebuilding from the database. Saving a snapshot also starts a
+    # new, empty journal generation, since the snapshot covers the old one, so
+    # the journal stays around SNAPSHOT_EVERY bytes. A process that finds a
+    # newer generation reloads the snapshot. Appends, reads and rotations hold
+    # `<path>.lock`. With no path the index lives only in this process.
+    def __init__(self, path, loader, all_ids):
+        self.path = path
+        self.loader = loader
+        self.all_ids = all_ids
+        self.index = None
+        self.generation = 0
+        self.offset = 0
+        self.snapshot_offset = 0
+        self.pending = set()
+
+    @property
+    def journal_path(self):
+        return self.path + '.log'
+
+    @property
+    def snapshot_path(self):
+        return self.path + '.pickle'
+
+    @contextmanager
+    def _locked(self, exclusive=False):
+        if fcntl is None or self.path is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def mark(self, doc_ids):
+        doc_ids = list(doc_ids)
+        if not doc_ids:
+            return
+        if self.path is None:
+            self.pending.update(doc_ids)
+            return
+        os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+        with self._locked(exclusive=True), open(self.journal_path, 'a') as journal:
+            if journal.tell() == 0:
+                journal.write(journal_header(0))
+            journal.write(''.join(f'{doc_id}\n' for doc_id in doc_ids))
+
+    def get(self):
+        if self.index is None:
+            self.load()
+        self.sync()
+        return self.index
+
+    def load(self):
+        if not self._load_snapshot():
+            self.rebuild()
+
+    def _load_snapshot(self):
+        if self.path is None or not os.path.exists(self.snapshot_path):
+            return False
+        with open(self.snapshot_path, 'rb') as snapshot:
+            state = pickle.load(snapshot)
+        # snapshots from before journal rotation hold (offset, index)
+        self.generation, self.offset, self.index = state if len(state) == 3 else (0, *state)
+        self.snapshot_offset = self.offset
+        return True
+
+    def rebuild(self):
+        self.pending.clear()
+        # anything journalled while we read the table is replayed on top
+        with self._locked():
+            self.generation, self.offset = self._journal_position()
+        index = SearchIndex()
+        ids = list(self.all_ids())
+        for start in range(0, len(ids), REFRESH_CHUNK):
+            for doc_id, tokens in self.loader(ids[start:start + REFRESH_CHUNK]).items():
+                index.add(doc_id, tokens)
+        self.index = index
+        self.save()
+
+    def sync(self):
+        doc_ids = self.pending
+        self.pending = set()
+        if self.path is not None:
+            with self._locked():
+                # a newer generation comes with the snapshot that covers the old one
+                if self._journal_position()[0] != self.generation and not self._load_snapshot():
+                    self.index = None
+                else:
+                    doc_ids.update(self._read_journal())
+            if self.index is None:
+                return self.rebuild()
+        self._apply(doc_ids)
+        if self.offset - self.snapshot_offset > SNAPSHOT_EVERY:
+            self.save()
+
+    def save(self):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.snapshot_path) or '.', exist_ok=True)
+        with self._locked(exclusive=True):
+            # without file locks the journal is never rotated
+            rotate = fcntl is not None
+            if rotate:
+                if self._journal_position()[0] != self.generation:
+                    # another process rotated the journal and saved a newer snapshot
+                    self._load_snapshot()
+                # the snapshot must cover the whole journal it replaces
+                self._apply(self._read_journal())
+                self.generation += 1
+                header = journal_header(self.generation)
+                journal_tmp = f'{self.journal_path}.{os.getpid()}.tmp'
+                with open(journal_tmp, 'w') as journal:
+                    journal.write(header)
+                self.offset = len(header)
+            tmp_path = f'{self.snapshot_path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as snapshot:
+                pickle.dump((self.generation, self.offset, self.index), snapshot, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+            if rotate:
+                os.replace(journal_tmp, self.journal_path)
+        self.snapshot_offset = self.offset
+
+    def _apply(self, doc_ids):
+        doc_ids = list(doc_ids)
+        for start in range(0, len(doc_ids), REFRESH_CHUNK):
+            chunk = doc_ids[start:start + REFRESH_CHUNK]
+            found = self.loader(chunk)
+            for doc_id in chunk:
+                if doc_id in found:
+                    self.index.add(doc_id, found[doc_id])
+                else:
+                    self.index.remove(doc_id)
+
+    # (generation, size) of the journal; a missing or headerless journal is
+    # generation 0
+    def _journal_position(self):
+        if self.path is None:
+            return 0, 0
+        try:
+            with open(self.journal_path, 'rb') as journal:
+                header = journal.read(len(journal_header(0)))
+                size = journal.seek(0, os.SEEK_END)
+        except FileNotFoundError:
+            return 0, 0
+        return (int(header[1:]) if header.startswith(b'#') else 0), size
+
+    # The ids journalled past self.offset, which moves to the end of the last
+    # complete line.
+    def _read_journal(self):
+        try:
+            with open(self.journal_path, 'rb') as journal:
+                journal.seek(self.offset)
+                data = journal.read()
+        except FileNotFoundError:
+            return set()
+        # ignore a trailing line another process is still writing
+        data = data[:data.rfind(b'\n') + 1]
+        self.offset += len(data)
+        return {int(line) for line in data.split() if not line.startswith(b'#')}
+
+def journal_header(generation):
+    return f'#{generation:016d}\n'
+
+
+'''
+Internship search
+'''
+
+def internship_tokens(internship):
+    return tokenize(internship.title) * TITLE_WEIGHT + tokenize(internship.description)
+
+def load_internship_tokens(ids):
+    rows = db.session.execute(
+        db.select(Internship.id, Internship.title, Internship.description)
+        .where(Internship.id.in_(ids), Internship.is_active == True)
+    ).all()
+    return {row.id: internship_tokens(row) for row in rows}
+
+def active_internship_ids():
+    return db.session.scalars(db.select(Internship.id).where(Internship.is_active == True))
+
+def get_internship_index_store():
+    store = current_app.extensions.get('internship_search')
+    if store is None:
+        store = IndexStore(current_app.config.get('SEARCH_INDEX_PATH'),
+                           load_internship_tokens, active_internship_ids)
+        current_app.extensions['internship_search'] = store
+    return store
+
+def rebuild_search_index():
+    get_internship_index_store().rebuild()
+
+def refresh_internships_in_index(internship_ids):
+    get_internship_index_store().mark(internship_ids)
+
+def search_internships(query, limit=20):
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    hits = get_internship_index_store().get().search(tokens, limit)
+    internships = {internship.id: internship for internship in db.session.scalars(
+        db.select(Internship).where(Internship.id.in_([doc_id for doc_id, _ in hits]))
+    )}
+    return [(internships[doc_id], score) for doc_id, score in hits if doc_id in internships]
+
+
+# Any commit that creates, edits or deletes an internship journals its id, so
+# the index follows create_internship, is_active changes, the CLI and admin
+# edits alike. Ids are only published once the transaction has committed.
+@event.listens_for(db.session, 'after_flush')
+def _collect_internship_changes(session, flush_context):
+    changed = session.info.setdefault('changed_internships', set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Internship) and obj.id is not None:
+            changed.add(obj.id)
+
+@event.listens_for(db.session, 'after_commit')
+def _publish_internship_changes(session):
+    changed = session.info.pop('changed_internships', None)
+    if changed and has_app_context():
+        refresh_internships_in_index(changed)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_internship_changes(session):
+    session.info.pop('changed_internships', None)
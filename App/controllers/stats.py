@@ -0,0 +1,98 @@
+from sqlalchemy import func, case
+
+from App.models import InternshipStats, Internship, Application, ArchivedApplication
+from App.database import db, insert_ignore
+
+STATUSES = ('pending', 'shortlisted', 'accepted', 'rejected')
+
+# Applies {status: delta} to an internship's counters inside the caller's
+# transaction. The counters row is created on first use.
+def bump_counts(internship_id, changes):
+    changes = {status: delta for status, delta in changes.items() if delta}
+    if not changes:
+        return
+    statement = (
+        db.update(InternshipStats)
+        .where(InternshipStats.internship_id == internship_id)
+        .values({status: getattr(InternshipStats, status) + delta for status, delta in changes.items()})
+        .execution_options(synchronize_session=False)
+    )
+    if db.session.execute(statement).rowcount == 0:
+        db.session.execute(insert_ignore(InternshipStats).from_select(
+            ['internship_id', 'employer_id', *STATUSES],
+            db.select(Internship.id, Internship.employer_id, *[db.literal(0)] * len(STATUSES))
+            .where(Internship.id == internship_id)
+        ))
+        db.session.execute(statement)
+
+# Moves `count` applications of an internship from one status to another.
+def move_counts(internship_id, old_status, new_status, count=1):
+    if old_status == new_status:
+        return
+    changes = {new_status: count}
+    if old_status in STATUSES:
+        changes[old_status] = -count
+    bump_counts(internship_id, changes)
+
+# Keeps an internship's counter row under its employer when the internship
+# changes hands, inside the caller's transaction.
+def move_internship_counts(internship_id, employer_id):
+    db.session.execute(
+        db.update(InternshipStats)
+        .where(InternshipStats.internship_id == internship_id, InternshipStats.employer_id != employer_id)
+        .values(employer_id=employer_id)
+        .execution_options(synchronize_session=False)
+    )
+
+def empty_counts():
+    return dict.fromkeys(STATUSES, 0)
+
+# O(1): a primary key lookup, independent of how many applications exist.
+# The counters cover live applications; include_archived adds the
+# internship's archived ones, counted from the archive's index.
+def get_internship_counts(internship_id, include_archived=False):
+    stats = db.session.get(InternshipStats, internship_id)
+    counts = empty_counts()
+    if stats:
+        counts.update({status: getattr(stats, status) for status in STATUSES})
+    if include_archived:
+        for status, count in db.session.execute(
+            db.select(ArchivedApplication.status, func.count())
+            .filter_by(internship_id=internship_id).group_by(ArchivedApplication.status)
+        ):
+            counts[status] = counts.get(status, 0) + count
+    return counts
+
+# Totals plus a per-internship breakdown from the employer's counter rows.
+def get_employer_counts(employer_id):
+    rows = db.session.scalars(
+        db.select(InternshipStats).filter_by(employer_id=employer_id).order_by(InternshipStats.internship_id)
+    ).all()
+    totals = empty_counts()
+    for row in rows:
+        for status in STATUSES:
+            totals[status] += getattr(row, status)
+    return {'totals': totals, 'internships': [row.get_json() for row in rows]}
+
+# Number of applications from the counter rows: one row per internship
+# instead of a scan of the application table.
+def count_applications(status=None):
+    statuses = [status] if status else STATUSES
+    total = sum((getattr(InternshipStats, name) for name in statuses[1:]), getattr(InternshipStats, statuses[0]))
+    return db.session.scalar(db.select(func.coalesce(func.sum(total), 0)))
+
+# Recomputes every counter from the application table in one statement.
+def rebuild_counts():
+    db.session.execute(db.delete(InternshipStats))
+    db.session.execute(db.insert(InternshipStats).from_select(
+        ['internship_id', 'employer_id', *STATUSES],
+        db.select(
+            Internship.id,
+            Internship.employer_id,
+            *[func.coalesce(func.sum(case((Application.status == status, 1), else_=0)), 0) for status in STATUSES]
+        )
+        .outerjoin(Application, Application.internship_id == Internship.id)
+        .group_by(Internship.id, Internship.employer_id)
+    ))
+    db.session.commit()
+    return db.session.scalar(db.select(func.count()).select_from(InternshipStats))
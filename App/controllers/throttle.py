@@ -0,0 +1,35 @@
+from flask import current_app
+
+from App.metrics import define, inc
+from App.throttle import create_buckets
+
+define('login_attempts_total', 'counter', 'Login attempts, by outcome (allowed, or the bucket that throttled it).')
+
+def get_login_buckets():
+    buckets = current_app.extensions.get('login_buckets')
+    if buckets is None:
+        buckets = current_app.extensions['login_buckets'] = create_buckets(current_app.config['LOGIN_THROTTLE_PATH'])
+    return buckets
+
+# [(key, capacity, tokens per second), ...] for the buckets that are enabled;
+# a burst of 0 turns a bucket off.
+def login_limits(username, ip):
+    config = current_app.config
+    limits = []
+    if config['LOGIN_IP_BURST'] and ip:
+        limits.append((f'ip:{ip}', config['LOGIN_IP_BURST'], config['LOGIN_IP_PER_MINUTE'] / 60))
+    if config['LOGIN_USERNAME_BURST'] and isinstance(username, str) and username.strip():
+        limits.append((f'username:{username.strip().lower()}', config['LOGIN_USERNAME_BURST'],
+                       config['LOGIN_USERNAME_PER_MINUTE'] / 60))
+    return [limit for limit in limits if limit[2] > 0]
+
+# Takes a token from the caller's IP and the target username's buckets.
+# Returns 0 when the attempt may go ahead, else the seconds to wait. Called
+# before the user lookup so throttled attempts never reach the password hash.
+def throttle_login(username, ip):
+    limits = login_limits(username, ip)
+    if not limits:
+        return 0
+    retry_after, blocked = get_login_buckets().take(limits)
+    inc('login_attempts_total', [('outcome', f"throttled_{blocked.split(':', 1)[0]}" if blocked else 'allowed')])
+    return retry_after
@@ -0,0 +1,113 @@
+import mimetypes, os
+from datetime import datetime, timedelta
+
+from flask import current_app, send_file
+
+from App.models import Upload
+from App.database import db, insert_ignore
+from App.uploads import get_resumes, receive, install, discard, content_path, UploadTooLarge, UploadNotAllowed
+from .outbox import enqueue_event
+
+# queued for every upload whose text has not been extracted yet (resume.py)
+RESUME_STORED = 'upload.stored'
+
+def resume_root():
+    return get_resumes().config.destination
+
+# Streams a CV from `stream` into content-addressed storage and links it to
+# each of `owners` (applications and/or users), replacing whatever they
+# linked to before. Raises UploadNotAllowed for file types the resumes
+# upload set does not accept and UploadTooLarge as soon as the declared or
+# received size passes RESUME_MAX_BYTES, before anything is stored.
+def upload_resume(stream, filename, owners, content_type=None, content_length=None):
+    extension = os.path.splitext(filename or '')[1].lstrip('.').lower()
+    if not get_resumes().extension_allowed(extension):
+        raise UploadNotAllowed(f'{extension or "files without an extension"} cannot be uploaded as a resume')
+    max_bytes = current_app.config['RESUME_MAX_BYTES']
+    if content_length is not None and content_length > max_bytes:
+        raise UploadTooLarge(f'uploads are limited to {max_bytes} bytes')
+    root = resume_root()
+    tmp_path, sha256, size = receive(stream, root, max_bytes)
+    try:
+        db.session.execute(insert_ignore(Upload).values(
+            sha256=sha256, size=size, filename=os.path.basename(filename)[:255],
+            content_type=content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+            refcount=0, created_at=datetime.utcnow()
+        ))
+        upload = db.session.scalars(db.select(Upload).filter_by(sha256=sha256)).one()
+        for owner in owners:
+            link_upload(owner, upload.id)
+        if upload.extracted_at is None:
+            enqueue_event(RESUME_STORED, {'upload_id': upload.id})
+        db.session.commit()
+    except BaseException:
+        db.session.rollback()
+        discard(tmp_path)
+        raise
+    # installed after the commit so a concurrent `flask uploads gc` cannot
+    # remove the file once the new links are visible
+    install(tmp_path, root, sha256)
+    return upload
+
+def link_upload(owner, upload_id):
+    if owner.resume_id == upload_id:
+        return
+    if owner.resume_id is not None:
+        release_upload(owner.resume_id)
+    db.session.execute(
+        db.update(Upload).where(Upload.id == upload_id)
+        .values(refcount=Upload.refcount + 1, released_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    owner.resume_id = upload_id
+
+def unlink_upload(owner):
+    if owner.resume_id is not None:
+        release_upload(owner.resume_id)
+        owner.resume_id = None
+
+def release_upload(upload_id):
+    db.session.execute(
+        db.update(Upload).where(Upload.id == upload_id)
+        .values(refcount=Upload.refcount - 1, released_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+def get_upload(upload_id):
+    return db.session.get(Upload, upload_id) if upload_id is not None else None
+
+# send_file answers Range and If-None-Match/If-Modified-Since requests itself
+# and, with USE_X_SENDFILE, hands the transfer to the front-end server.
+def send_upload(upload, download_name=None):
+    return send_file(
+        os.path.abspath(content_path(resume_root(), upload.sha256)),
+        mimetype=upload.content_type,
+        as_attachment=True,
+        download_name=download_name or upload.filename or upload.sha256,
+        conditional=True,
+        etag=upload.sha256,
+    )
+
+def can_view_application_resume(user, application):
+    # an archived application's internship may be archived too
+    internship = application.internship or getattr(application, 'archived_internship', None)
+    return (user.is_staff() or user.id == application.student_id
+            or (user.is_employer() and internship is not None and internship.employer_id == user.id))
+
+# Deletes uploads no one has linked to for UPLOAD_GC_GRACE_SECONDS. Files go
+# before the rows are committed; an upload of the same content meanwhile
+# waits on the row and reinstalls the file after its own commit.
+def collect_unused_uploads():
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['UPLOAD_GC_GRACE_SECONDS'])
+    removed = db.session.scalars(
+        db.delete(Upload)
+        .where(Upload.refcount <= 0, db.or_(Upload.released_at < cutoff,
+                                            db.and_(Upload.released_at.is_(None), Upload.created_at < cutoff)))
+        .returning(Upload.sha256)
+        .execution_options(synchronize_session=False)
+    ).all()
+    root = resume_root()
+    for sha256 in removed:
+        discard(content_path(root, sha256))
+    db.session.commit()
+    return len(removed)
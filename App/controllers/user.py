@@ -1,5 +1,6 @@
 from App.models import User
 from App.database import db
+from .pagination import keyset_page
 
 def create_user(username, password, role='student'):
     newuser = User(username=username, password=password, role=role)
@@ -26,6 +27,12 @@ def get_user(id):
 def get_all_users():
     return db.session.scalars(db.select(User)).all()
 
+def get_users_page(limit=None, after=None, role=None):
+    query = db.select(User)
+    if role:
+        query = query.filter_by(role=role)
+    return keyset_page(query, User.id, limit, after)
+
 def get_all_users_json():
     users = get_all_users()
     if not users:
@@ -40,3 +47,11 @@ def update_user(id, username):
         db.session.commit()
         return True
     return None
+
+def update_user_role(id, role):
+    user = get_user(id)
+    if user and role in ('student', 'staff', 'employer'):
+        user.role = role
+        db.session.commit()
+        return True
+    return None
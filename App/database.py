@@ -1,14 +1,80 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 
 
 db = SQLAlchemy()
 
 def get_migrate(app):
+    from flask_migrate import Migrate
     return Migrate(app, db)
 
 def create_db():
     db.create_all()
     
 def init_db(app):
-    db.init_app(app)
\ No newline at end of file
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    db.init_app(app)
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    with app.app_context():
+        if pragmas and db.engine.dialect.name == 'sqlite':
+            event.listen(db.engine, 'connect', lambda connection, record: apply_pragmas(connection, pragmas))
+
+# Lets another Flask app (the admin) use `db` through `parent`'s engines, so
+# both share one connection pool instead of each opening its own. The
+# session is still scoped to whichever app context is active.
+def share_db(app, parent):
+    app.extensions['sqlalchemy'] = db
+    app.teardown_appcontext(db._teardown_session)
+    db._app_engines[app] = db._app_engines[parent]
+
+# Connection pooling for server databases. Every gevent greenlet holding a
+# session needs its own connection, so the pool is sized for the worker's
+# concurrency rather than SQLAlchemy's 5 + 10 default; pre-ping and recycle
+# drop connections the server or a proxy has closed.
+def engine_options(config):
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite':
+        return {}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+# Runs on every new SQLite connection. WAL lets readers continue while one
+# connection writes, synchronous=NORMAL skips the fsync on every commit (still
+# safe under WAL), and busy_timeout makes writers wait for the lock instead of
+# failing with "database is locked".
+def apply_pragmas(connection, pragmas):
+    cursor = connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name}={value}')
+    cursor.close()
+
+# INSERT that skips rows which would violate a unique constraint
+# (ON CONFLICT DO NOTHING on SQLite/Postgres, INSERT IGNORE on MySQL).
+def insert_ignore(model):
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects import postgresql
+        return postgresql.insert(model).on_conflict_do_nothing()
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects import sqlite
+        return sqlite.insert(model).on_conflict_do_nothing()
+    return db.insert(model).prefix_with('IGNORE')
+
+
+# The planner's row estimate for a table (Postgres pg_class.reltuples, kept
+# fresh by autovacuum/ANALYZE). None where the database has no such
+# statistic or the table was never analyzed.
+def estimated_row_count(model):
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return None
+    estimate = db.session.scalar(
+        db.text('SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:name AS regclass)'),
+        {'name': model.__table__.name}
+    )
+    return estimate if estimate is not None and estimate >= 0 else None
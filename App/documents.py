@@ -0,0 +1,102 @@
+import gzip, html, io, os, re, zipfile, zlib
+
+# Plain-text extraction for the file types the resumes upload set accepts
+# (flask_uploads TEXT + DOCUMENTS). Everything here is pure Python with no
+# app or database access, so it can run in a worker process. Extraction is
+# best effort: the text only feeds the applicant search index, so a layout
+# we do not understand yields fewer words rather than an error.
+#
+# Compressed parts (zip members, gzip, PDF streams) are inflated at most
+# MAX_INFLATED_BYTES per document, so a small decompression bomb cannot
+# exhaust the worker's memory; a part that would go over is skipped.
+
+MAX_INFLATED_BYTES = 16 * 1024 * 1024
+
+# members of zipped formats that hold the document's text
+ZIP_TEXT_MEMBERS = re.compile(r'^(word/(document|header\d*|footer\d*)\.xml|content\.xml|xl/sharedStrings\.xml)$')
+XML_TAG = re.compile(rb'<[^>]*>')
+RTF_CONTROL = re.compile(r'\\[a-z]+-?\d* ?|\\[^a-z]|[{}]')
+RTF_SKIPPED_GROUPS = re.compile(r'\{\\\*[^{}]*\}|\{\\(fonttbl|colortbl|stylesheet|info)[^{}]*(\{[^{}]*\}[^{}]*)*\}')
+PDF_STREAM = re.compile(rb'<<(.*?)>>\s*stream\r?\n(.*?)\r?\nendstream', re.S)
+PDF_TEXT_BLOCK = re.compile(rb'BT(.*?)ET', re.S)
+PDF_STRING = re.compile(rb'\(((?:\\.|[^\\)])*)\)', re.S)
+PDF_ESCAPE = re.compile(rb'\\([nrtbf()\\]|[0-7]{1,3})')
+PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'', b'f': b'', b'(': b'(', b')': b')', b'\\': b'\\'}
+# runs of printable characters pulled out of binary formats (.doc, .xls)
+PRINTABLE_RUN = re.compile(rb'[\x20-\x7e]{4,}')
+
+
+def extract_text(path, filename=None):
+    extension = os.path.splitext(filename or path)[1].lstrip('.').lower()
+    with open(path, 'rb') as file:
+        data = file.read()
+    if zipfile.is_zipfile(path):
+        return zip_text(path)
+    if extension == 'pdf' or data.startswith(b'%PDF'):
+        return pdf_text(data)
+    if extension == 'rtf' or data.startswith(b'{\\rtf'):
+        return rtf_text(data.decode('latin-1'))
+    if data.startswith(b'\x1f\x8b'):  # gnumeric workbooks are gzipped XML
+        return xml_text(gunzip(data, MAX_INFLATED_BYTES) or b'')
+    if extension == 'abw' or data.lstrip().startswith(b'<?xml'):
+        return xml_text(data)
+    if extension in ('doc', 'xls'):
+        return b' '.join(PRINTABLE_RUN.findall(data)).decode('ascii')
+    return data.decode('utf-8', errors='replace')
+
+def xml_text(data):
+    return html.unescape(XML_TAG.sub(b' ', data).decode('utf-8', errors='replace'))
+
+# Returns None when the data inflates to more than `limit` bytes.
+def gunzip(data, limit):
+    with gzip.GzipFile(fileobj=io.BytesIO(data)) as file:
+        inflated = file.read(limit + 1)
+    return inflated if len(inflated) <= limit else None
+
+def inflate(data, limit):
+    if limit < 1:  # a max_length of 0 would mean no limit
+        return None
+    inflater = zlib.decompressobj()
+    inflated = inflater.decompress(data, limit)
+    return None if inflater.unconsumed_tail else inflated
+
+def zip_text(path):
+    parts, budget = [], MAX_INFLATED_BYTES
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not ZIP_TEXT_MEMBERS.match(info.filename) or info.file_size > budget:
+                continue
+            # the declared size may lie, so the read is bounded too
+            with archive.open(info) as member:
+                data = member.read(budget + 1)
+            if len(data) > budget:
+                continue
+            budget -= len(data)
+            parts.append(xml_text(data))
+    return ' '.join(parts)
+
+def rtf_text(text):
+    return RTF_CONTROL.sub(' ', RTF_SKIPPED_GROUPS.sub(' ', text))
+
+def pdf_text(data):
+    parts, budget = [], MAX_INFLATED_BYTES
+    for header, stream in PDF_STREAM.findall(data):
+        if b'/FlateDecode' in header:
+            try:
+                stream = inflate(stream, budget)
+            except zlib.error:
+                continue
+            if stream is None:
+                continue
+            budget -= len(stream)
+        elif b'/Filter' in header:
+            continue  # images and other encodings carry no text we can read
+        for block in PDF_TEXT_BLOCK.findall(stream):
+            parts.extend(PDF_ESCAPE.sub(_pdf_unescape, string) for string in PDF_STRING.findall(block))
+    return b' '.join(parts).decode('latin-1')
+
+def _pdf_unescape(match):
+    escape = match.group(1)
+    if escape in PDF_ESCAPES:
+        return PDF_ESCAPES[escape]
+    return bytes([int(escape, 8) & 0xff])
@@ -1,12 +1,13 @@
 import os
 from flask import Flask, render_template
-from flask_uploads import DOCUMENTS, IMAGES, TEXT, UploadSet, configure_uploads
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import  FileStorage
 
 from App.database import init_db
 from App.config import load_config
+from App.metrics import setup_metrics
 
 
 from App.controllers import (
@@ -14,7 +15,7 @@ from App.controllers import (
     add_auth_context
 )
 
-from App.views import views, setup_admin
+from App.views import views, setup_admin, setup_fragment_cache
 
 
 
@@ -26,16 +27,20 @@ def create_app(overrides={}):
     app = Flask(__name__, static_url_path='/static')
     load_config(app, overrides)
     CORS(app)
+    setup_metrics(app)
     add_auth_context(app)
-    photos = UploadSet('photos', TEXT + DOCUMENTS + IMAGES)
-    configure_uploads(app, photos)
+    setup_fragment_cache(app)
     add_views(app)
     init_db(app)
     jwt = setup_jwt(app)
     setup_admin(app)
+    hops = app.config['TRUSTED_PROXY_HOPS']
+    if hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
     @jwt.invalid_token_loader
     @jwt.unauthorized_loader
     def custom_unauthorized_response(error):
-        return render_template('401.html', error=error), 401
+        # the token was just rejected, so skip looking the user up again
+        return render_template('401.html', error=error, is_authenticated=False, current_user=None), 401
     app.app_context().push()
     return app
\ No newline at end of file
@@ -0,0 +1,279 @@
+import atexit, json, logging, os, threading, time, uuid
+try:
+    import fcntl
+except ImportError:  # Windows: exited workers' files are kept
+    fcntl = None
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Prometheus-style counters and histograms without prometheus_client.
+#
+# Every process keeps its own values and, when METRICS_DIR is set, writes
+# them to `<METRICS_DIR>/metrics-<pid>-<token>.json` at most once every
+# METRICS_FLUSH_INTERVAL seconds. /metrics sums the files of all processes,
+# so the gunicorn workers report as one server. The files of exited workers
+# are folded into metrics-exited.json and deleted, so counters never go
+# backwards and the directory holds one file per live worker. Only processes
+# that serve requests write a file; CLI commands never do. With no directory
+# the values are only those of this process.
+
+slow_query_log = logging.getLogger('App.slow_queries')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+METRICS = {}  # name -> (type, help, buckets)
+
+def define(name, kind, help, buckets=None):
+    METRICS[name] = (kind, help, buckets)
+
+define('http_requests_total', 'counter', 'Requests handled, by endpoint, method and status.')
+define('http_request_duration_seconds', 'histogram', 'Request latency by endpoint.', LATENCY_BUCKETS)
+define('db_queries_per_request', 'histogram', 'SQL statements executed per request, by endpoint.', QUERY_COUNT_BUCKETS)
+define('db_query_duration_seconds_total', 'counter', 'Time spent in SQL statements, by endpoint.')
+define('db_slow_queries_total', 'counter', 'SQL statements slower than SLOW_QUERY_MS, by endpoint.')
+
+EXITED_FILE = 'metrics-exited.json'
+
+
+class Registry:
+
+    def __init__(self):
+        self.counters = {}    # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+        self.token = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self.flushed_at = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels=(), value=1):
+        key = (name, tuple(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        buckets = METRICS[name][2]
+        key = (name, tuple(labels))
+        with self._lock:
+            values = self.histograms.get(key)
+            if values is None:
+                values = self.histograms[key] = [0] * (len(buckets) + 2)
+            for position, bound in enumerate(buckets):
+                if value <= bound:
+                    values[position] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), list(values)] for (name, labels), values in self.histograms.items()],
+            }
+
+    def flush(self, directory):
+        self.flushed_at = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'metrics-{self.token}.json')
+        with open(path + '.tmp', 'w') as out:
+            json.dump(self.snapshot(), out)
+        os.replace(path + '.tmp', path)
+
+
+registry = Registry()
+
+def _reset_registry():
+    global registry
+    registry = Registry()
+
+# a forked worker starts counting from zero under its own file
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_registry)
+
+def inc(name, labels=(), value=1):
+    registry.inc(name, labels, value)
+
+def observe(name, value, labels=()):
+    registry.observe(name, value, labels)
+
+_exit_hook = []
+
+# The process flushes once more when it exits, but only once it has served a
+# request: the hook is registered by the first flush, not at startup.
+def flush_metrics(directory):
+    if directory:
+        registry.flush(directory)
+        if not _exit_hook:
+            _exit_hook.append(directory)
+            atexit.register(lambda: registry.flush(directory))
+
+def _read_snapshot(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _merge(snapshots):
+    counters, histograms = {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.get(key)
+            histograms[key] = values if total is None else [a + b for a, b in zip(total, values)]
+    return counters, histograms
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _worker_pid(name):
+    # metrics-<pid>-<token>.json
+    try:
+        return int(name.split('-')[1])
+    except (IndexError, ValueError):
+        return None
+
+# Adds the files of processes that no longer run to EXITED_FILE and deletes
+# them. The names merged are recorded in the same atomic write, so a crash
+# before the deletes never counts a file twice. Scrapes hold a lock while
+# compacting so two of them never merge the same file.
+def compact_exited(directory):
+    if fcntl is None:
+        return
+    with open(os.path.join(directory, '.compact.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        path = os.path.join(directory, EXITED_FILE)
+        exited = _read_snapshot(path) or {'counters': [], 'histograms': [], 'merged': []}
+        merged = set(exited.get('merged', []))
+        names = [entry.name for entry in os.scandir(directory)
+                 if entry.name.startswith('metrics-') and entry.name.endswith('.json') and entry.name != EXITED_FILE]
+        dead = [name for name in names if name not in merged and _worker_pid(name) is not None
+                and _worker_pid(name) != os.getpid() and not _pid_alive(_worker_pid(name))]
+        snapshots = [snapshot for snapshot in (_read_snapshot(os.path.join(directory, name)) for name in dead) if snapshot]
+        if dead:
+            counters, histograms = _merge([exited, *snapshots])
+            exited = {
+                'counters': [[name, [list(label) for label in labels], value] for (name, labels), value in counters.items()],
+                'histograms': [[name, [list(label) for label in labels], values] for (name, labels), values in histograms.items()],
+                # names are kept only until their files are gone
+                'merged': sorted((merged & set(names)) | set(dead)),
+            }
+            with open(path + '.tmp', 'w') as out:
+                json.dump(exited, out)
+            os.replace(path + '.tmp', path)
+        for name in dead or (merged & set(names)):
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+def collect(directory=None):
+    snapshots = [registry.snapshot()]
+    if directory:
+        flush_metrics(directory)
+        compact_exited(directory)
+        merged = set((_read_snapshot(os.path.join(directory, EXITED_FILE)) or {}).get('merged', []))
+        snapshots = []
+        for entry in os.scandir(directory):
+            if entry.name.startswith('metrics-') and entry.name.endswith('.json') and entry.name not in merged:
+                snapshot = _read_snapshot(entry.path)
+                if snapshot:
+                    snapshots.append(snapshot)
+    return _merge(snapshots)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+# Prometheus text exposition format, version 0.0.4.
+def render_metrics(directory=None):
+    counters, histograms = collect(directory)
+    lines = []
+    for name, (kind, help, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_labels(labels)} {_number(value)}')
+            continue
+        for (metric, labels), values in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(buckets, values):
+                lines.append(f'{name}_bucket{_labels(labels, [("le", _number(float(bound)))])} {count}')
+            lines.append(f'{name}_bucket{_labels(labels, [("le", "+Inf")])} {values[-1]}')
+            lines.append(f'{name}_sum{_labels(labels)} {_number(float(values[-2]))}')
+            lines.append(f'{name}_count{_labels(labels)} {values[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+'''
+Request and SQL instrumentation
+'''
+
+def _endpoint():
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    in_request = has_request_context() and 'sql_queries' in g
+    if in_request:
+        g.sql_queries += 1
+        g.sql_seconds += elapsed
+    threshold = current_app.config.get('SLOW_QUERY_MS') if has_app_context() else None
+    if threshold is not None and elapsed * 1000 >= threshold:
+        endpoint = _endpoint() if has_request_context() else 'none'
+        inc('db_slow_queries_total', [('endpoint', endpoint)])
+        slow_query_log.warning('slow query (%.1f ms) on %s: %s', elapsed * 1000, endpoint,
+                               ' '.join(statement.split())[:1000])
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+
+def _finish_request(response):
+    if 'request_started' not in g:
+        return response
+    endpoint = _endpoint()
+    labels = [('endpoint', endpoint)]
+    inc('http_requests_total', [*labels, ('method', request.method), ('status', str(response.status_code))])
+    observe('http_request_duration_seconds', time.perf_counter() - g.pop('request_started'), labels)
+    observe('db_queries_per_request', g.sql_queries, labels)
+    inc('db_query_duration_seconds_total', labels, g.sql_seconds)
+    directory = current_app.config.get('METRICS_DIR')
+    if directory and time.monotonic() - registry.flushed_at >= current_app.config['METRICS_FLUSH_INTERVAL']:
+        flush_metrics(directory)
+    return response
+
+def setup_metrics(app):
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
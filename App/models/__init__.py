@@ -1,3 +1,7 @@
-from .user import User
+from .user import User, RoleMixin
 from .internship import Internship
 from .application import Application
+from .stats import InternshipStats
+from .outbox import OutboxEvent
+from .upload import Upload
+from .archive import ArchivedInternship, ArchivedApplication
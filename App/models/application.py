@@ -1,10 +1,23 @@
 from App.database import db
+from datetime import datetime
 
 class Application(db.Model):
+    __table_args__ = (
+        # one application per student per internship, enforced by the database
+        db.Index('uq_application_student_internship', 'student_id', 'internship_id', unique=True),
+        db.Index('ix_application_student_status', 'student_id', 'status'),
+        db.Index('ix_application_internship_status', 'internship_id', 'status'),
+        db.Index('ix_application_created_at', 'created_at'),
+        # the admin list filtered by status, newest first
+        db.Index('ix_application_status_id', 'status', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     internship_id = db.Column(db.Integer, db.ForeignKey('internship.id'), nullable=False)
     status = db.Column(db.String(20), default='pending')  # pending, shortlisted, accepted, rejected
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    resume_id = db.Column(db.Integer, db.ForeignKey('upload.id'))
     
     # Relationships
     student = db.relationship('User', backref=db.backref('applications', lazy=True))
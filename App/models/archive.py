@@ -0,0 +1,79 @@
+from App.database import db
+from datetime import datetime
+from sqlalchemy import DDL, event
+
+# Cold copies of rows moved out of the hot tables by `flask archive run`
+# (see App/controllers/archive.py). Ids are kept, so an archived row can be
+# looked up by the id clients already know.
+
+class ArchivedInternship(db.Model):
+    __tablename__ = 'internship_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    employer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    is_active = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    employer = db.relationship('User', foreign_keys=[employer_id])
+
+    def get_json(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'employer_id': self.employer_id,
+            'employer_username': self.employer.username if self.employer else None,
+            'is_active': self.is_active,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'archived': True
+        }
+
+
+class ArchivedApplication(db.Model):
+    # On Postgres the table is partitioned by created_at, one partition per
+    # academic term, so old terms can be detached or dropped as a whole.
+    # Partitioning requires the partition key in the primary key and in any
+    # unique index, hence the composite key and the non-unique pair index.
+    __tablename__ = 'application_archive'
+    __table_args__ = (
+        db.Index('ix_application_archive_student_internship', 'student_id', 'internship_id'),
+        db.Index('ix_application_archive_internship_status', 'internship_id', 'status'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    created_at = db.Column(db.DateTime, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    internship_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    resume_id = db.Column(db.Integer, db.ForeignKey('upload.id'))
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    student = db.relationship('User', foreign_keys=[student_id])
+    # the internship may still be live or archived itself
+    internship = db.relationship('Internship', primaryjoin='foreign(ArchivedApplication.internship_id) == Internship.id',
+                                 viewonly=True)
+    archived_internship = db.relationship(
+        'ArchivedInternship', primaryjoin='foreign(ArchivedApplication.internship_id) == ArchivedInternship.id',
+        viewonly=True)
+
+    def get_json(self):
+        internship = self.internship or self.archived_internship
+        return {
+            'id': self.id,
+            'student_id': self.student_id,
+            'internship_id': self.internship_id,
+            'status': self.status,
+            'student_name': self.student.username if self.student else None,
+            'internship_title': internship.title if internship else None,
+            'archived': True
+        }
+
+
+# rows outside every term partition land here instead of failing the insert
+event.listen(ArchivedApplication.__table__, 'after_create', DDL(
+    'CREATE TABLE IF NOT EXISTS application_archive_default PARTITION OF application_archive DEFAULT'
+).execute_if(dialect='postgresql'))
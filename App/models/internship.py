@@ -2,6 +2,13 @@ from App.database import db
 from datetime import datetime
 
 class Internship(db.Model):
+    __table_args__ = (
+        db.Index('ix_internship_employer_active_created', 'employer_id', 'is_active', 'created_at'),
+        # admin list filters without an employer
+        db.Index('ix_internship_active_created', 'is_active', 'created_at'),
+        db.Index('ix_internship_created_at', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
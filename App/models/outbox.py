@@ -0,0 +1,36 @@
+from App.database import db
+from datetime import datetime
+
+class OutboxEvent(db.Model):
+    # Side effects (notifications, background jobs) recorded in the same
+    # transaction as the change that causes them, then delivered by
+    # `flask worker run`. A worker claims an event by setting claimed_until;
+    # if it dies the claim expires and another worker picks the event up.
+    __tablename__ = 'outbox_event'
+    __table_args__ = (
+        db.Index('ix_outbox_event_pending', 'delivered_at', 'failed_at', 'available_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    topic = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    available_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    claimed_by = db.Column(db.String(64))
+    claimed_until = db.Column(db.DateTime)
+    delivered_at = db.Column(db.DateTime)
+    failed_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+
+    def get_json(self):
+        return {
+            'id': self.id,
+            'topic': self.topic,
+            'payload': self.payload,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'delivered_at': self.delivered_at.isoformat() if self.delivered_at else None,
+            'failed_at': self.failed_at.isoformat() if self.failed_at else None,
+            'last_error': self.last_error
+        }
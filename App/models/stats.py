@@ -0,0 +1,23 @@
+from App.database import db
+
+class InternshipStats(db.Model):
+    # Application counts per status for one internship, kept up to date in the
+    # same transaction as every application insert or status change.
+    __tablename__ = 'internship_stats'
+
+    internship_id = db.Column(db.Integer, db.ForeignKey('internship.id'), primary_key=True)
+    employer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    pending = db.Column(db.Integer, nullable=False, default=0)
+    shortlisted = db.Column(db.Integer, nullable=False, default=0)
+    accepted = db.Column(db.Integer, nullable=False, default=0)
+    rejected = db.Column(db.Integer, nullable=False, default=0)
+
+    def get_json(self):
+        return {
+            'internship_id': self.internship_id,
+            'employer_id': self.employer_id,
+            'pending': self.pending,
+            'shortlisted': self.shortlisted,
+            'accepted': self.accepted,
+            'rejected': self.rejected
+        }
@@ -0,0 +1,28 @@
+from App.database import db
+from datetime import datetime
+
+class Upload(db.Model):
+    # One row per distinct file content, stored at its SHA-256 (see
+    # App/uploads.py). refcount is the number of users and applications
+    # linking to it; `flask uploads gc` removes files nobody links to.
+    # tokens holds the file's normalized words once the worker has extracted
+    # them (see App/controllers/resume.py); extracted_at is NULL until then.
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False, unique=True)
+    size = db.Column(db.Integer, nullable=False)
+    content_type = db.Column(db.String(100))
+    filename = db.Column(db.String(255))
+    refcount = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    released_at = db.Column(db.DateTime)
+    tokens = db.Column(db.Text)
+    extracted_at = db.Column(db.DateTime)
+
+    def get_json(self):
+        return {
+            'id': self.id,
+            'sha256': self.sha256,
+            'size': self.size,
+            'content_type': self.content_type,
+            'filename': self.filename
+        }
@@ -1,11 +1,25 @@
-from werkzeug.security import check_password_hash, generate_password_hash
 from App.database import db
+from App.passwords import hash_password, verify_password, needs_rehash
 
-class User(db.Model):
+class RoleMixin:
+    # shared by User and the lightweight cached user records
+
+    def is_student(self):
+        return self.role == 'student'
+    
+    def is_staff(self):
+        return self.role == 'staff'
+    
+    def is_employer(self):
+        return self.role == 'employer'
+
+
+class User(RoleMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(20), nullable=False, unique=True)
     password = db.Column(db.String(256), nullable=False)
     role = db.Column(db.String(20), default='student')  # student, staff, employer
+    resume_id = db.Column(db.Integer, db.ForeignKey('upload.id'))  # the student's current CV
 
     def __init__(self, username, password, role='student'):
         self.username = username
@@ -20,16 +34,10 @@ class User(db.Model):
         }
 
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password, password)
-    
-    def is_student(self):
-        return self.role == 'student'
-    
-    def is_staff(self):
-        return self.role == 'staff'
-    
-    def is_employer(self):
-        return self.role == 'employer'
+        return verify_password(self.password, password)
+
+    def password_needs_rehash(self):
+        return needs_rehash(self.password)
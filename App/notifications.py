@@ -0,0 +1,71 @@
+import json, os, smtplib, threading
+from email.message import EmailMessage
+
+# Where notifications are delivered. NOTIFICATION_SINKS names the sinks to
+# use, e.g. ['file'] or ['file', 'smtp']; every notification goes to each of
+# them. A sink raises to signal a failed delivery, which the outbox worker
+# retries, so sinks may see the same notification more than once.
+
+
+class FileSink:
+    # Appends one JSON line per notification.
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config['NOTIFICATION_FILE'])
+
+    def send(self, notification):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._lock, open(self.path, 'a') as out:
+            out.write(json.dumps(notification) + '\n')
+
+
+class SMTPSink:
+    # Emails the notification to `<username>@MAIL_DOMAIN`.
+
+    def __init__(self, host, port, sender, domain, timeout=10):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.domain = domain
+        self.timeout = timeout
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config['SMTP_HOST'], config['SMTP_PORT'], config['MAIL_SENDER'], config['MAIL_DOMAIN'])
+
+    def send(self, notification):
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = f"{notification['username']}@{self.domain}"
+        message['Subject'] = notification['subject']
+        message.set_content(notification['body'])
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(message)
+
+
+class MemorySink:
+    # Keeps notifications in a list; for tests and local development.
+
+    def __init__(self):
+        self.sent = []
+
+    @classmethod
+    def from_config(cls, config):
+        return cls()
+
+    def send(self, notification):
+        self.sent.append(notification)
+
+
+SINKS = {'file': FileSink, 'smtp': SMTPSink, 'memory': MemorySink}
+
+def register_sink(name, sink_class):
+    SINKS[name] = sink_class
+
+def create_sinks(config):
+    return [SINKS[name].from_config(config) for name in config['NOTIFICATION_SINKS']]
@@ -0,0 +1,83 @@
+import os, threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+# Password hashing is deliberately slow. hashlib releases the GIL while it
+# runs, so the work is handed to a small pool of native threads: under the
+# gevent workers in gunicorn_config.py the calling greenlet waits
+# cooperatively and the hub keeps serving other requests (e.g. /health)
+# instead of stalling for the whole hash. The pool size bounds how many
+# CPUs logins can occupy at once.
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _reset_pool():
+    global _pool
+    _pool = None
+
+# threads do not survive a fork, so every gunicorn worker builds its own pool
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pool)
+
+def _gevent_patched():
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                size = current_app.config.get('PASSWORD_HASH_THREADS') if has_app_context() else None
+                size = size or min(4, os.cpu_count() or 1)
+                if _gevent_patched():
+                    # patched threading would give us greenlets, not threads
+                    from gevent.threadpool import ThreadPool
+                    _pool = ThreadPool(size)
+                else:
+                    _pool = ThreadPoolExecutor(size, thread_name_prefix='passwords')
+    return _pool
+
+def run_in_pool(fn, *args):
+    pool = _get_pool()
+    if isinstance(pool, ThreadPoolExecutor):
+        return pool.submit(fn, *args).result()
+    return pool.apply(fn, args)
+
+def hash_method():
+    if has_app_context():
+        return normalize_method(current_app.config.get('PASSWORD_HASH_METHOD') or DEFAULT_METHOD)
+    return DEFAULT_METHOD
+
+# Spell out werkzeug's implicit defaults so stored hashes can be compared
+# with the configured policy, e.g. 'pbkdf2' -> 'pbkdf2:sha256:1000000'.
+def normalize_method(method):
+    name, *args = method.split(':')
+    if name == 'scrypt' and not args:
+        return DEFAULT_METHOD
+    if name == 'pbkdf2':
+        if not args:
+            args = ['sha256']
+        if len(args) == 1:
+            args.append(str(DEFAULT_PBKDF2_ITERATIONS))
+        return ':'.join([name, *args])
+    return method
+
+def hash_password(password, method=None):
+    return run_in_pool(generate_password_hash, password, method or hash_method())
+
+def verify_password(hashed, password):
+    return run_in_pool(check_password_hash, hashed, password)
+
+# True when the stored hash was made with different parameters than the
+# current PASSWORD_HASH_METHOD, so it should be replaced at the next login.
+def needs_rehash(hashed):
+    return hashed.split('$', 1)[0] != hash_method()
@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import event
+
+from App.main import create_app
+from App.views.admin import create_admin_app
+from App.database import db, create_db
+from App.models import Internship
+from App.controllers import (
+    create_student,
+    create_employer,
+    create_staff,
+    create_internship,
+    create_application,
+    count_applications,
+    get_employer_counts,
+    login
+)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-admin.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000', 'ADMIN_COUNT_CAP': 3})
+    create_db()
+    create_staff('adminstaff', 'pass')
+    create_student('adminstudent', 'pass')
+    employers = [create_employer(f'adminemployer{n}', 'pass') for n in range(3)]
+    internships = [create_internship(f'Role {n}', 'desc', employers[n % 3].id) for n in range(6)]
+    for n in range(8):
+        student = create_student(f'applicant{n}', 'pass')
+        for internship in internships[:n % 4 + 1]:
+            create_application(student.id, internship.id)
+    yield app
+    db.drop_all()
+
+@pytest.fixture
+def statements():
+    executed = []
+    listener = lambda conn, cursor, statement, *args: executed.append(' '.join(statement.split()))
+    # the admin app shares the parent's engine
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    yield executed
+    event.remove(db.engine, 'before_cursor_execute', listener)
+
+def staff_headers():
+    return {'Authorization': f"Bearer {login('adminstaff', 'pass')}"}
+
+def test_list_pages_eager_load_and_skip_table_counts(client, statements):
+    http = client.test_client()
+    response = http.get('/admin/application/', headers=staff_headers())
+    assert response.status_code == 200
+    assert b'applicant7' in response.data and b'Role 3' in response.data
+    assert count_applications() == 20
+    page = [statement for statement in statements if 'FROM application' in statement]
+    # one query for the rows with students and internships joined, none per row
+    assert len(page) == 1 and 'JOIN user' in page[0] and 'JOIN internship' in page[0]
+    assert not any('count(*)' in statement.lower() and 'FROM application' in statement for statement in statements)
+    response = http.get('/admin/internship/', headers=staff_headers())
+    assert response.status_code == 200 and b'adminemployer2' in response.data
+    assert http.get('/admin/internship/edit/?id=1', headers=staff_headers()).status_code == 200
+
+def test_filtered_counts_are_capped(client, statements):
+    http = client.test_client()
+    # flt0 is the status filter: 20 pending rows are counted only up to the cap of 3
+    response = http.get('/admin/application/?flt0_0=pending', headers=staff_headers())
+    assert response.status_code == 200
+    counts = [statement for statement in statements if 'count(*)' in statement.lower()]
+    assert len(counts) == 1 and 'LIMIT' in counts[0]
+
+def test_admin_shares_the_parent_engine(client):
+    admin = create_admin_app(client)
+    with admin.app_context():
+        engine = db.engine
+        assert db.session.scalar(db.select(db.func.count(Internship.id))) == 6
+    assert engine is db.engine
+
+def test_reassigned_internship_moves_its_counters(client):
+    http = client.test_client()
+    assert get_employer_counts(3)['totals']['pending'] == 10
+    response = http.post('/admin/internship/edit/?id=1', headers=staff_headers(),
+                         data={'title': 'Role 0', 'description': 'desc', 'employer': '4', 'is_active': 'y'})
+    assert response.status_code == 302
+    db.session.expire_all()
+    assert db.session.get(Internship, 1).employer_id == 4
+    assert get_employer_counts(3)['totals']['pending'] == 2
+    assert [row['internship_id'] for row in get_employer_counts(4)['internships']] == [1, 2]
+
+def test_only_staff_can_use_the_new_views(client):
+    http = client.test_client()
+    student = {'Authorization': f"Bearer {login('adminstudent', 'pass')}"}
+    assert http.get('/admin/application/', headers=student).status_code != 200
+    assert http.get('/admin/internship/', headers=student).status_code != 200
+    assert http.get('/admin/application/new/', headers=staff_headers()).status_code != 200
@@ -0,0 +1,143 @@
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+
+from App.main import create_app
+from App.database import db, create_db
+from App.controllers import (
+    create_student,
+    create_employer,
+    create_staff,
+    create_internship,
+    create_application,
+    get_users_page,
+    get_internships_page,
+    get_applications_page,
+    get_student_applications,
+    get_all_applications,
+    get_all_internships,
+    serialize_applications,
+    login
+)
+from App.models import Application
+
+@contextmanager
+def count_queries():
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    db.session.expunge_all()
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+'''
+    Pagination Tests
+'''
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-api.db'})
+    create_db()
+    employer = create_employer("acme", "acmepass")
+    for i in range(5):
+        create_student(f"student{i}", "pass")
+    for i in range(3):
+        create_internship(f"Intern {i}", "desc", employer.id)
+    create_application(2, 1)
+    create_application(2, 2)
+    create_application(3, 1)
+    yield app.test_client()
+    db.drop_all()
+
+
+def test_users_page_walks_whole_table():
+    seen, after = [], None
+    while True:
+        users, after = get_users_page(limit=2, after=after)
+        seen += [user.id for user in users]
+        if after is None:
+            break
+    assert seen == [1, 2, 3, 4, 5, 6]
+
+def test_users_page_role_filter():
+    users, next_cursor = get_users_page(role='employer')
+    assert [user.username for user in users] == ['acme']
+    assert next_cursor is None
+
+def test_internships_page_filters():
+    internships, _ = get_internships_page(employer_id=1, is_active=True, after=1)
+    assert [internship.id for internship in internships] == [2, 3]
+    internships, _ = get_internships_page(is_active=False)
+    assert internships == []
+
+def test_applications_page_filters():
+    applications, _ = get_applications_page(student_id=2)
+    assert [application.internship_id for application in applications] == [1, 2]
+    applications, _ = get_applications_page(employer_id=1, internship_id=1, status='pending')
+    assert [application.student_id for application in applications] == [2, 3]
+
+def test_api_users_next_cursor(client):
+    response = client.get('/api/users?limit=4')
+    assert [user['id'] for user in response.json] == [1, 2, 3, 4]
+    assert response.headers['X-Next-Cursor'] == '4'
+    response = client.get('/api/users?limit=4&after=4')
+    assert [user['id'] for user in response.json] == [5, 6]
+    assert 'X-Next-Cursor' not in response.headers
+
+def test_api_internships(client):
+    response = client.get('/api/internships?employer_id=1&limit=2')
+    assert [internship['title'] for internship in response.json] == ['Intern 0', 'Intern 1']
+    assert 'after=2' in response.headers['Link']
+
+def test_api_applications_scoped_to_student(client):
+    token = login("student0", "pass")
+    response = client.get('/api/applications', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert [application['student_id'] for application in response.json] == [2, 2]
+
+'''
+    Query Count Tests
+'''
+
+def test_student_applications_single_query():
+    with count_queries() as statements:
+        [application.get_json() for application in get_student_applications(2)]
+    assert len(statements) == 1
+
+def test_all_applications_single_query():
+    with count_queries() as statements:
+        listing = [application.get_json() for application in get_all_applications()]
+    assert len(listing) == 3
+    assert len(statements) == 1
+
+def test_internship_listing_single_query():
+    with count_queries() as statements:
+        [internship.get_json() for internship in get_all_internships()]
+    assert len(statements) == 1
+
+def test_serialize_applications_constant_queries():
+    expected = [application.get_json() for application in Application.query.order_by(Application.id)]
+    with count_queries() as statements:
+        rows = Application.query.order_by(Application.id).all()
+        assert serialize_applications(rows) == expected
+    assert len(statements) == 3
+
+def test_api_applications_scoped_to_employer(client):
+    # runs last: it adds users and applications the counts above do not expect
+    globex = create_employer("globex", "globexpass")
+    internship = create_internship("Globex Intern", "desc", globex.id)
+    create_application(4, internship.id)
+    create_staff("apistaff", "pass")
+    def ids(username, password, query=''):
+        token = login(username, password)
+        response = client.get(f'/api/applications{query}', headers={'Authorization': f'Bearer {token}'})
+        return [application['id'] for application in response.json]
+    assert ids("globex", "globexpass") == [4]
+    # another employer's filters do not widen the listing
+    assert ids("globex", "globexpass", '?employer_id=1') == [4]
+    assert ids("globex", "globexpass", '?internship_id=1') == []
+    assert ids("acme", "acmepass") == [1, 2, 3]
+    assert ids("apistaff", "pass") == [1, 2, 3, 4]
@@ -0,0 +1,92 @@
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import Application
+from App.controllers import (
+    create_student,
+    create_staff,
+    create_employer,
+    create_internship,
+    create_application,
+    bulk_transition,
+    login
+)
+
+'''
+    Application Workflow Tests
+'''
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-application.db'})
+    create_db()
+    create_staff("staff", "staffpass")          # 1
+    create_employer("acme", "acmepass")         # 2
+    create_employer("globex", "globexpass")     # 3
+    for i in range(4):
+        create_student(f"student{i}", "pass")   # 4..7
+    create_internship("Acme Intern", "desc", 2)     # 1
+    create_internship("Globex Intern", "desc", 3)   # 2
+    for student_id in range(4, 8):
+        create_application(student_id, 1)           # 1..4
+    create_application(4, 2)                        # 5
+    yield app.test_client()
+    db.drop_all()
+
+def statuses():
+    return dict(db.session.execute(db.select(Application.id, Application.status)).all())
+
+
+def test_bulk_shortlist_reports_per_id():
+    results = bulk_transition([1, 2, 99, 2], 1, 'shortlisted')
+    assert results == {1: 'updated', 2: 'updated', 99: 'not_found'}
+    assert bulk_transition([1], 1, 'shortlisted') == {1: 'invalid_transition'}
+
+def test_bulk_requires_the_right_role():
+    assert bulk_transition([3], 2, 'shortlisted') == {3: 'forbidden'}
+    assert bulk_transition([3], 1, 'accepted') == {3: 'forbidden'}
+
+def test_employer_only_decides_own_internships():
+    results = bulk_transition([1, 3, 5], 2, 'accepted')
+    assert results == {1: 'updated', 3: 'updated', 5: 'forbidden'}
+    assert bulk_transition([1], 2, 'rejected') == {1: 'invalid_transition'}
+    assert statuses() == {1: 'accepted', 2: 'shortlisted', 3: 'accepted', 4: 'pending', 5: 'pending'}
+
+def test_unknown_status_rejected():
+    with pytest.raises(ValueError):
+        bulk_transition([4], 1, 'hired')
+
+def test_bulk_endpoint(client):
+    token = login("acme", "acmepass")
+    headers = {'Authorization': f'Bearer {token}'}
+    response = client.post('/api/applications/bulk', json={'ids': [2, 4], 'status': 'rejected'}, headers=headers)
+    assert response.json['results'] == [{'id': 2, 'result': 'updated'}, {'id': 4, 'result': 'updated'}]
+    response = client.post('/api/applications/bulk', json={'ids': [2], 'status': 'hired'}, headers=headers)
+    assert response.status_code == 400
+
+'''
+    Counter Tests
+'''
+
+def test_counters_follow_every_transition():
+    from App.controllers import get_internship_counts, rebuild_counts
+    live = {internship_id: get_internship_counts(internship_id) for internship_id in (1, 2)}
+    assert live[1] == {'pending': 0, 'shortlisted': 0, 'accepted': 2, 'rejected': 2}
+    assert live[2] == {'pending': 1, 'shortlisted': 0, 'accepted': 0, 'rejected': 0}
+    create_application(5, 2)
+    assert create_application(5, 2) is None
+    assert get_internship_counts(2)['pending'] == 2
+    rebuild_counts()
+    assert get_internship_counts(1) == live[1]
+    assert get_internship_counts(2)['pending'] == 2
+
+def test_employer_counts_endpoint(client):
+    token = login("acme", "acmepass")
+    response = client.get('/api/employers/2/stats', headers={'Authorization': f'Bearer {token}'})
+    assert response.json['totals'] == {'pending': 0, 'shortlisted': 0, 'accepted': 2, 'rejected': 2}
+    response = client.get('/api/internships/2/stats', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 403
+    token = login("staff", "staffpass")
+    response = client.get('/api/internships/2/stats', headers={'Authorization': f'Bearer {token}'})
+    assert response.json['pending'] == 2
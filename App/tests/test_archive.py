@@ -0,0 +1,106 @@
+import json
+from datetime import datetime
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import Application, Internship, ArchivedApplication, ArchivedInternship
+from App.controllers import (
+    create_student,
+    create_employer,
+    create_internship,
+    submit_application,
+    get_applications_page,
+    get_application,
+    export_applications,
+    get_internship_by_id,
+    get_internship_counts,
+    run_archive,
+    rebuild_counts,
+    term_start,
+    next_term_start,
+    term_name,
+    login
+)
+
+NOW = datetime(2026, 6, 1)
+OLD = datetime(2024, 3, 1)
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-archive.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000'})
+    create_db()
+    employer = create_employer('archiveemployer', 'pass')    # 1
+    for n in range(3):
+        create_student(f'archivestudent{n}', 'pass')        # 2, 3, 4
+    create_internship('Live Intern', 'desc', employer.id)  # 1
+    create_internship('Closed Intern', 'desc', employer.id)  # 2
+    for student_id, internship_id in ((2, 1), (3, 1), (2, 2), (3, 2)):  # applications 1-4
+        submit_application(student_id, internship_id)
+    create_internship('New Intern', 'desc', employer.id)  # 3
+    submit_application(4, 3)  # 5
+    db.session.execute(db.update(Application).values(created_at=OLD).where(Application.id <= 4))
+    db.session.execute(db.update(Application).values(status='accepted').where(Application.id.in_([1, 3])))
+    db.session.execute(db.update(Application).values(status='rejected').where(Application.id == 4))
+    db.session.execute(db.update(Internship).values(created_at=OLD, is_active=False).where(Internship.id == 2))
+    db.session.commit()
+    rebuild_counts()
+    yield app
+    db.drop_all()
+
+def test_run_archive(client):
+    assert run_archive(days=365, now=NOW) == {'applications': 3, 'internships': 1}
+    # the pending application and the newest rows stay
+    assert db.session.scalars(db.select(Application.id).order_by(Application.id)).all() == [2, 5]
+    assert db.session.scalars(db.select(Internship.id).order_by(Internship.id)).all() == [1, 3]
+    assert db.session.scalars(db.select(ArchivedApplication.id).order_by(ArchivedApplication.id)).all() == [1, 3, 4]
+    assert db.session.get(ArchivedInternship, 2).archived_at == NOW
+    assert run_archive(days=365, now=NOW) == {'applications': 0, 'internships': 0}
+
+def test_include_archived(client):
+    assert get_internship_counts(1)['accepted'] == 0
+    assert get_internship_counts(1, include_archived=True)['accepted'] == 1
+    assert get_internship_by_id(2) is None
+    assert get_internship_by_id(2, include_archived=True).title == 'Closed Intern'
+    assert get_applications_page(student_id=2)[0] == []
+    applications, next_cursor = get_applications_page(student_id=2, include_archived=True, limit=1)
+    assert [application.id for application in applications] == [1] and next_cursor == 1
+    applications, _ = get_applications_page(student_id=2, include_archived=True, after=1)
+    assert [application.get_json()['internship_title'] for application in applications] == ['Closed Intern']
+    assert get_application(3) is None
+    assert get_application(3, include_archived=True).status == 'accepted'
+    assert get_application(2, include_archived=True).id == 2
+    # an archived decision is still a duplicate
+    assert submit_application(2, 1) == ('duplicate', 1)
+
+def test_export_include_archived(client):
+    def rows(**filters):
+        return [json.loads(line) for line in ''.join(export_applications('ndjson', **filters)).splitlines()]
+    assert [row['id'] for row in rows()] == [2, 5]
+    exported = rows(include_archived=True)
+    assert [row['id'] for row in exported] == [1, 2, 3, 4, 5]
+    assert [row['internship_title'] for row in exported][2:4] == ['Closed Intern', 'Closed Intern']
+    assert [row['id'] for row in rows(include_archived=True, internship_id=2)] == [3, 4]
+    assert [row['id'] for row in rows(include_archived=True, status='accepted')] == [1, 3]
+
+def test_api(client):
+    http = client.test_client()
+    ids = [internship['id'] for internship in http.get('/api/internships').json]
+    assert ids == [1, 3]
+    response = http.get('/api/internships?include_archived=true')
+    assert [internship['id'] for internship in response.json] == [1, 2, 3]
+    headers = {'Authorization': f"Bearer {login('archiveemployer', 'pass')}"}
+    assert http.get('/api/internships/2/stats', headers=headers).status_code == 404
+    response = http.get('/api/internships/2/stats?include_archived=1', headers=headers)
+    assert response.json['accepted'] == 1 and response.json['rejected'] == 1
+    # archived applications have no resume here, but are found
+    assert http.get('/api/applications/3/resume', headers=headers).json['message'] == 'application not found'
+    assert http.get('/api/applications/3/resume?include_archived=1', headers=headers).json['message'] == 'no resume attached'
+    response = http.get('/api/applications/export?format=ndjson&include_archived=1', headers=headers)
+    assert len(response.get_data(as_text=True).splitlines()) == 5
+
+def test_terms(client):
+    assert term_start(datetime(2026, 4, 30)) == datetime(2026, 1, 1)
+    assert next_term_start(datetime(2026, 9, 1)) == datetime(2027, 1, 1)
+    assert term_name(datetime(2026, 5, 1)) == '2026_summer'
@@ -0,0 +1,110 @@
+import threading, pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import User
+from App.passwords import hash_password, verify_password, needs_rehash, normalize_method, run_in_pool
+from App.controllers import (
+    create_user,
+    get_user_by_username,
+    login,
+    load_user,
+    get_user_cache,
+    update_user,
+    update_user_role,
+    CachedUser
+)
+
+'''
+    Password Hashing Tests
+'''
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-auth.db',
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000'
+    })
+    create_db()
+    yield app
+    db.drop_all()
+
+
+def test_normalize_method_fills_werkzeug_defaults():
+    assert normalize_method('scrypt') == 'scrypt:32768:8:1'
+    assert normalize_method('pbkdf2:sha512').startswith('pbkdf2:sha512:')
+    assert normalize_method('pbkdf2:sha256:1000') == 'pbkdf2:sha256:1000'
+
+def test_hashing_runs_off_the_calling_thread():
+    assert run_in_pool(threading.current_thread) is not threading.current_thread()
+    hashed = hash_password("secret")
+    assert hashed.startswith('pbkdf2:sha256:1000$')
+    assert verify_password(hashed, "secret")
+    assert not verify_password(hashed, "wrong")
+
+def test_login_rehashes_outdated_hash(client):
+    user = create_user("carol", "carolpass")
+    user.password = hash_password("carolpass", method='pbkdf2:sha256:500')
+    db.session.commit()
+    assert needs_rehash(user.password)
+    assert login("carol", "wrongpass") is None
+    assert get_user_by_username("carol").password.startswith('pbkdf2:sha256:500$')
+    assert login("carol", "carolpass") is not None
+    user = get_user_by_username("carol")
+    assert user.password.startswith('pbkdf2:sha256:1000$')
+    assert user.check_password("carolpass")
+
+'''
+    User Lookup Cache Tests
+'''
+
+def test_load_user_caches_lightweight_record():
+    user = create_user("dave", "davepass")
+    get_user_cache().clear()
+    misses = get_user_cache().misses
+    record = load_user(user.id)
+    assert isinstance(record, CachedUser)
+    assert record.username == "dave" and record.is_student()
+    assert load_user(user.id) is record
+    assert get_user_cache().misses == misses + 1
+
+def test_update_user_and_role_change_invalidate_cache():
+    user = get_user_by_username("dave")
+    load_user(user.id)
+    update_user(user.id, "david")
+    assert load_user(user.id).username == "david"
+    update_user_role(user.id, "staff")
+    assert load_user(user.id).is_staff()
+
+def test_other_workers_see_role_changes(client):
+    user = get_user_by_username("david")
+    record = load_user(user.id)
+    # another worker commits the change: only the shared table version moves
+    db.session.execute(db.update(User).where(User.id == user.id).values(role='student'))
+    db.session.commit()
+    assert record.is_staff()
+    assert load_user(user.id).is_student()
+
+def test_authenticated_page_resolves_user_once(client):
+    get_user_cache().clear()
+    token = login("david", "davepass")
+    test_client = client.test_client()
+    test_client.set_cookie('access_token', token)
+    hits, misses = get_user_cache().hits, get_user_cache().misses
+    response = test_client.get('/identify')
+    assert b'david' in response.data
+    assert (get_user_cache().hits, get_user_cache().misses) == (hits, misses + 1)
+    response = test_client.get('/identify')
+    assert get_user_cache().hits == hits + 1
+
+def test_anonymous_and_bad_tokens_render_quietly(client, capsys):
+    test_client = client.test_client()
+    assert test_client.get('/').status_code == 200
+    test_client.set_cookie('access_token', 'not-a-jwt')
+    assert test_client.get('/').status_code == 200
+    assert capsys.readouterr().out == ''
+
+def test_cache_stats_endpoint(client):
+    response = client.test_client().get('/api/cache/stats')
+    assert set(response.json['user_cache']) == {'hits', 'misses', 'size', 'maxsize', 'bytes'}
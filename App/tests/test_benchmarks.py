@@ -0,0 +1,72 @@
+import datetime, sqlite3
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import User, Internship, Application, InternshipStats
+from App.benchmarks.seed import seed_data
+from App.benchmarks.suite import compare, run_suite, time_calls
+
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-benchmarks.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000'})
+    create_db()
+    yield app
+    db.drop_all()
+
+def count(model):
+    return db.session.scalar(db.select(db.func.count()).select_from(model))
+
+def test_seed_data_volumes_and_counters():
+    data = seed_data(users=200, internships=30, applications=500, seed=1, prefix='t')
+    assert count(User) == 200
+    assert count(Internship) == 30
+    assert count(Application) == 500 == len(data['applied'])
+    assert db.session.scalar(db.select(db.func.sum(InternshipStats.pending))) == count(
+        db.select(Application).filter_by(status='pending').subquery())
+    # one precomputed hash is shared by every seeded user
+    assert db.session.scalar(db.select(db.func.count(db.distinct(User.password)))) == 1
+
+def test_seed_data_is_deterministic():
+    first = seed_data(users=50, internships=5, applications=40, seed=7, prefix='a')
+    second = seed_data(users=50, internships=5, applications=40, seed=7, prefix='b')
+    def normalized(data):
+        students, internships = data['students'][0], data['internships'][0]
+        return {(student_id - students, internship_id - internships) for student_id, internship_id in data['applied']}
+    assert normalized(first) == normalized(second)
+
+def test_seed_data_spreads_creation_dates():
+    data = seed_data(users=40, internships=6, applications=30, seed=3, prefix='d', days=30, hash_each=True)
+    posted = dict(db.session.execute(
+        db.select(Internship.id, Internship.created_at).where(Internship.id.in_(data['internships']))
+    ).all())
+    rows = db.session.execute(db.select(Application.internship_id, Application.created_at).where(
+        Application.internship_id.in_(data['internships']))).all()
+    assert len(set(posted.values())) == 6
+    assert max(posted.values()) - min(posted.values()) <= datetime.timedelta(days=30)
+    assert all(created_at >= posted[internship_id] for internship_id, created_at in rows)
+    hashes = db.session.scalars(db.select(User.password).where(User.username.like('d\\_%', escape='\\')))
+    assert len(set(hashes)) == 40
+
+def test_time_calls_summarizes():
+    result = time_calls(lambda n: None, 10)
+    assert result['count'] == 10 and result['p50_ms'] >= 0
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {'results': {'fast': {'p50_ms': 0.2}, 'slow': {'p50_ms': 10.0}, 'gone': {'p50_ms': 1.0}}}
+    current = {'results': {'fast': {'p50_ms': 0.9}, 'slow': {'p50_ms': 14.0}}}
+    # 0.2 -> 0.9 ms stays under the 1 ms noise floor; 10 -> 14 ms is a 40% regression
+    assert compare(current, baseline, tolerance=0.25) == [('slow', 10.0, 14.0)]
+    assert compare(current, baseline, tolerance=0.5) == []
+
+def test_suite_refuses_a_database_with_tables(tmp_path):
+    path = tmp_path / 'precious.db'
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE keep (id INTEGER)')
+    messages = []
+    status = run_suite(10, 2, 5, 1, 0, None, None, 0.25, database_uri=f'sqlite:///{path}', echo=messages.append)
+    assert status == 2 and 'refusing' in messages[0]
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == [('keep',)]
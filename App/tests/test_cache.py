@@ -0,0 +1,170 @@
+import pytest
+from flask import render_template_string
+from sqlalchemy import Engine, event
+
+from App.main import create_app
+from App.database import db, create_db
+from App.cache import LRUCache, FileCache
+from App.controllers import (
+    create_student,
+    create_staff,
+    create_employer,
+    create_internship,
+    create_application,
+    bulk_transition,
+    table_versions,
+    login
+)
+
+'''
+    Backend Tests
+'''
+
+def test_lru_cache_evicts_by_size():
+    cache = LRUCache(maxsize=10, maxbytes=100)
+    cache.set('a', b'x' * 60, size=60)
+    cache.set('b', b'x' * 60, size=60)
+    assert cache.get('a') is None
+    assert cache.get('b') == b'x' * 60
+    assert cache.bytes == 60
+
+def test_lru_cache_versions_survive_eviction():
+    cache = LRUCache(maxsize=1)
+    cache.bump_version('user')
+    version = cache.get_version('user')
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get_version('user') == version
+    cache.bump_version('user')
+    assert cache.get_version('user') != version
+
+def test_file_cache_round_trip(tmp_path):
+    cache = FileCache(str(tmp_path), ttl=60)
+    other = FileCache(str(tmp_path), ttl=60)
+    cache.set('key', ('body', 1))
+    assert other.get('key') == ('body', 1)
+    before = other.get_version('user')
+    cache.bump_version('user')
+    assert other.get_version('user') != before
+    cache.delete('key')
+    assert other.get('key') is None
+
+def test_file_cache_sweep_keeps_under_limit(tmp_path):
+    cache = FileCache(str(tmp_path), maxbytes=2000)
+    for number in range(20):
+        cache.set(f'key{number}', b'x' * 500)
+    cache.sweep()
+    assert sum(size for _, _, size in cache._entries()) <= 2000
+
+
+'''
+    Response Cache Tests
+'''
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-cache.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000'})
+    create_db()
+    staff = create_staff('cachestaff', 'pass')
+    employer = create_employer('cacheemployer', 'pass')
+    for name in ('cachebob', 'cachesue'):
+        student = create_student(name, 'pass')
+        internship = create_internship(f'Intern for {name}', 'Work', employer.id)
+        create_application(student.id, internship.id)
+    yield app
+    db.drop_all()
+
+def auth_headers(username):
+    return {'Authorization': f"Bearer {login(username, 'pass')}"}
+
+def test_etag_and_not_modified(client):
+    http = client.test_client()
+    first = http.get('/api/users?limit=2')
+    assert first.headers['X-Cache'] == 'MISS'
+    etag = first.headers['ETag']
+    second = http.get('/api/users?limit=2')
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.json == first.json
+    assert second.headers['X-Next-Cursor'] == first.headers['X-Next-Cursor']
+    revalidated = http.get('/api/users?limit=2', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+
+def test_query_args_are_part_of_the_key(client):
+    http = client.test_client()
+    http.get('/api/users?role=student')
+    response = http.get('/api/users?role=employer')
+    assert [user['username'] for user in response.json] == ['cacheemployer']
+
+def test_commit_invalidates_cached_responses(client):
+    http = client.test_client()
+    etag = http.get('/api/internships').headers['ETag']
+    create_internship('Brand new role', 'Work', 2)
+    response = http.get('/api/internships', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['X-Cache'] == 'MISS'
+    assert 'Brand new role' in [internship['title'] for internship in response.json]
+
+def test_bulk_statements_bump_versions(client):
+    before = table_versions(['application'])
+    assert bulk_transition([1], 1, 'shortlisted') == {1: 'updated'}
+    assert table_versions(['application']) != before
+
+def test_per_user_responses_are_not_shared(client):
+    http = client.test_client()
+    bob = http.get('/api/applications', headers=auth_headers('cachebob'))
+    sue = http.get('/api/applications', headers=auth_headers('cachesue'))
+    assert sue.headers['X-Cache'] == 'MISS'
+    assert [row['student_name'] for row in bob.json] == ['cachebob']
+    assert [row['student_name'] for row in sue.json] == ['cachesue']
+    assert bob.headers['Cache-Control'] == 'private, no-cache'
+
+def test_users_page_table_is_a_cached_fragment(client):
+    http = client.test_client()
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(Engine, 'before_cursor_execute', record)
+    try:
+        assert b'cachebob' in http.get('/users').data
+        statements.clear()
+        page = http.get('/users')
+        assert b'cachebob' in page.data and statements == []
+        create_student('cachenewbie', 'pass')
+        assert b'cachenewbie' in http.get('/users').data
+    finally:
+        event.remove(Engine, 'before_cursor_execute', record)
+
+def test_header_is_rendered_around_the_fragment(client):
+    http = client.test_client()
+    anonymous = http.get('/users').data
+    bob = http.get('/users', headers=auth_headers('cachebob')).data
+    assert b'Logout' in bob and b'Logout' not in anonymous
+    assert b'<td>cachesue</td>' in anonymous and b'<td>cachesue</td>' in bob
+
+def test_fragment_keys(client):
+    template = "{% cache 'greeting', tables=('user',), per_user=True, vary=lang %}{{ lang }} {{ n() }}{% endcache %}"
+    calls = []
+    def n():
+        calls.append(1)
+        return len(calls)
+    with client.test_request_context('/'):
+        client.preprocess_request()
+        assert render_template_string(template, lang='en', n=n) == 'en 1'
+        assert render_template_string(template, lang='en', n=n) == 'en 1'
+        assert render_template_string(template, lang='fr', n=n) == 'fr 2'
+    with client.test_request_context('/', headers=auth_headers('cachebob')):
+        client.preprocess_request()
+        assert render_template_string(template, lang='en', n=n) == 'en 3'
+
+def test_disabled_cache_serves_directly(client):
+    client.config['RESPONSE_CACHE_TYPE'] = 'none'
+    client.extensions.pop('response_cache')
+    try:
+        response = client.test_client().get('/api/users')
+        assert response.status_code == 200
+        assert 'X-Cache' not in response.headers
+        assert b'cachebob' in client.test_client().get('/users').data
+    finally:
+        client.config['RESPONSE_CACHE_TYPE'] = 'lru'
+        client.extensions.pop('response_cache')
@@ -0,0 +1,32 @@
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db, engine_options
+from App.config import SQLITE_PRAGMAS
+from App.benchmarks.sqlite_writes import stress
+
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-database.db'})
+    create_db()
+    yield app
+    db.drop_all()
+
+def test_sqlite_pragmas_applied_on_connect():
+    assert db.session.execute(db.text('PRAGMA journal_mode')).scalar() == 'wal'
+    assert db.session.execute(db.text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+    assert db.session.execute(db.text('PRAGMA busy_timeout')).scalar() == 5000
+
+def test_server_databases_get_a_pool_profile(client):
+    options = engine_options(dict(client.config, SQLALCHEMY_DATABASE_URI='postgresql://app@db/app'))
+    assert options == {'pool_size': 20, 'max_overflow': 20, 'pool_timeout': 10,
+                       'pool_recycle': 1800, 'pool_pre_ping': True}
+    assert engine_options(client.config) == {}
+
+# throughput is compared by `python -m App.benchmarks.sqlite_writes`, not here
+def test_concurrent_writers_with_sqlite_profile():
+    tuned = stress(SQLITE_PRAGMAS, threads=8, writes=25)
+    assert tuned['journal_mode'] == 'wal' and tuned['busy_timeout'] == 5000
+    assert tuned['locked_errors'] == 0
+    assert tuned['errors'] == 0 and tuned['writes'] == 200
@@ -0,0 +1,83 @@
+import csv, io, json
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import Application
+from App.controllers import (
+    create_student,
+    create_staff,
+    create_employer,
+    create_internship,
+    create_application,
+    export_applications,
+    login
+)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-export.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000'})
+    create_db()
+    create_staff('exportstaff', 'pass')
+    acme = create_employer('acme', 'pass')
+    globex = create_employer('globex', 'pass')
+    data = create_internship('Data Intern', 'Numbers', acme.id)
+    design = create_internship('Design Intern', 'Pixels', globex.id)
+    for number in range(5):
+        student = create_student(f'exporter{number}', 'pass')
+        create_application(student.id, data.id)
+        if number % 2:
+            create_application(student.id, design.id)
+    db.session.get(Application, 1).created_at = datetime(2025, 1, 10)
+    db.session.commit()
+    yield app
+    db.drop_all()
+
+def auth_headers(username):
+    return {'Authorization': f"Bearer {login(username, 'pass')}"}
+
+def test_csv_export_is_one_joined_query():
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        text = ''.join(export_applications('csv', batch_size=2))
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert len(statements) == 1
+    assert [row['id'] for row in rows] == [str(number) for number in range(1, 8)]
+    assert rows[0]['student_name'] == 'exporter0'
+    assert rows[0]['internship_title'] == 'Data Intern'
+    assert rows[0]['employer_name'] == 'acme'
+    assert rows[0]['created_at'] == '2025-01-10T00:00:00'
+
+def test_filters():
+    def ids(**filters):
+        return [row['id'] for row in map(json.loads, ''.join(export_applications('ndjson', **filters)).splitlines())]
+    assert ids(employer_id=3) == [3, 6]
+    assert ids(internship_id=1, status='pending') == [1, 2, 4, 5, 7]
+    assert ids(until=datetime(2025, 2, 1)) == [1]
+    assert ids(since=datetime.utcnow() - timedelta(hours=1)) == [2, 3, 4, 5, 6, 7]
+
+def test_export_endpoint_streams(client):
+    http = client.test_client()
+    response = http.get('/api/applications/export?format=ndjson&status=pending', headers=auth_headers('exportstaff'))
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == 'application/x-ndjson'
+    assert len(response.get_data(as_text=True).splitlines()) == 7
+
+def test_employers_only_export_their_own(client):
+    http = client.test_client()
+    response = http.get('/api/applications/export?employer_id=2', headers=auth_headers('globex'))
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert {row['employer_name'] for row in rows} == {'globex'}
+    assert http.get('/api/applications/export', headers=auth_headers('exporter1')).status_code == 403
+    assert http.get('/api/applications/export?format=xml', headers=auth_headers('exportstaff')).status_code == 400
+    assert http.get('/api/applications/export?since=yesterday', headers=auth_headers('exportstaff')).status_code == 400
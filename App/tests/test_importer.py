@@ -0,0 +1,81 @@
+import io, pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import User
+from App.controllers import (
+    create_employer,
+    import_users,
+    import_internships,
+    import_applications,
+    read_rows,
+    get_internship_counts,
+    search_internships,
+    login
+)
+
+'''
+    Bulk Import Tests
+'''
+
+@pytest.fixture(autouse=True, scope="module")
+def empty_db():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-importer.db'})
+    create_db()
+    create_employer("acme", "acmepass")
+    yield app.test_client()
+    db.drop_all()
+
+
+def test_read_rows_csv_and_jsonl():
+    csv_rows = list(read_rows(io.StringIO("username,password\nann,pw\n"), 'csv'))
+    assert csv_rows == [(2, {'username': 'ann', 'password': 'pw'})]
+    jsonl_rows = list(read_rows(io.StringIO('{"username": "ann"}\n\nnot json\n'), 'jsonl'))
+    assert jsonl_rows[0] == (1, {'username': 'ann'})
+    assert jsonl_rows[1][0] == 3 and not isinstance(jsonl_rows[1][1], dict)
+
+def test_import_users_reports_bad_rows():
+    rows = read_rows(io.StringIO(
+        "username,password,role\n"
+        "s1,pass1,student\n"
+        "s2,pass2,\n"
+        "s1,again,student\n"
+        "acme,pass,employer\n"
+        "s3,,student\n"
+        "s4,pass4,wizard\n"
+        "s5,pass5,staff\n"
+    ), 'csv')
+    report = import_users(rows, batch_size=3, workers=2)
+    assert report.created == 3
+    assert [number for number, _ in report.errors] == [4, 5, 6, 7]
+    assert db.session.scalar(db.select(User.role).filter_by(username='s2')) == 'student'
+    assert login("s5", "pass5") is not None
+
+def test_import_users_reports_non_string_fields():
+    report = import_users(read_rows(io.StringIO(
+        '{"username": 123, "password": "pw"}\n'
+        '{"username": "typed", "password": ["pw"]}\n'
+        '{"username": "typed", "password": "pw"}\n'
+    ), 'jsonl'), workers=0)
+    assert report.created == 1
+    assert report.errors == [(1, 'username must be a string'), (2, 'password must be a string')]
+
+def test_import_internships_and_applications():
+    report = import_internships(read_rows(io.StringIO(
+        '{"employer_id": 1, "title": "Rust Intern", "description": "systems"}\n'
+        '{"employer_id": 2, "title": "Not an employer"}\n'
+        '{"employer_id": 1, "title": ""}\n'
+        '{"employer_id": 1, "title": 5}\n'
+    ), 'jsonl'))
+    assert report.created == 1
+    assert [number for number, _ in report.errors] == [2, 3, 4]
+    assert [internship.title for internship, _ in search_internships("rust")] == ["Rust Intern"]
+
+    report = import_applications(read_rows(io.StringIO(
+        "student_id,internship_id\n2,1\n3,1\n2,1\n1,1\n2,99\n"
+    ), 'csv'), batch_size=2)
+    assert report.created == 2
+    assert [number for number, _ in report.errors] == [4, 5, 6]
+    assert get_internship_counts(1)['pending'] == 2
+    report = import_applications(read_rows(io.StringIO("student_id,internship_id\n2,1\n"), 'csv'))
+    assert report.created == 0 and 'already applied' in report.errors[0][1]
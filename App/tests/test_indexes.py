@@ -0,0 +1,93 @@
+import os, pytest
+from datetime import datetime
+from sqlalchemy import event
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import Application, Internship
+from App.controllers import (
+    create_student,
+    create_employer,
+    create_internship,
+    create_application,
+    get_student_applications,
+    get_applications_page,
+    get_employer_internships,
+    get_internships_page
+)
+
+'''
+    Index Usage Tests
+'''
+
+DATABASES = ['sqlite:///test-indexes.db']
+if os.environ.get('TEST_POSTGRES_URI'):
+    DATABASES.append(os.environ['TEST_POSTGRES_URI'])
+
+@pytest.fixture(autouse=True, scope="module", params=DATABASES)
+def database(request):
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': request.param})
+    create_db()
+    employer = create_employer("acme", "acmepass")
+    student = create_student("alice", "alicepass")
+    internship = create_internship("Intern", "desc", employer.id)
+    create_application(student.id, internship.id)
+    yield db.engine.dialect.name
+    db.session.remove()
+    db.drop_all()
+
+# Runs the controller, captures the first SQL statement it sends and returns
+# the database's query plan for that statement.
+def query_plan(controller, *args, **kwargs):
+    captured = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        controller(*args, **kwargs)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    statement, parameters = captured[0]
+    connection = db.session.connection()
+    if connection.dialect.name == 'postgresql':
+        # the test tables are tiny, so stop the planner from preferring a scan
+        connection.exec_driver_sql('SET enable_seqscan = off')
+        rows = connection.exec_driver_sql('EXPLAIN ' + statement, parameters).all()
+    else:
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+    return '\n'.join(str(row[-1]) for row in rows)
+
+def test_student_applications_use_student_index():
+    plan = query_plan(get_student_applications, 2)
+    assert 'uq_application_student_internship' in plan or 'ix_application_student_status' in plan
+
+def test_internship_status_listing_uses_index():
+    plan = query_plan(get_applications_page, internship_id=1, status='pending')
+    assert 'ix_application_internship_status' in plan
+
+def test_employer_internships_use_index():
+    plan = query_plan(get_employer_internships, 1)
+    assert 'ix_internship_employer_active_created' in plan
+
+def test_active_employer_page_uses_index():
+    plan = query_plan(get_internships_page, employer_id=1, is_active=True)
+    assert 'ix_internship_employer_active_created' in plan
+
+def test_employer_application_page_uses_indexes():
+    plan = query_plan(get_applications_page, employer_id=1)
+    assert 'ix_internship_employer_active_created' in plan
+    assert 'ix_application_internship_status' in plan
+
+# the admin list views: one filter, newest first
+def admin_page(model, *criteria):
+    return lambda: db.session.scalars(db.select(model).where(*criteria).order_by(model.id.desc()).limit(20)).all()
+
+def test_admin_filters_use_indexes():
+    assert 'ix_application_status_id' in query_plan(admin_page(Application, Application.status == 'pending'))
+    assert 'ix_internship_active_created' in query_plan(admin_page(Internship, Internship.is_active == True))
+    plan = query_plan(admin_page(Internship, Internship.created_at.between(datetime(2026, 1, 1), datetime(2026, 2, 1))))
+    assert 'ix_internship_created_at' in plan
+
+def test_duplicate_application_rejected():
+    assert create_application(2, 1) is None
+    assert len(get_student_applications(2)) == 1
@@ -0,0 +1,82 @@
+import logging
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.controllers import create_student
+from App import metrics
+from App.metrics import Registry, collect, render_metrics
+
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-metrics.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000', 'RESPONSE_CACHE_TYPE': 'none'})
+    create_db()
+    create_student('metricsbob', 'pass')
+    yield app
+    db.drop_all()
+
+def sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+def test_requests_and_queries_are_recorded(client):
+    http = client.test_client()
+    before = render_metrics()
+    http.get('/api/users')
+    http.get('/api/users')
+    text = http.get('/metrics').get_data(as_text=True)
+    requests = 'http_requests_total{endpoint="/api/users",method="GET",status="200"}'
+    assert sample(text, requests) - sample(before, requests) == 2
+    assert sample(text, 'http_request_duration_seconds_count{endpoint="/api/users"}') >= 2
+    assert sample(text, 'db_queries_per_request_sum{endpoint="/api/users"}') >= 2
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert 'http_request_duration_seconds_bucket{endpoint="/api/users",le="+Inf"}' in text
+
+def test_unmatched_routes_share_one_label(client):
+    http = client.test_client()
+    http.get('/no/such/page/1')
+    http.get('/no/such/page/2')
+    assert sample(render_metrics(), 'http_requests_total{endpoint="unmatched",method="GET",status="404"}') >= 2
+
+def test_slow_queries_are_logged(client, caplog):
+    client.config['SLOW_QUERY_MS'] = 0
+    try:
+        with caplog.at_level(logging.WARNING, logger='App.slow_queries'):
+            client.test_client().get('/api/users')
+    finally:
+        client.config['SLOW_QUERY_MS'] = 200
+    assert any('slow query' in record.getMessage() and '/api/users' in record.getMessage() for record in caplog.records)
+
+def test_worker_files_are_summed(tmp_path, monkeypatch):
+    worker = Registry()
+    worker.inc('http_requests_total', [('endpoint', '/x'), ('method', 'GET'), ('status', '200')], 3)
+    worker.observe('http_request_duration_seconds', 0.02, [('endpoint', '/x')])
+    worker.flush(str(tmp_path))
+    monkeypatch.setattr(metrics, 'registry', Registry())
+    metrics.inc('http_requests_total', [('endpoint', '/x'), ('method', 'GET'), ('status', '200')], 2)
+    metrics.observe('http_request_duration_seconds', 0.2, [('endpoint', '/x')])
+    counters, histograms = collect(str(tmp_path))
+    assert counters[('http_requests_total', (('endpoint', '/x'), ('method', 'GET'), ('status', '200')))] == 5
+    text = render_metrics(str(tmp_path))
+    assert sample(text, 'http_request_duration_seconds_bucket{endpoint="/x",le="0.025"}') == 1
+    assert sample(text, 'http_request_duration_seconds_count{endpoint="/x"}') == 2
+
+
+def test_exited_workers_are_folded_into_one_file(tmp_path, monkeypatch):
+    labels = [('endpoint', '/x'), ('method', 'GET'), ('status', '200')]
+    for pid in (999999991, 999999992):
+        worker = Registry()
+        worker.token = f'{pid}-abcdef12'
+        worker.inc('http_requests_total', labels, 4)
+        worker.flush(str(tmp_path))
+    monkeypatch.setattr(metrics, 'registry', Registry())
+    metrics.inc('http_requests_total', labels, 1)
+    key = ('http_requests_total', tuple(labels))
+    assert collect(str(tmp_path))[0][key] == 9
+    names = sorted(entry.name for entry in tmp_path.iterdir() if entry.name.endswith('.json'))
+    assert names == [f'metrics-{metrics.registry.token}.json', metrics.EXITED_FILE]
+    assert collect(str(tmp_path))[0][key] == 9
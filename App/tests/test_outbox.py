@@ -0,0 +1,125 @@
+import pytest
+from datetime import datetime, timedelta
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import OutboxEvent
+from App.controllers import (
+    create_student,
+    create_staff,
+    create_employer,
+    create_internship,
+    create_application,
+    shortlist_application,
+    accept_application,
+    reject_application,
+    bulk_transition,
+    claim_events,
+    run_outbox_batch,
+    outbox_counts,
+    get_internship_counts,
+    retry_failed_events,
+    get_notification_sinks,
+    HANDLERS,
+    STATUS_CHANGED
+)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-outbox.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000', 'OUTBOX_MAX_ATTEMPTS': 2})
+    create_db()
+    staff = create_staff('outboxstaff', 'pass')
+    employer = create_employer('outboxemployer', 'pass')
+    internship = create_internship('Data Intern', 'Numbers', employer.id)
+    for number in range(4):
+        student = create_student(f'outboxstudent{number}', 'pass')
+        create_application(student.id, internship.id)
+    yield app
+    db.drop_all()
+
+@pytest.fixture(autouse=True)
+def drain():
+    run_outbox_batch(batch_size=1000)
+    get_notification_sinks()[0].sent.clear()
+
+def pending_events():
+    return db.session.scalars(db.select(OutboxEvent).where(OutboxEvent.delivered_at.is_(None),
+                                                           OutboxEvent.failed_at.is_(None))).all()
+
+def test_status_change_queues_event_in_same_commit():
+    shortlist_application(1, 1)
+    events = pending_events()
+    assert [event.payload for event in events] == [{
+        'application_id': 1, 'student_id': 3, 'internship_id': 1, 'from_status': 'pending', 'status': 'shortlisted'
+    }]
+    assert run_outbox_batch() == (1, 0)
+    sent = get_notification_sinks()[0].sent
+    assert [(message['username'], message['subject']) for message in sent] == [
+        ('outboxstudent0', 'Application shortlisted: Data Intern')
+    ]
+    assert pending_events() == []
+
+def test_rejected_request_queues_nothing():
+    assert shortlist_application(2, 2) is None  # employer cannot shortlist
+    assert pending_events() == []
+
+def test_bulk_transition_queues_one_event_per_application():
+    assert bulk_transition([2, 3], 2, 'accepted') == {2: 'updated', 3: 'updated'}
+    assert sorted(event.payload['application_id'] for event in pending_events()) == [2, 3]
+    assert run_outbox_batch() == (2, 0)
+    assert len(get_notification_sinks()[0].sent) == 2
+
+def test_invalid_single_transitions_queue_nothing():
+    counts = get_internship_counts(1)
+    # application 2 is accepted
+    assert accept_application(2, 2) is None
+    assert shortlist_application(2, 1) is None
+    assert reject_application(2, 2) is None
+    assert pending_events() == []
+    assert get_internship_counts(1) == counts
+
+def test_failed_delivery_is_retried_with_backoff(monkeypatch):
+    calls = []
+    def flaky(payload):
+        calls.append(payload)
+        if len(calls) == 1:
+            raise ConnectionError('smtp down')
+    monkeypatch.setitem(HANDLERS, STATUS_CHANGED, flaky)
+    accept_application(4, 2)
+    assert run_outbox_batch() == (0, 1)
+    event = db.session.scalars(db.select(OutboxEvent).order_by(OutboxEvent.id.desc())).first()
+    assert event.attempts == 1 and 'smtp down' in event.last_error
+    assert event.available_at > datetime.utcnow()
+    # not due yet
+    assert run_outbox_batch() == (0, 0)
+    event.available_at = datetime.utcnow()
+    db.session.commit()
+    assert run_outbox_batch() == (1, 0)
+    assert len(calls) == 2
+
+def test_events_fail_for_good_after_max_attempts(monkeypatch):
+    def broken(payload):
+        raise RuntimeError('boom')
+    monkeypatch.setitem(HANDLERS, STATUS_CHANGED, broken)
+    bulk_transition([1], 2, 'rejected')
+    for _ in range(2):
+        run_outbox_batch()
+        db.session.execute(db.update(OutboxEvent).values(available_at=datetime.utcnow()))
+        db.session.commit()
+    assert outbox_counts()['failed'] == 1
+    monkeypatch.undo()
+    assert retry_failed_events() == 1
+    assert run_outbox_batch() == (1, 0)
+
+def test_expired_claims_are_taken_over():
+    student = create_student('outboxlate', 'pass')
+    application = create_application(student.id, 1)
+    shortlist_application(application.id, 1)
+    assert [event.id for event in claim_events('crashed-worker', 10)] != []
+    # the claim blocks other workers until it expires
+    assert claim_events('other-worker', 10) == []
+    db.session.execute(db.update(OutboxEvent).values(claimed_until=datetime.utcnow() - timedelta(seconds=1)))
+    db.session.commit()
+    assert run_outbox_batch(worker='other-worker') == (1, 0)
@@ -0,0 +1,59 @@
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.controllers import (
+    create_student,
+    create_employer,
+    create_internship,
+    create_application,
+    set_internship_active,
+    recommend_internships,
+    recommend_for_all_students,
+    login
+)
+
+'''
+    Recommendation Tests
+'''
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-recommendation.db'})
+    create_db()
+    employer = create_employer("acme", "acmepass")
+    alice = create_student("alice", "alicepass")
+    create_student("bob", "bobpass")
+    create_internship("Python Backend Intern", "Flask APIs and SQL databases", employer.id)       # 1
+    create_internship("Python Data Intern", "pandas notebooks and SQL reporting", employer.id)   # 2
+    create_internship("Graphic Design Intern", "Illustrator posters and branding", employer.id)  # 3
+    create_internship("Django Web Intern", "Python web APIs with Django", employer.id)           # 4
+    create_application(alice.id, 1)
+    yield app.test_client()
+    db.drop_all()
+
+
+def test_recommends_similar_unapplied_internships():
+    ranked = [internship.id for internship, _ in recommend_internships(2, k=5)]
+    # the design internship only shares the word "intern" so it ranks last
+    assert ranked == [2, 4, 3]
+
+def test_closed_internships_not_recommended():
+    set_internship_active(4, 1, False)
+    assert [internship.id for internship, _ in recommend_internships(2)] == [2, 3]
+    set_internship_active(4, 1, True)
+
+def test_student_without_applications_gets_nothing():
+    assert recommend_internships(3) == []
+
+def test_batch_scoring_matches_single_student():
+    digest = recommend_for_all_students(k=5)
+    assert list(digest) == [2]
+    assert [internship_id for internship_id, _ in digest[2]] == \
+        [internship.id for internship, _ in recommend_internships(2, k=5)]
+
+def test_recommendation_endpoint(client):
+    token = login("alice", "alicepass")
+    response = client.get('/api/internships/recommended', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert [internship['id'] for internship in response.json] == [2, 4, 3]
@@ -0,0 +1,130 @@
+import gzip, io, shutil, tempfile, zipfile, zlib
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import OutboxEvent, Upload
+from App import documents
+from App.documents import extract_text
+from App.controllers import (
+    create_student,
+    create_employer,
+    create_staff,
+    create_internship,
+    create_application,
+    run_outbox_batch,
+    extract_all_uploads,
+    login
+)
+
+UPLOAD_DIR = tempfile.mkdtemp()
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-resume-search.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000', 'UPLOADED_RESUMES_DEST': UPLOAD_DIR})
+    create_db()
+    employer = create_employer('rankemployer', 'pass')
+    create_employer('rankother', 'pass')
+    create_staff('rankstaff', 'pass')
+    internship = create_internship('Data Intern', 'Numbers', employer.id)
+    for name in ('ann', 'ben', 'cal', 'dee'):
+        create_application(create_student(name, 'pass').id, internship.id)
+    yield app
+    db.drop_all()
+    shutil.rmtree(UPLOAD_DIR, ignore_errors=True)
+
+def auth_headers(username):
+    return {'Authorization': f"Bearer {login(username, 'pass')}"}
+
+def docx(text):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', f'<w:document><w:body><w:p><w:t>{text}</w:t></w:p></w:body></w:document>')
+        archive.writestr('word/styles.xml', '<w:styles>ignored</w:styles>')
+    return buffer.getvalue()
+
+def rank(http, skills, username='rankemployer'):
+    return http.get(f'/api/internships/1/applications?skills={skills}', headers=auth_headers(username))
+
+def test_extract_text_formats():
+    path = tempfile.mktemp(dir=UPLOAD_DIR)
+    samples = {
+        'cv.docx': (docx('Python &amp; SQL'), 'Python & SQL'),
+        'cv.rtf': (rb'{\rtf1\ansi{\fonttbl{\f0 Arial;}}\f0 Kotlin developer\par}', 'Kotlin developer'),
+        'cv.pdf': (b'%PDF-1.4\n1 0 obj\n<< /Filter /FlateDecode >>\nstream\n'
+                   + zlib.compress(b'BT (Rust \\(systems\\)) Tj ET') + b'\nendstream', 'Rust (systems)'),
+    }
+    for filename, (data, expected) in samples.items():
+        with open(path, 'wb') as file:
+            file.write(data)
+        assert expected in extract_text(path, filename)
+        assert 'ignored' not in extract_text(path, filename)
+
+def test_extract_text_skips_parts_that_inflate_too_far(monkeypatch):
+    monkeypatch.setattr(documents, 'MAX_INFLATED_BYTES', 1000)
+    path = tempfile.mktemp(dir=UPLOAD_DIR)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('word/header1.xml', '<w:t>Haskell</w:t>')
+        archive.writestr('word/document.xml', '<w:t>bomb</w:t>' + ' ' * 100000)
+    samples = {
+        'cv.docx': (buffer.getvalue(), 'Haskell'),
+        'cv.gnumeric': (gzip.compress(b'<x>bomb</x>' + b' ' * 100000), ''),
+        'cv.pdf': (b'%PDF-1.4\n<< /Filter /FlateDecode >>\nstream\n' + zlib.compress(b'BT (bomb) Tj ET' + b' ' * 100000)
+                   + b'\nendstream\n<< /Filter /FlateDecode >>\nstream\n' + zlib.compress(b'BT (Scala) Tj ET')
+                   + b'\nendstream', 'Scala'),
+    }
+    for filename, (data, expected) in samples.items():
+        with open(path, 'wb') as file:
+            file.write(data)
+        text = extract_text(path, filename)
+        assert expected in text and 'bomb' not in text
+
+def test_uploads_are_extracted_in_the_background(client):
+    http = client.test_client()
+    resumes = {'ann': (b'python python sql pandas', 'cv.txt'), 'ben': (docx('java sql spring'), 'cv.docx'),
+               'cal': (b'painting and sculpture', 'cv.txt')}
+    for application_id, (name, (body, filename)) in enumerate(resumes.items(), start=1):
+        response = http.put(f'/api/applications/{application_id}/resume?filename={filename}',
+                            data=body, headers=auth_headers(name))
+        assert response.status_code == 201
+    # nothing is indexed until the worker has run
+    assert rank(http, 'python').json == []
+    assert run_outbox_batch() == (3, 0)
+    assert db.session.scalar(db.select(db.func.count(Upload.id)).where(Upload.extracted_at.is_(None))) == 0
+    results = rank(http, 'python,sql').json
+    assert [row['student_name'] for row in results] == ['ann', 'ben']
+    assert results[0]['score'] > results[1]['score']
+    assert [row['student_name'] for row in rank(http, 'Spring', 'rankstaff').json] == ['ben']
+
+def test_same_content_is_not_extracted_again(client):
+    http = client.test_client()
+    events = db.session.scalar(db.select(db.func.count(OutboxEvent.id)))
+    # dee's profile resume has the same content as ann's and counts for her application
+    response = http.put('/api/resume?filename=mine.txt', data=b'python python sql pandas', headers=auth_headers('dee'))
+    assert response.status_code == 201
+    assert db.session.scalar(db.select(db.func.count(OutboxEvent.id))) == events
+    assert {row['student_name'] for row in rank(http, 'pandas').json} == {'ann', 'dee'}
+    assert extract_all_uploads() == 0
+
+def test_missing_files_are_retried(client):
+    http = client.test_client()
+    response = http.put('/api/applications/3/resume?filename=cv.txt', data=b'go kubernetes', headers=auth_headers('cal'))
+    shutil.rmtree(UPLOAD_DIR + '/' + response.json['sha256'][:2])
+    assert run_outbox_batch() == (0, 1)
+    assert rank(http, 'kubernetes').json == []
+    # the linked uploads are ann's, ben's and cal's missing one
+    client.config['RESUME_EXTRACT_WORKERS'] = 2
+    try:
+        assert extract_all_uploads(force=True) == 2
+    finally:
+        client.config['RESUME_EXTRACT_WORKERS'] = 0
+    assert [row['student_name'] for row in rank(http, 'spring').json] == ['ben']
+
+def test_rank_permissions_and_validation(client):
+    http = client.test_client()
+    assert rank(http, 'python', 'rankother').status_code == 403
+    assert rank(http, 'python', 'ann').status_code == 403
+    assert http.get('/api/internships/1/applications', headers=auth_headers('rankstaff')).status_code == 400
+    assert http.get('/api/internships/99/applications?skills=sql', headers=auth_headers('rankstaff')).status_code == 404
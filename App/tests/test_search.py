@@ -0,0 +1,99 @@
+import os
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.controllers import (
+    create_employer,
+    create_internship,
+    set_internship_active,
+    search_internships,
+    tokenize,
+    SearchIndex,
+    IndexStore,
+    load_internship_tokens,
+    active_internship_ids
+)
+
+'''
+    Unit Tests
+'''
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("The Python/SQL intern, for Data!") == ["python", "sql", "intern", "data"]
+
+def test_bm25_prefers_rarer_and_denser_matches():
+    index = SearchIndex()
+    index.add(1, tokenize("python python developer"))
+    index.add(2, tokenize("python tester"))
+    index.add(3, tokenize("java developer"))
+    assert [doc_id for doc_id, _ in index.search(tokenize("python"))] == [1, 2]
+    assert index.search(tokenize("java python"))[0][0] in (1, 3)
+    index.remove(1)
+    assert [doc_id for doc_id, _ in index.search(tokenize("python"))] == [2]
+    assert [doc_id for doc_id, _ in index.search(tokenize("developer"), candidates={2, 3})] == [3]
+
+'''
+    Integration Tests
+'''
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-search.db'})
+    create_db()
+    employer = create_employer("acme", "acmepass")
+    create_internship("Backend Developer", "Build Flask APIs in Python", employer.id)
+    create_internship("Data Analyst", "SQL dashboards and reporting", employer.id)
+    yield app.test_client()
+    db.drop_all()
+
+
+def test_search_ranks_title_matches(client):
+    create_internship("Python Developer", "Write scripts", 1)
+    titles = [internship.title for internship, _ in search_internships("python developer")]
+    assert titles == ["Python Developer", "Backend Developer"]
+
+def test_deactivated_internship_leaves_index(client):
+    set_internship_active(2, 1, False)
+    assert search_internships("sql") == []
+    set_internship_active(2, 1, True)
+    assert [internship.id for internship, _ in search_internships("sql")] == [2]
+
+def test_search_endpoint(client):
+    response = client.get('/api/internships/search?q=flask')
+    assert [internship['title'] for internship in response.json] == ["Backend Developer"]
+    assert response.json[0]['score'] > 0
+
+def test_index_store_warm_start_and_journal(tmp_path):
+    path = str(tmp_path / 'index')
+    writer = IndexStore(path, load_internship_tokens, active_internship_ids)
+    assert len(writer.get()) == 3
+    reader = IndexStore(path, load_internship_tokens, active_internship_ids)
+    reader.load()
+    assert len(reader.index) == 3
+    internship = create_internship("Rust Engineer", "Systems work", 1)
+    writer.mark([internship.id])
+    assert [doc_id for doc_id, _ in reader.get().search(["rust"])] == [internship.id]
+
+def test_saving_a_snapshot_rotates_the_journal(tmp_path):
+    path = str(tmp_path / 'index')
+    writer = IndexStore(path, load_internship_tokens, active_internship_ids)
+    reader = IndexStore(path, load_internship_tokens, active_internship_ids)
+    writer.get(), reader.get()
+    first = create_internship("Go Engineer", "Services", 1)
+    writer.mark([first.id] * 1000)
+    reader.get()
+    reader.save()
+    assert os.path.getsize(writer.journal_path) < 100
+    second = create_internship("Elixir Engineer", "Services", 1)
+    writer.mark([second.id])
+    # the writer never read the old generation; it reloads the snapshot instead
+    assert [doc_id for doc_id, _ in writer.get().search(["go"])] == [first.id]
+    assert [doc_id for doc_id, _ in reader.get().search(["elixir"])] == [second.id]
+
+def test_non_positive_limits(client):
+    assert len(client.get('/api/internships/search?q=flask&limit=0').json) == 1
+    assert client.get('/api/internships/search?q=flask&limit=-3').status_code == 200
+    index = SearchIndex()
+    index.add(1, ["flask"])
+    assert index.search(["flask"], limit=0) == []
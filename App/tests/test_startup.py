@@ -0,0 +1,32 @@
+import subprocess, sys
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.controllers import create_staff, login
+from App.benchmarks.startup import ROOT
+
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-startup.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000'})
+    create_db()
+    create_staff('adminstaff', 'pass')
+    yield app
+    db.drop_all()
+
+def test_worker_boot_skips_optional_subsystems():
+    script = ('import sys, wsgi; wsgi.app.test_client().get("/health"); '
+              'print(sorted(m for m in ("flask_admin", "flask_uploads", "flask_migrate", "alembic", "pytest") if m in sys.modules))')
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == '[]'
+
+def test_admin_is_built_on_first_admin_request(client):
+    http = client.test_client()
+    assert http.get('/admin/').status_code == 401
+    headers = {'Authorization': f"Bearer {login('adminstaff', 'pass')}"}
+    response = http.get('/admin/user/', headers=headers)
+    assert response.status_code == 200
+    assert b'adminstaff' in response.data
+    assert http.get('/health').status_code == 200
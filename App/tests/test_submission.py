@@ -0,0 +1,91 @@
+import threading
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import Application, Internship
+from App.controllers import (
+    create_student,
+    create_employer,
+    create_internship,
+    submit_application,
+    get_internship_counts,
+    login
+)
+
+STUDENTS = 10
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-submission.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000'})
+    create_db()
+    employer = create_employer('submitemployer', 'pass')
+    for n in range(STUDENTS):
+        create_student(f'submitter{n}', 'pass')
+    create_internship('Open Intern', 'desc', employer.id)      # 1
+    closed = create_internship('Closed Intern', 'desc', employer.id)  # 2
+    closed.is_active = False
+    db.session.commit()
+    yield app
+    db.drop_all()
+
+def test_results(client):
+    assert submit_application(2, 1) == ('created', 1)
+    assert submit_application(2, 1) == ('duplicate', 1)
+    assert submit_application(1, 1) == ('ineligible', None)   # an employer
+    assert submit_application(2, 2) == ('ineligible', None)   # closed
+    assert submit_application(2, 99) == ('ineligible', None)
+    assert get_internship_counts(1)['pending'] == 1
+
+def test_submitting_keeps_the_callers_pending_changes(client):
+    internship = db.session.get(Internship, 1)
+    internship.title = 'Renamed Intern'
+    assert submit_application(2, 1)[0] == 'duplicate'
+    db.session.rollback()
+    assert db.session.get(Internship, 1).title == 'Renamed Intern'
+
+def test_concurrent_submissions_create_one_row_each(client):
+    # every student double-submits from several threads at once
+    pairs = [(student_id, 1) for student_id in range(2, STUDENTS + 2)] * 4
+    barrier = threading.Barrier(len(pairs))
+    results, errors = [], []
+
+    def submit(student_id, internship_id):
+        with client.app_context():
+            try:
+                barrier.wait()
+                results.append((student_id, submit_application(student_id, internship_id)[0]))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=submit, args=pair) for pair in pairs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    created = [student_id for student_id, result in results if result == 'created']
+    # student 2 applied in test_results already
+    assert sorted(created) == list(range(3, STUDENTS + 2))
+    assert {result for _, result in results} == {'created', 'duplicate'}
+    rows = db.session.scalar(db.select(db.func.count(Application.id)).filter_by(internship_id=1))
+    assert rows == STUDENTS
+    assert get_internship_counts(1)['pending'] == STUDENTS
+
+def test_api(client):
+    http = client.test_client()
+    headers = {'Authorization': f"Bearer {login('submitter9', 'pass')}"}
+    response = http.post('/api/applications', json={'internship_id': 1}, headers=headers)
+    assert response.status_code == 200 and response.json['result'] == 'duplicate'
+    response = http.post('/api/applications', json={'internship_id': 2}, headers=headers)
+    assert response.status_code == 422
+    assert http.post('/api/applications', json={}, headers=headers).status_code == 400
+    employer = {'Authorization': f"Bearer {login('submitemployer', 'pass')}"}
+    assert http.post('/api/applications', json={'internship_id': 1}, headers=employer).status_code == 403
+    db.session.get(Internship, 2).is_active = True
+    db.session.commit()
+    response = http.post('/api/applications', json={'internship_id': 2}, headers=headers)
+    assert response.status_code == 201 and response.json['result'] == 'created'
@@ -0,0 +1,103 @@
+import os, tempfile, threading
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import User
+from App.controllers import create_student
+from App.metrics import render_metrics
+from App.throttle import MemoryBuckets, SQLiteBuckets
+
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-throttle.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000', 'LOGIN_IP_BURST': 8,
+                      'LOGIN_USERNAME_BURST': 3, 'TRUSTED_PROXY_HOPS': 1})
+    create_db()
+    create_student('throttlebob', 'pass')
+    yield app
+    db.drop_all()
+
+@pytest.fixture
+def checked_passwords(monkeypatch):
+    calls = []
+    check_password = User.check_password
+    monkeypatch.setattr(User, 'check_password', lambda user, password: calls.append(user.id) or check_password(user, password))
+    return calls
+
+def sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+def login_from(http, ip, username, password='wrong'):
+    return http.post('/api/login', json={'username': username, 'password': password},
+                     environ_base={'REMOTE_ADDR': ip})
+
+def test_username_bucket_rejects_before_hashing(client, checked_passwords):
+    http = client.test_client()
+    before = render_metrics()
+    statuses = [login_from(http, f'10.0.0.{n}', 'throttlebob').status_code for n in range(4)]
+    assert statuses == [401, 401, 401, 429]
+    assert len(checked_passwords) == 3
+    response = login_from(http, '10.0.0.9', 'ThrottleBob ', 'pass')
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert len(checked_passwords) == 3
+    text = render_metrics()
+    throttled = 'login_attempts_total{outcome="throttled_username"}'
+    assert sample(text, throttled) - sample(before, throttled) == 2
+    assert sample(text, 'login_attempts_total{outcome="allowed"}') - sample(before, 'login_attempts_total{outcome="allowed"}') == 3
+
+def test_ip_bucket_spans_usernames(client, checked_passwords):
+    http = client.test_client()
+    statuses = [login_from(http, '10.1.0.1', f'nobody{n}').status_code for n in range(9)]
+    assert statuses == [401] * 8 + [429]
+    assert login_from(http, '10.1.0.2', 'nobody0').status_code == 401
+    # the form login is throttled too
+    response = http.post('/login', data={'username': 'nobody99', 'password': 'x'},
+                         environ_base={'REMOTE_ADDR': '10.1.0.1'})
+    assert response.status_code == 429
+
+def test_clients_behind_the_proxy_get_their_own_ip_bucket(client):
+    http = client.test_client()
+    def login_via_proxy(client_ip, n):
+        return http.post('/api/login', json={'username': f'proxied{n}', 'password': 'x'},
+                         environ_base={'REMOTE_ADDR': '10.2.0.1'}, headers={'X-Forwarded-For': client_ip}).status_code
+    assert [login_via_proxy('203.0.113.1', n) for n in range(9)] == [401] * 8 + [429]
+    assert login_via_proxy('203.0.113.2', 0) == 401
+
+def test_non_string_username_is_rejected(client):
+    response = client.test_client().post('/api/login', json={'username': 5, 'password': 'x'})
+    assert response.status_code == 401
+
+def test_buckets_refill_and_blocked_attempts_are_free():
+    buckets = MemoryBuckets()
+    limits = [('ip:a', 2, 1.0), ('username:b', 5, 1.0)]
+    assert buckets.take(limits, now=100) == (0, None)
+    assert buckets.take(limits, now=100) == (0, None)
+    assert buckets.take(limits, now=100) == (1.0, 'ip:a')
+    assert buckets.take(limits, now=100.5) == (0.5, 'ip:a')
+    assert buckets.take(limits, now=101) == (0, None)
+    # the rejected attempts did not take from the username bucket
+    assert buckets.buckets['username:b'][0] == 5 - 3 + 1
+
+def test_sqlite_buckets_are_shared_between_workers():
+    path = os.path.join(tempfile.mkdtemp(), 'throttle.db')
+    workers = [SQLiteBuckets(path), SQLiteBuckets(path)]
+    limits = [('ip:shared', 40, 1e-6)]
+    allowed = []
+
+    def attempt(buckets):
+        for _ in range(30):
+            if buckets.take(limits)[0] == 0:
+                allowed.append(1)
+
+    threads = [threading.Thread(target=attempt, args=(workers[n % 2],)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(allowed) == 40
@@ -0,0 +1,94 @@
+import hashlib, io, os, shutil, tempfile
+import pytest
+
+from App.main import create_app
+from App.database import db, create_db
+from App.models import Upload
+from App.uploads import content_path
+from App.controllers import (
+    create_student,
+    create_employer,
+    create_staff,
+    create_internship,
+    create_application,
+    upload_resume,
+    collect_unused_uploads,
+    UploadTooLarge,
+    login
+)
+
+UPLOAD_DIR = tempfile.mkdtemp()
+
+@pytest.fixture(autouse=True, scope="module")
+def client():
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///test-uploads.db',
+                      'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000', 'UPLOADED_RESUMES_DEST': UPLOAD_DIR,
+                      'RESUME_MAX_BYTES': 1000, 'UPLOAD_GC_GRACE_SECONDS': 0})
+    create_db()
+    employer = create_employer('uploademployer', 'pass')
+    create_employer('otheremployer', 'pass')
+    create_staff('uploadstaff', 'pass')
+    internship = create_internship('Data Intern', 'Numbers', employer.id)
+    for name in ('uploadbob', 'uploadsue'):
+        student = create_student(name, 'pass')
+        create_application(student.id, internship.id)
+    yield app
+    db.drop_all()
+    shutil.rmtree(UPLOAD_DIR, ignore_errors=True)
+
+def auth_headers(username):
+    return {'Authorization': f"Bearer {login(username, 'pass')}"}
+
+def put_resume(http, url, username, body, filename='cv.txt'):
+    return http.put(f'{url}?filename={filename}', data=body, headers=auth_headers(username))
+
+def test_upload_is_stored_once_by_content(client):
+    http = client.test_client()
+    body = b'python sql excel\n' * 10
+    first = put_resume(http, '/api/applications/1/resume', 'uploadbob', body)
+    second = put_resume(http, '/api/applications/2/resume', 'uploadsue', body, 'resume.txt')
+    assert first.status_code == second.status_code == 201
+    sha256 = hashlib.sha256(body).hexdigest()
+    assert first.json['sha256'] == second.json['sha256'] == sha256
+    with open(content_path(UPLOAD_DIR, sha256), 'rb') as stored:
+        assert stored.read() == body
+    upload = db.session.scalars(db.select(Upload).filter_by(sha256=sha256)).one()
+    assert upload.refcount == 2
+    assert os.listdir(os.path.join(UPLOAD_DIR, 'tmp')) == []
+
+def test_size_and_type_limits(client):
+    http = client.test_client()
+    assert put_resume(http, '/api/applications/1/resume', 'uploadbob', b'x' * 1001).status_code == 413
+    assert put_resume(http, '/api/applications/1/resume', 'uploadbob', b'x', 'cv.exe').status_code == 415
+    assert put_resume(http, '/api/applications/2/resume', 'uploadbob', b'x').status_code == 404
+    # a body without a declared length is cut off as soon as it passes the limit
+    with pytest.raises(UploadTooLarge):
+        upload_resume(io.BytesIO(b'x' * 5000), 'cv.txt', [])
+    assert os.listdir(os.path.join(UPLOAD_DIR, 'tmp')) == []
+
+def test_download_with_ranges_and_permissions(client):
+    http = client.test_client()
+    response = http.get('/api/applications/1/resume', headers=auth_headers('uploademployer'))
+    assert response.status_code == 200
+    assert response.data.startswith(b'python sql excel')
+    partial = http.get('/api/applications/1/resume', headers=dict(auth_headers('uploadstaff'), Range='bytes=0-5'))
+    assert partial.status_code == 206 and partial.data == b'python'
+    not_modified = http.get('/api/applications/1/resume',
+                            headers=dict(auth_headers('uploadbob'), **{'If-None-Match': response.headers['ETag']}))
+    assert not_modified.status_code == 304
+    assert http.get('/api/applications/1/resume', headers=auth_headers('otheremployer')).status_code == 404
+    assert http.get('/api/applications/1/resume', headers=auth_headers('uploadsue')).status_code == 404
+
+def test_replaced_files_are_collected(client):
+    http = client.test_client()
+    old_sha = hashlib.sha256(b'python sql excel\n' * 10).hexdigest()
+    put_resume(http, '/api/applications/1/resume', 'uploadbob', b'new cv')
+    put_resume(http, '/api/applications/2/resume', 'uploadsue', b'new cv')
+    assert put_resume(http, '/api/resume', 'uploadsue', b'new cv').status_code == 201
+    assert db.session.scalars(db.select(Upload.refcount).filter_by(sha256=old_sha)).one() == 0
+    assert collect_unused_uploads() == 1
+    assert not os.path.exists(content_path(UPLOAD_DIR, old_sha))
+    new_sha = hashlib.sha256(b'new cv').hexdigest()
+    assert db.session.scalars(db.select(Upload.refcount).filter_by(sha256=new_sha)).one() == 3
+    assert http.get('/api/resume', headers=auth_headers('uploadsue')).data == b'new cv'
+    assert put_resume(http, '/api/resume', 'uploademployer', b'x').status_code == 403
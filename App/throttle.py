@@ -0,0 +1,104 @@
+import os, sqlite3, threading, time
+
+# Token buckets for rate limiting. A bucket holds up to `capacity` tokens and
+# refills at `rate` tokens per second; every allowed attempt takes one.
+#
+# take() checks several buckets at once (e.g. per IP and per username) and
+# only takes a token from each when all of them have one, so a request that
+# is turned away does not drain the other buckets. It returns (0, None) when
+# the attempt is allowed, else the seconds until it would be and the key of
+# the bucket that is empty longest.
+#
+# MemoryBuckets is per process. SQLiteBuckets keeps the buckets in a small
+# SQLite file shared by every gunicorn worker on the host; each take() is one
+# short write transaction, serialized by SQLite's lock.
+
+# rows idle this long are deleted; a bucket that refills within this time is
+# full again by then, which is what a missing row means
+PRUNE_AFTER = 3600
+PRUNE_EVERY = 256
+
+
+def refill(tokens, updated, capacity, rate, now):
+    if tokens is None:
+        return float(capacity)
+    return min(float(capacity), tokens + max(0.0, now - updated) * rate)
+
+# `limits` is [(key, capacity, rate), ...]; `state` maps key -> (tokens, updated).
+# Returns (retry_after, blocking key, {key: tokens left}).
+def take_tokens(limits, state, now):
+    levels = {key: refill(*state.get(key, (None, None)), capacity, rate, now) for key, capacity, rate in limits}
+    waits = [((1 - levels[key]) / rate, key) for key, _, rate in limits if levels[key] < 1]
+    if waits:
+        return (*max(waits), None)
+    return 0.0, None, {key: tokens - 1 for key, tokens in levels.items()}
+
+
+class MemoryBuckets:
+
+    def __init__(self):
+        self.buckets = {}  # key -> (tokens, updated)
+        self._lock = threading.Lock()
+
+    def take(self, limits, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            retry_after, blocked, levels = take_tokens(limits, self.buckets, now)
+            if levels:
+                self.buckets.update((key, (tokens, now)) for key, tokens in levels.items())
+        return retry_after, blocked
+
+    def clear(self):
+        with self._lock:
+            self.buckets.clear()
+
+
+class SQLiteBuckets:
+
+    def __init__(self, path):
+        self.path = path
+        self.takes = 0
+        self._local = threading.local()
+
+    # one connection per thread and per process; connections are not shared
+    # across a fork
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS bucket '
+                               '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL) WITHOUT ROWID')
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def take(self, limits, now=None):
+        now = time.time() if now is None else now
+        connection = self._connection()
+        keys = [key for key, _, _ in limits]
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            state = {key: (tokens, updated) for key, tokens, updated in connection.execute(
+                f"SELECT key, tokens, updated FROM bucket WHERE key IN ({', '.join('?' * len(keys))})", keys
+            )}
+            retry_after, blocked, levels = take_tokens(limits, state, now)
+            if levels:
+                connection.executemany('INSERT OR REPLACE INTO bucket (key, tokens, updated) VALUES (?, ?, ?)',
+                                       [(key, tokens, now) for key, tokens in levels.items()])
+            self.takes += 1
+            if self.takes % PRUNE_EVERY == 0:
+                connection.execute('DELETE FROM bucket WHERE updated < ?', (now - PRUNE_AFTER,))
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return retry_after, blocked
+
+    def clear(self):
+        self._connection().execute('DELETE FROM bucket')
+
+
+def create_buckets(path):
+    return SQLiteBuckets(path) if path else MemoryBuckets()
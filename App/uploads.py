@@ -0,0 +1,82 @@
+import hashlib, os, uuid
+
+from flask import current_app
+
+# Upload sets are configured on the app the first time they are needed:
+# Flask-Uploads takes longer to import than the rest of the app's startup.
+def get_upload_set(name, extensions):
+    upload_sets = current_app.extensions.setdefault('upload_sets', {})
+    upload_set = upload_sets.get(name)
+    if upload_set is None:
+        from flask_uploads import UploadSet, configure_uploads
+        upload_set = UploadSet(name, extensions)
+        configure_uploads(current_app, upload_set)
+        upload_sets[name] = upload_set
+    return upload_set
+
+def get_photos():
+    from flask_uploads import DOCUMENTS, IMAGES, TEXT
+    return get_upload_set('photos', TEXT + DOCUMENTS + IMAGES)
+
+def get_resumes():
+    from flask_uploads import DOCUMENTS, TEXT
+    return get_upload_set('resumes', TEXT + DOCUMENTS)
+
+
+'''
+Content-addressed storage
+'''
+
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadNotAllowed(Exception):
+    pass
+
+
+# Files are stored once per distinct content, at <root>/ab/cd/abcd... named
+# by their SHA-256.
+def content_path(root, sha256):
+    return os.path.join(root, sha256[:2], sha256[2:4], sha256)
+
+# Copies `stream` to a temporary file under `root` in CHUNK_SIZE pieces,
+# hashing as it goes, so the body is never held in memory. Stops as soon as
+# more than `max_bytes` arrive. Returns (temporary path, sha256, size).
+def receive(stream, root, max_bytes):
+    os.makedirs(os.path.join(root, 'tmp'), exist_ok=True)
+    tmp_path = os.path.join(root, 'tmp', uuid.uuid4().hex)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f'uploads are limited to {max_bytes} bytes')
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        discard(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest(), size
+
+# Moves a received file to its content address. Replacing an existing copy
+# is harmless: the content is identical.
+def install(tmp_path, root, sha256):
+    path = content_path(root, sha256)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+    return path
+
+def discard(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -3,8 +3,11 @@
 from .user import user_views
 from .index import index_views
 from .auth import auth_views
-from .admin import setup_admin
+from .internship import internship_views
+from .application import application_views
+from .lazy_admin import setup_admin
+from .helpers import setup_fragment_cache
 
 
-views = [user_views, index_views, auth_views] 
+views = [user_views, index_views, auth_views, internship_views, application_views] 
 # blueprints must be added to this list
\ No newline at end of file
@@ -1,9 +1,16 @@
-from flask_admin.contrib.sqla import ModelView
-from flask_jwt_extended import jwt_required, current_user, unset_jwt_cookies, set_access_cookies
+import time
+
+from flask_admin.contrib.sqla import ModelView, filters
+from flask_jwt_extended import jwt_required, current_user
 from flask_admin import Admin
-from flask import flash, redirect, url_for, request
-from App.database import db
-from App.models import User
+from flask import Flask, current_app, flash, redirect, render_template, request
+from sqlalchemy import func, literal
+from sqlalchemy.orm import Query
+from App.database import db, share_db, estimated_row_count
+from App.models import User, Internship, Application
+from App.controllers import (setup_jwt, add_auth_context, get_user_cache, get_response_cache, get_internship_index_store,
+                             get_applicant_index_store, count_applications, move_internship_counts, STATUSES)
+from .helpers import setup_fragment_cache
 
 class AdminView(ModelView):
 
@@ -14,8 +21,134 @@ class AdminView(ModelView):
     def inaccessible_callback(self, name, **kwargs):
         # redirect to login page if user doesn't have access
         flash("Login to access admin")
-        return redirect(url_for('index_page', next=request.url))
+        return redirect(f'/?next={request.url}')
+
+
+class StaffView(AdminView):
+
+    @jwt_required()
+    def is_accessible(self):
+        return current_user is not None and current_user.is_staff()
+
+
+# Stands in for Flask-Admin's `SELECT count(*)` query. Search and filters
+# are applied to it as usual; an unfiltered list shows the view's
+# total_count() instead of counting the table, and a filtered one counts at
+# most ADMIN_COUNT_CAP matching rows.
+class CountQuery:
+
+    def __init__(self, view, query, narrowed=False):
+        self.view = view
+        self.query = query
+        self.narrowed = narrowed
+
+    def __getattr__(self, name):
+        attribute = getattr(self.query, name)
+        if not callable(attribute):
+            return attribute
+        def call(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            return CountQuery(self.view, result, True) if isinstance(result, Query) else result
+        return call
+
+    def scalar(self):
+        if not self.narrowed:
+            return self.view.total_count()
+        capped = self.query.limit(current_app.config['ADMIN_COUNT_CAP']).subquery()
+        return self.view.session.scalar(db.select(func.count()).select_from(capped))
+
+
+# List pages for large tables: relationship columns are eager loaded, only
+# indexed columns are sortable and filterable, and row counts come from
+# total_count() rather than a COUNT(*) over the whole table.
+class LargeTableView(StaffView):
+    page_size = 50
+    can_view_details = True
+    _counts = {}  # model -> (count, expires)
+
+    def get_count_query(self):
+        return CountQuery(self, self.session.query(literal(1)).select_from(self.model))
+
+    # Postgres' estimate where there is one, else an exact count cached for
+    # ADMIN_COUNT_TTL seconds.
+    def total_count(self):
+        estimate = estimated_row_count(self.model)
+        if estimate is not None:
+            return estimate
+        count, expires = self._counts.get(self.model, (None, 0))
+        if expires < time.monotonic():
+            count = self.session.scalar(db.select(func.count()).select_from(self.model))
+            self._counts[self.model] = (count, time.monotonic() + current_app.config['ADMIN_COUNT_TTL'])
+        return count
+
+
+class InternshipView(LargeTableView):
+    can_delete = False  # applications and counters reference internships
+    column_list = ('id', 'title', 'employer.username', 'is_active', 'created_at')
+    column_labels = {'employer.username': 'Employer'}
+    column_select_related_list = (Internship.employer,)
+    column_sortable_list = ('id',)
+    column_default_sort = ('id', True)
+    column_filters = (
+        filters.FilterEqual(Internship.employer_id, 'Employer id'),
+        filters.BooleanEqualFilter(Internship.is_active, 'Active'),
+        filters.DateTimeBetweenFilter(Internship.created_at, 'Created'),
+    )
+    form_columns = ('title', 'description', 'employer', 'is_active')
+    # a select of every user would load the whole table
+    form_ajax_refs = {'employer': {'fields': ('username',), 'page_size': 10}}
+
+    # the per-employer counters follow a reassigned internship
+    def on_model_change(self, form, model, is_created):
+        if not is_created:
+            # employer_id is only synced from the relationship at flush
+            move_internship_counts(model.id, model.employer.id)
+
+
+# Read only: status changes go through the API so transitions are checked
+# and counters and notifications follow.
+class ApplicationView(LargeTableView):
+    can_create = False
+    can_edit = False
+    can_delete = False
+    column_list = ('id', 'student.username', 'internship.title', 'status', 'created_at')
+    column_labels = {'student.username': 'Student', 'internship.title': 'Internship'}
+    column_select_related_list = (Application.student, Application.internship)
+    column_sortable_list = ('id', 'created_at')
+    column_default_sort = ('id', True)
+    column_filters = (
+        filters.FilterEqual(Application.status, 'Status', options=[(status, status) for status in STATUSES]),
+        filters.FilterEqual(Application.internship_id, 'Internship id'),
+        filters.FilterEqual(Application.student_id, 'Student id'),
+        filters.DateTimeBetweenFilter(Application.created_at, 'Created'),
+    )
+
+    # exact and cheap, from the per-internship counters
+    def total_count(self):
+        return count_applications()
+
 
-def setup_admin(app):
-    admin = Admin(app, name='FlaskMVC', template_mode='bootstrap3')
-    admin.add_view(AdminView(User, db.session))
\ No newline at end of file
+# The admin runs as its own Flask app mounted at /admin, sharing the parent's
+# configuration, database engine and the caches its edits must invalidate.
+def create_admin_app(parent):
+    app = Flask(__name__, template_folder='../templates', static_folder='../static')
+    app.config.update(parent.config)
+    add_auth_context(app)
+    setup_fragment_cache(app)
+    share_db(app, parent)
+    jwt = setup_jwt(app)
+    @jwt.invalid_token_loader
+    @jwt.unauthorized_loader
+    def custom_unauthorized_response(error):
+        # the token was just rejected, so skip looking the user up again
+        return render_template('401.html', error=error, is_authenticated=False, current_user=None), 401
+    with parent.app_context():
+        app.extensions['user_cache'] = get_user_cache()
+        app.extensions['response_cache'] = get_response_cache()
+        app.extensions['internship_search'] = get_internship_index_store()
+        app.extensions['applicant_search'] = get_applicant_index_store()
+    admin = Admin(app, name='FlaskMVC', url='/', template_mode='bootstrap3')
+    admin.add_view(AdminView(User, db.session))
+    admin.add_view(InternshipView(Internship, db.session))
+    admin.add_view(ApplicationView(Application, db.session))
+    return app
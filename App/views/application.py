@@ -0,0 +1,131 @@
+from datetime import datetime
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required, current_user
+
+from .helpers import cached_response, page_args, paginated_response, parse_bool, store_resume
+
+from App.controllers import (
+    get_applications_page,
+    get_application,
+    submit_application,
+    bulk_transition,
+    export_applications,
+    get_upload,
+    send_upload,
+    can_view_application_resume,
+    TRANSITIONS,
+    EXPORT_FORMATS
+)
+
+application_views = Blueprint('application_views', __name__, template_folder='../templates')
+
+'''
+API Routes
+'''
+
+@application_views.route('/api/applications', methods=['GET'])
+@jwt_required()
+@cached_response('application', 'application_archive', 'internship', 'internship_archive', 'user', per_user=True)
+def get_applications_action():
+    student_id = request.args.get('student_id', type=int)
+    employer_id = request.args.get('employer_id', type=int)
+    # students page through their own applications and employers through the
+    # ones to their internships; only staff may list everyone's
+    if current_user.is_student():
+        student_id = current_user.id
+    elif current_user.is_employer():
+        employer_id = current_user.id
+    elif not current_user.is_staff():
+        return jsonify(message='only students, employers and staff can list applications'), 403
+    applications, next_cursor = get_applications_page(
+        student_id=student_id,
+        internship_id=request.args.get('internship_id', type=int),
+        employer_id=employer_id,
+        status=request.args.get('status'),
+        include_archived=bool(parse_bool(request.args.get('include_archived'))),
+        **page_args()
+    )
+    return paginated_response([application.get_json() for application in applications], next_cursor)
+
+# Idempotent: submitting twice returns the existing application with 200.
+@application_views.route('/api/applications', methods=['POST'])
+@jwt_required()
+def submit_application_action():
+    if not current_user.is_student():
+        return jsonify(message='only students can apply'), 403
+    internship_id = (request.json or {}).get('internship_id')
+    if not isinstance(internship_id, int):
+        return jsonify(message='internship_id must be an internship id'), 400
+    result, application_id = submit_application(current_user.id, internship_id)
+    if result == 'ineligible':
+        return jsonify(result=result, message='internship not found or no longer open'), 422
+    return jsonify(result=result, application_id=application_id), 201 if result == 'created' else 200
+
+@application_views.route('/api/applications/bulk', methods=['POST'])
+@jwt_required()
+def bulk_transition_action():
+    data = request.json or {}
+    ids = data.get('ids')
+    status = data.get('status')
+    if status not in TRANSITIONS:
+        return jsonify(message=f"status must be one of: {', '.join(TRANSITIONS)}"), 400
+    if not isinstance(ids, list) or not all(isinstance(application_id, int) for application_id in ids):
+        return jsonify(message='ids must be a list of application ids'), 400
+    results = bulk_transition(ids, current_user.id, status)
+    return jsonify(results=[{'id': application_id, 'result': result} for application_id, result in results.items()])
+
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+# Streams every matching application as CSV or NDJSON. Staff may export
+# anything; employers only applications to their own internships.
+@application_views.route('/api/applications/export', methods=['GET'])
+@jwt_required()
+def export_applications_action():
+    if not (current_user.is_staff() or current_user.is_employer()):
+        return jsonify(message='only staff and employers can export applications'), 403
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify(message=f"format must be one of: {', '.join(EXPORT_FORMATS)}"), 400
+    try:
+        since, until = (datetime.fromisoformat(request.args[name]) if request.args.get(name) else None
+                        for name in ('since', 'until'))
+    except ValueError:
+        return jsonify(message='since and until must be ISO dates, e.g. 2025-01-31'), 400
+    employer_id = request.args.get('employer_id', type=int)
+    if current_user.is_employer():
+        employer_id = current_user.id
+    chunks = export_applications(
+        fmt,
+        internship_id=request.args.get('internship_id', type=int),
+        employer_id=employer_id,
+        status=request.args.get('status'),
+        since=since,
+        until=until,
+        include_archived=bool(parse_bool(request.args.get('include_archived')))
+    )
+    response = Response(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename=applications.{fmt}'
+    return response
+
+# Students attach a CV by sending the raw file as the request body, e.g.
+#   curl -X PUT --data-binary @cv.pdf '/api/applications/5/resume?filename=cv.pdf'
+# The body is streamed to disk, never held in memory.
+@application_views.route('/api/applications/<int:application_id>/resume', methods=['PUT'])
+@jwt_required()
+def upload_application_resume_action(application_id):
+    application = get_application(application_id)
+    if not application or application.student_id != current_user.id:
+        return jsonify(message='application not found'), 404
+    return store_resume([application])
+
+@application_views.route('/api/applications/<int:application_id>/resume', methods=['GET'])
+@jwt_required()
+def download_application_resume_action(application_id):
+    application = get_application(application_id, include_archived=bool(parse_bool(request.args.get('include_archived'))))
+    if not application or not can_view_application_resume(current_user, application):
+        return jsonify(message='application not found'), 404
+    upload = get_upload(application.resume_id)
+    if upload is None:
+        return jsonify(message='no resume attached'), 404
+    return send_upload(upload, f'application-{application.id}-{upload.filename}')
@@ -1,4 +1,6 @@
-from flask import Blueprint, render_template, jsonify, request, flash, send_from_directory, flash, redirect, url_for
+import math
+
+from flask import Blueprint, render_template, jsonify, request, flash, send_from_directory, flash, redirect, url_for, make_response
 from flask_jwt_extended import jwt_required, current_user, unset_jwt_cookies, set_access_cookies
 
 
@@ -6,7 +8,7 @@ from.index import index_views
 
 from App.controllers import (
     login,
-
+    throttle_login
 )
 
 auth_views = Blueprint('auth_views', __name__, template_folder='../templates')
@@ -27,6 +29,12 @@ def identify_page():
 @auth_views.route('/login', methods=['POST'])
 def login_action():
     data = request.form
+    retry_after = throttle_login(data['username'], request.remote_addr)
+    if retry_after:
+        response = make_response(render_template('message.html', title="Too Many Attempts",
+                                                  message="Too many login attempts, please try again shortly"), 429)
+        response.headers['Retry-After'] = str(math.ceil(retry_after))
+        return response
     token = login(data['username'], data['password'])
     response = redirect(request.referrer)
     if not token:
@@ -50,6 +58,13 @@ API Routes
 @auth_views.route('/api/login', methods=['POST'])
 def user_login_api():
   data = request.json
+  if not (isinstance(data.get('username'), str) and isinstance(data.get('password'), str)):
+    return jsonify(message='bad username or password given'), 401
+  retry_after = throttle_login(data['username'], request.remote_addr)
+  if retry_after:
+    response = jsonify(message='too many login attempts, try again later', retry_after=math.ceil(retry_after))
+    response.headers['Retry-After'] = str(math.ceil(retry_after))
+    return response, 429
   token = login(data['username'], data['password'])
   if not token:
     return jsonify(message='bad username or password given'), 401
@@ -0,0 +1,137 @@
+import hashlib, json
+from functools import wraps
+
+from flask import jsonify, make_response, request, url_for
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from App.controllers import get_request_user, get_response_cache, table_versions, upload_resume, UploadTooLarge, UploadNotAllowed
+
+
+def parse_bool(value):
+    if value is None:
+        return None
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+def page_args():
+    return {
+        'limit': request.args.get('limit', type=int),
+        'after': request.args.get('after', type=int),
+    }
+
+# Pages are returned as a plain JSON list so existing clients keep working;
+# the cursor for the next page travels in the X-Next-Cursor and Link headers.
+def paginated_response(items, next_cursor):
+    response = jsonify(items)
+    if next_cursor is not None:
+        args = request.args.to_dict()
+        args['after'] = next_cursor
+        next_url = url_for(request.endpoint, **(request.view_args or {}), **args)
+        response.headers['X-Next-Cursor'] = str(next_cursor)
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response
+
+
+CACHED_HEADERS = ('X-Next-Cursor', 'Link')
+
+# Caches successful GET responses under the endpoint, its arguments and the
+# current versions of `tables`, the tables the response is built from. Any
+# commit to one of them changes the key, so entries never need to be purged.
+# Responses carry a strong ETag of their body and If-None-Match is answered
+# with 304. Views whose output depends on who is asking pass per_user=True
+# and must sit below jwt_required.
+def cached_response(*tables, per_user=False):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = table_versions(tables)
+            if versions is None:
+                return view(*args, **kwargs)
+            parts = [request.endpoint, sorted((request.view_args or {}).items()),
+                     sorted(request.args.items(multi=True)), versions]
+            if per_user:
+                user = get_request_user()
+                parts.append(user.id if user else None)
+            key = 'response:' + hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+            cache = get_response_cache()
+            entry = cache.get(key)
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+                entry = (body, response.mimetype, headers, hashlib.sha256(body).hexdigest()[:32])
+                cache.set(key, entry, size=len(body))
+                response.headers['X-Cache'] = 'MISS'
+            else:
+                body, mimetype, headers, _ = entry
+                response = make_response(body)
+                response.mimetype = mimetype
+                response.headers.update(headers)
+                response.headers['X-Cache'] = 'HIT'
+            response.set_etag(entry[3])
+            response.headers['Cache-Control'] = 'private, no-cache' if per_user else 'no-cache'
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+# The same for parts of a server-rendered page:
+#
+#   {% cache 'users-table', tables=('user',) %} ... {% endcache %}
+#
+# renders the block once per version of `tables` and reuses the HTML until a
+# commit touches one of them. per_user=True adds the logged in user to the
+# key; `vary` adds any other value the block depends on. The page around the
+# block (layout, navigation, flashed messages) is rendered on every request,
+# so a cached block must not read the user or the request unless it says so
+# in its key. Values a block needs should be passed as callables (e.g.
+# users=get_all_users) so a hit skips the queries too.
+class FragmentCache(Extension):
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [nodes.Const(parser.name), parser.parse_expression()]
+        kwargs = []
+        while parser.stream.skip_if('comma'):
+            key = parser.stream.expect('name').value
+            parser.stream.expect('assign')
+            kwargs.append(nodes.Keyword(key, parser.parse_expression()))
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', args, kwargs), [], [], body).set_lineno(lineno)
+
+    def _render(self, template, name, tables=(), per_user=False, vary=None, caller=None):
+        versions = table_versions(tables)
+        if versions is None:
+            return caller()
+        parts = [template, name, list(tables), versions, vary]
+        if per_user:
+            user = get_request_user()
+            parts.append(user.id if user else None)
+        key = 'fragment:' + hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+        cache = get_response_cache()
+        html = cache.get(key)
+        if html is None:
+            html = str(caller())
+            cache.set(key, html, size=len(html))
+        return Markup(html)
+
+def setup_fragment_cache(app):
+    app.jinja_env.add_extension(FragmentCache)
+
+
+# Streams the request body into resume storage and links it to `owners`.
+def store_resume(owners):
+    filename = request.args.get('filename') or request.headers.get('X-Filename')
+    if not filename:
+        return jsonify(message='pass the file name as ?filename= or an X-Filename header'), 400
+    try:
+        upload = upload_resume(request.stream, filename, owners, content_length=request.content_length)
+    except UploadTooLarge as e:
+        return jsonify(message=str(e)), 413
+    except UploadNotAllowed as e:
+        return jsonify(message=str(e)), 415
+    return jsonify(upload.get_json()), 201
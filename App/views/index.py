@@ -1,5 +1,6 @@
-from flask import Blueprint, redirect, render_template, request, send_from_directory, jsonify
-from App.controllers import create_user, initialize
+from flask import Blueprint, Response, current_app, redirect, render_template, request, send_from_directory, jsonify
+from App.controllers import create_user, initialize, user_cache_stats, response_cache_stats
+from App.metrics import render_metrics
 
 index_views = Blueprint('index_views', __name__, template_folder='../templates')
 
@@ -14,4 +15,12 @@ def init():
 
 @index_views.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({'status':'healthy'})
\ No newline at end of file
+    return jsonify({'status':'healthy'})
+
+@index_views.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({'user_cache': user_cache_stats(), 'response_cache': response_cache_stats()})
+
+@index_views.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(render_metrics(current_app.config['METRICS_DIR']), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,80 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, current_user
+
+from .helpers import cached_response, page_args, paginated_response, parse_bool
+
+from App.controllers import (
+    get_internships_page,
+    get_internship_by_id,
+    search_internships,
+    recommend_internships,
+    get_internship_counts,
+    get_employer_counts,
+    rank_applicants
+)
+
+internship_views = Blueprint('internship_views', __name__, template_folder='../templates')
+
+'''
+API Routes
+'''
+
+@internship_views.route('/api/internships', methods=['GET'])
+@cached_response('internship', 'internship_archive', 'user')
+def get_internships_action():
+    internships, next_cursor = get_internships_page(
+        employer_id=request.args.get('employer_id', type=int),
+        is_active=parse_bool(request.args.get('is_active')),
+        include_archived=bool(parse_bool(request.args.get('include_archived'))),
+        **page_args()
+    )
+    return paginated_response([internship.get_json() for internship in internships], next_cursor)
+
+@internship_views.route('/api/internships/search', methods=['GET'])
+@cached_response('internship', 'user')
+def search_internships_action():
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    results = search_internships(request.args.get('q', ''), limit)
+    return jsonify([dict(internship.get_json(), score=round(score, 4)) for internship, score in results])
+
+@internship_views.route('/api/internships/recommended', methods=['GET'])
+@jwt_required()
+def recommended_internships_action():
+    if not current_user.is_student():
+        return jsonify(message='only students receive recommendations'), 403
+    k = max(1, min(request.args.get('k', 10, type=int), 100))
+    results = recommend_internships(current_user.id, k)
+    return jsonify([dict(internship.get_json(), score=round(score, 4)) for internship, score in results])
+
+@internship_views.route('/api/internships/<int:internship_id>/stats', methods=['GET'])
+@jwt_required()
+def internship_stats_action(internship_id):
+    include_archived = bool(parse_bool(request.args.get('include_archived')))
+    internship = get_internship_by_id(internship_id, include_archived)
+    if not internship:
+        return jsonify(message='internship not found'), 404
+    if not (current_user.is_staff() or current_user.id == internship.employer_id):
+        return jsonify(message='only staff or the owning employer can view these counts'), 403
+    return jsonify(dict(get_internship_counts(internship_id, include_archived), internship_id=internship_id))
+
+@internship_views.route('/api/internships/<int:internship_id>/applications', methods=['GET'])
+@jwt_required()
+def rank_applicants_action(internship_id):
+    internship = get_internship_by_id(internship_id)
+    if not internship:
+        return jsonify(message='internship not found'), 404
+    if not (current_user.is_staff() or current_user.id == internship.employer_id):
+        return jsonify(message='only staff or the owning employer can search applicants'), 403
+    skills = [skill for skill in request.args.get('skills', '').split(',') if skill.strip()]
+    if not skills:
+        return jsonify(message='skills is required, e.g. ?skills=python,sql'), 400
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    results = rank_applicants(internship_id, skills, limit)
+    return jsonify([dict(application.get_json(), score=round(score, 4)) for application, score in results])
+
+@internship_views.route('/api/employers/<int:employer_id>/stats', methods=['GET'])
+@jwt_required()
+def employer_stats_action(employer_id):
+    if not (current_user.is_staff() or current_user.id == employer_id):
+        return jsonify(message='only staff or the employer can view these counts'), 403
+    return jsonify(get_employer_counts(employer_id))
@@ -0,0 +1,31 @@
+import threading
+
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+
+ADMIN_URL = '/admin'
+
+# Flask-Admin is slow to import and most workers never serve an admin page,
+# so it is imported and built on the first request under /admin. Flask does
+# not allow blueprints to be registered once requests are being served, so
+# the admin is a separate app (see admin.py) dispatched to at the WSGI level.
+class LazyAdmin:
+
+    def __init__(self, app, wsgi_app):
+        self.app = app
+        self.wsgi_app = wsgi_app
+        self.dispatcher = None
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if path != ADMIN_URL and not path.startswith(ADMIN_URL + '/'):
+            return self.wsgi_app(environ, start_response)
+        if self.dispatcher is None:
+            with self._lock:
+                if self.dispatcher is None:
+                    from .admin import create_admin_app
+                    self.dispatcher = DispatcherMiddleware(self.wsgi_app, {ADMIN_URL: create_admin_app(self.app)})
+        return self.dispatcher(environ, start_response)
+
+def setup_admin(app):
+    app.wsgi_app = LazyAdmin(app, app.wsgi_app)
@@ -2,11 +2,16 @@ from flask import Blueprint, render_template, jsonify, request, send_from_direct
 from flask_jwt_extended import jwt_required, current_user as jwt_current_user
 
 from.index import index_views
+from .helpers import cached_response, page_args, paginated_response, store_resume
 
 from App.controllers import (
     create_user,
     get_all_users,
     get_all_users_json,
+    get_users_page,
+    get_user,
+    get_upload,
+    send_upload,
     jwt_required
 )
 
@@ -14,8 +19,8 @@ user_views = Blueprint('user_views', __name__, template_folder='../templates')
 
 @user_views.route('/users', methods=['GET'])
 def get_user_page():
-    users = get_all_users()
-    return render_template('users.html', users=users)
+    # the table is a cached fragment; the query runs only when it is rebuilt
+    return render_template('users.html', users=get_all_users)
 
 @user_views.route('/users', methods=['POST'])
 def create_user_action():
@@ -25,9 +30,10 @@ def create_user_action():
     return redirect(url_for('user_views.get_user_page'))
 
 @user_views.route('/api/users', methods=['GET'])
+@cached_response('user')
 def get_users_action():
-    users = get_all_users_json()
-    return jsonify(users)
+    users, next_cursor = get_users_page(role=request.args.get('role'), **page_args())
+    return paginated_response([user.get_json() for user in users], next_cursor)
 
 @user_views.route('/api/users', methods=['POST'])
 def create_user_endpoint():
@@ -35,6 +41,22 @@ def create_user_endpoint():
     user = create_user(data['username'], data['password'])
     return jsonify({'message': f"user {user.username} created with id {user.id}"})
 
+# The logged in student's current CV, used for new applications.
+@user_views.route('/api/resume', methods=['PUT'])
+@jwt_required()
+def upload_resume_action():
+    if not jwt_current_user.is_student():
+        return jsonify(message='only students upload resumes'), 403
+    return store_resume([get_user(jwt_current_user.id)])
+
+@user_views.route('/api/resume', methods=['GET'])
+@jwt_required()
+def download_resume_action():
+    upload = get_upload(get_user(jwt_current_user.id).resume_id)
+    if upload is None:
+        return jsonify(message='no resume uploaded'), 404
+    return send_upload(upload)
+
 @user_views.route('/static/users', methods=['GET'])
 def static_user_page():
   return send_from_directory('static', 'static-user.html')
\ No newline at end of file
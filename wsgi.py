@@ -1,11 +1,14 @@
-import click, pytest, sys
+import click, sys
 from flask.cli import with_appcontext, AppGroup
 
 from App.main import create_app
 from App.database import db, get_migrate
 
 app = create_app()
-migrate = get_migrate(app)
+# Flask-Migrate pulls in alembic; only the flask CLI (`flask db ...`) loads
+# this module inside a click context, web workers never need it
+if click.get_current_context(silent=True) is not None:
+    migrate = get_migrate(app)
 
 # Init Command
 @app.cli.command("init", help="Creates and initializes the database")
@@ -17,8 +20,33 @@ def init():
     create_student('student1', 'pass')
     create_staff('staff1', 'pass')
     create_employer('employer1', 'pass')
+    from App.controllers.search import rebuild_search_index
+    rebuild_search_index()
     print('Database initialized with default users')
 
+# Seed Command
+@app.cli.command("seed", help="Fill the database with deterministic synthetic data for scale testing")
+@click.option("--users", default=2000, show_default=True)
+@click.option("--internships", default=500, show_default=True)
+@click.option("--applications", default=10000, show_default=True)
+@click.option("--seed", default=0, show_default=True, help="random seed; the same seed gives the same data")
+@click.option("--prefix", default="seed", show_default=True, help="username prefix, e.g. seed_student1")
+@click.option("--password", default="pass", show_default=True, help="password of every seeded user")
+@click.option("--days", default=365, show_default=True, help="spread creation dates over this many days")
+@click.option("--hash-each", is_flag=True, help="hash every user's password separately (slow) instead of reusing one hash")
+def seed_command(users, internships, applications, seed, prefix, password, days, hash_each):
+    import time
+    from App.models import User
+    from App.benchmarks.seed import seed_data
+    if db.session.scalar(db.select(User.id).where(User.username.like(f'{prefix}\\_%', escape='\\')).limit(1)):
+        raise click.UsageError(f"users named {prefix}_... already exist, pick another --prefix")
+    start = time.perf_counter()
+    data = seed_data(users, internships, applications, seed, password, prefix, days, hash_each)
+    seconds = time.perf_counter() - start
+    print(f"Seeded {len(data['students']) + len(data['employers']) + len(data['staff'])} users, "
+          f"{len(data['internships'])} internships and {len(data['applied'])} applications in {seconds:.1f}s")
+    print(f"Log in as {prefix}_student1, {prefix}_employer1 or {prefix}_staff1 with password '{password}'")
+
 # User Commands 
 user_cli = AppGroup('user', help='User object commands')
 
@@ -53,6 +81,24 @@ def list_user_command():
     for user in users:
         print(f'{user.id}: {user.username} ({user.role})')
 
+# Bulk import helpers shared by the user, internship and application groups
+def import_file(path, importer, **kwargs):
+    from App.controllers.importer import read_rows, detect_format
+    with open(path, newline='') as stream:
+        report = importer(read_rows(stream, detect_format(path)), **kwargs)
+    for number, message in report.errors:
+        print(f'Row {number}: {message}')
+    print(f'Imported {report.created} of {report.rows} rows in {report.seconds:.2f}s '
+          f'({report.rate:.0f} rows/s, {len(report.errors)} errors)')
+
+@user_cli.command("import", help="Bulk import users from a CSV or JSON lines file (username, password, role)")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", default=500, help="Rows per insert batch")
+@click.option("--workers", type=int, default=None, help="Password hashing processes (0 = hash in this process)")
+def import_users_command(path, batch_size, workers):
+    from App.controllers.importer import import_users
+    import_file(path, import_users, batch_size=batch_size, workers=workers)
+
 app.cli.add_command(user_cli)
 
 # Internship Commands 
@@ -94,6 +140,50 @@ def list_internships_command():
     except Exception as e:
         print(f"Error listing internships: {e}")
 
+@internship_cli.command("close", help="Stop accepting applications for an internship (Employer only)")
+@click.argument("internship_id", type=int)
+@click.argument("employer_id", type=int)
+def close_internship_command(internship_id, employer_id):
+    from App.controllers.internship import set_internship_active
+    if set_internship_active(internship_id, employer_id, False) is None:
+        print("Cannot close internship. Only the employer who owns the internship can close it.")
+    else:
+        print(f"Internship {internship_id} closed")
+
+@internship_cli.command("reopen", help="Reopen a closed internship (Employer only)")
+@click.argument("internship_id", type=int)
+@click.argument("employer_id", type=int)
+def reopen_internship_command(internship_id, employer_id):
+    from App.controllers.internship import set_internship_active
+    if set_internship_active(internship_id, employer_id, True) is None:
+        print("Cannot reopen internship. Only the employer who owns the internship can reopen it.")
+    else:
+        print(f"Internship {internship_id} reopened")
+
+@internship_cli.command("import", help="Bulk import internships from a CSV or JSON lines file (employer_id, title, description)")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", default=500, help="Rows per insert batch")
+def import_internships_command(path, batch_size):
+    from App.controllers.importer import import_internships
+    import_file(path, import_internships, batch_size=batch_size)
+
+@internship_cli.command("search", help="Search active internships")
+@click.argument("query")
+@click.option("--limit", default=10, help="Maximum number of results")
+def search_internships_command(query, limit):
+    from App.controllers.search import search_internships
+    results = search_internships(query, limit)
+    if not results:
+        print("No matching internships found.")
+    for internship, score in results:
+        print(f"{internship.id}: {internship.title} ({score:.2f})")
+
+@internship_cli.command("reindex", help="Rebuild the internship search index from the database")
+def reindex_internships_command():
+    from App.controllers.search import rebuild_search_index
+    rebuild_search_index()
+    print("Search index rebuilt")
+
 app.cli.add_command(internship_cli)
 
 # Test Commands
@@ -102,24 +192,44 @@ test = AppGroup('test', help='Testing commands')
 @test.command("user", help="Run User tests")
 @click.argument("type", default="all")
 def user_tests_command(type):
+    import pytest
     if type == "unit":
         sys.exit(pytest.main(["-k", "UserUnitTests"]))
     elif type == "int":
         sys.exit(pytest.main(["-k", "UserIntegrationTests"]))
     else:
         sys.exit(pytest.main(["-k", "App"]))
-    
+
+@test.command("bench", help="Seed a throwaway database, time controllers and endpoints, compare with a baseline")
+@click.option("--users", default=2000, show_default=True)
+@click.option("--internships", default=500, show_default=True)
+@click.option("--applications", default=10000, show_default=True)
+@click.option("--iterations", default=50, show_default=True, help="timed calls per benchmark")
+@click.option("--seed", default=0, show_default=True)
+@click.option("--output", default="bench-results.json", show_default=True, help="where to write the results")
+@click.option("--baseline", "baseline_path", default=None, help="baseline JSON (default: App/benchmarks/baseline.json)")
+@click.option("--tolerance", default=0.25, show_default=True, help="allowed fractional slowdown of each median")
+@click.option("--update-baseline", is_flag=True, help="store these results as the new baseline")
+@click.option("--database-uri", default=None, help="benchmark this empty database instead of a temporary SQLite file; its tables are dropped afterwards")
+@click.option("--only", multiple=True, help="run just the named benchmarks")
+def bench_command(users, internships, applications, iterations, seed, output, baseline_path, tolerance,
+                  update_baseline, database_uri, only):
+    from App.benchmarks.suite import run_suite, DEFAULT_BASELINE
+    sys.exit(run_suite(users, internships, applications, iterations, seed, output, baseline_path or DEFAULT_BASELINE,
+                       tolerance, update_baseline, database_uri, set(only) or None))
+
 app.cli.add_command(test)
 
 #print("wsgi.py loaded successfully!")
 
 # Application Commands
 from App.controllers.application import (
-    create_application,
+    submit_application,
     shortlist_application,
     accept_application,
     reject_application,
-    get_student_applications
+    get_student_applications,
+    get_all_applications
 )
 
 # Create the CLI group
@@ -130,11 +240,13 @@ application_cli = AppGroup('application', help='Application management commands'
 @click.argument("student_id", type=int)
 @click.argument("internship_id", type=int)
 def create_application_command(student_id, internship_id):
-    app_obj = create_application(student_id, internship_id)
-    if app_obj is None:
-        print("Cannot create application. Make sure the user is a student and the internship exists.")
+    result, application_id = submit_application(student_id, internship_id)
+    if result == 'created':
+        print(f"Application {application_id} created! Student {student_id} → Internship {internship_id}")
+    elif result == 'duplicate':
+        print(f"Student {student_id} already applied to internship {internship_id} (application {application_id}).")
     else:
-        print(f"Application created! Student {student_id} → Internship {internship_id}")
+        print("Cannot create application. Make sure the user is a student and the internship exists and is open.")
 
 # Staff shortlists
 @application_cli.command("shortlist", help="Shortlist an application (Staff only)")
@@ -143,7 +255,7 @@ def create_application_command(student_id, internship_id):
 def shortlist_application_command(application_id, staff_id):
     app_obj = shortlist_application(application_id, staff_id)
     if app_obj is None:
-        print("Cannot shortlist application. Only staff can shortlist valid applications.")
+        print("Cannot shortlist application. Only staff can shortlist pending applications.")
     else:
         print(f"Application {application_id} shortlisted by Staff {staff_id}")
 
@@ -154,7 +266,7 @@ def shortlist_application_command(application_id, staff_id):
 def accept_application_command(application_id, employer_id):
     app_obj = accept_application(application_id, employer_id)
     if app_obj is None:
-        print("Cannot accept application. Only the employer who owns the internship can accept.")
+        print("Cannot accept application. Only the employer who owns the internship can accept a pending or shortlisted application.")
     else:
         print(f"Application {application_id} accepted by Employer {employer_id}")
 
@@ -165,15 +277,27 @@ def accept_application_command(application_id, employer_id):
 def reject_application_command(application_id, employer_id):
     app_obj = reject_application(application_id, employer_id)
     if app_obj is None:
-        print("Cannot reject application. Only the employer who owns the internship can reject.")
+        print("Cannot reject application. Only the employer who owns the internship can reject a pending or shortlisted application.")
     else:
         print(f"Application {application_id} rejected by Employer {employer_id}")
 
+# Staff/Employer change many applications at once
+@application_cli.command("bulk", help="Shortlist (Staff), accept or reject (Employer) many applications at once")
+@click.argument("status", type=click.Choice(['shortlisted', 'accepted', 'rejected']))
+@click.argument("actor_id", type=int)
+@click.argument("application_ids", type=int, nargs=-1, required=True)
+def bulk_transition_command(status, actor_id, application_ids):
+    from App.controllers.application import bulk_transition
+    results = bulk_transition(application_ids, actor_id, status)
+    for application_id, result in results.items():
+        print(f"  {application_id}: {result}")
+    updated = sum(1 for result in results.values() if result == 'updated')
+    print(f"{updated} of {len(results)} applications {status}")
+
 # List all applications
 @application_cli.command("list", help="List all applications")
 def list_applications_command():
-    from App.models.application import Application  # Import the model here
-    applications = Application.query.all()
+    applications = get_all_applications()
     if not applications:
         print("No applications found.")
     else:
@@ -196,5 +320,160 @@ def student_applications_command(student_id):
             student_name = app_obj.student.username if app_obj.student else f"Student {app_obj.student_id}"
             print(f"  {app_obj.id}: {internship_title} | {student_name} | Status: {app_obj.status}")
 
+# Bulk import
+@application_cli.command("import", help="Bulk import applications from a CSV or JSON lines file (student_id, internship_id)")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", default=500, help="Rows per insert batch")
+def import_applications_command(path, batch_size):
+    from App.controllers.importer import import_applications
+    import_file(path, import_applications, batch_size=batch_size)
+
+# Stream applications joined with students and internships to a file
+@application_cli.command("export", help="Export applications as CSV or NDJSON")
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default="csv", show_default=True)
+@click.option("--output", type=click.File("w"), default="-", help="File to write (default stdout)")
+@click.option("--internship-id", type=int, default=None)
+@click.option("--employer-id", type=int, default=None)
+@click.option("--status", default=None)
+@click.option("--since", type=click.DateTime(), default=None, help="created on or after")
+@click.option("--until", type=click.DateTime(), default=None, help="created before")
+def export_applications_command(fmt, output, internship_id, employer_id, status, since, until):
+    from App.controllers.export import export_applications
+    for chunk in export_applications(fmt, internship_id=internship_id, employer_id=employer_id,
+                                     status=status, since=since, until=until):
+        output.write(chunk)
+
+# Recommendations for one student
+@application_cli.command("recommend", help="Recommend internships for a student")
+@click.argument("student_id", type=int)
+@click.option("-k", default=10, help="Number of recommendations")
+def recommend_command(student_id, k):
+    from App.controllers.recommendation import recommend_internships
+    results = recommend_internships(student_id, k)
+    if not results:
+        print(f"No recommendations for student {student_id}")
+    for internship, score in results:
+        print(f"  {internship.id}: {internship.title} ({score:.2f})")
+
+# Nightly digest: recommendations for every student as JSON lines
+@application_cli.command("digest", help="Write recommendations for all students as JSON lines")
+@click.option("-k", default=10, help="Recommendations per student")
+@click.option("--output", type=click.File("w"), default="-", help="File to write (default stdout)")
+def digest_command(k, output):
+    import json
+    from App.controllers.recommendation import recommend_for_all_students
+    for student_id, hits in recommend_for_all_students(k).items():
+        output.write(json.dumps({
+            'student_id': student_id,
+            'internships': [{'id': internship_id, 'score': round(score, 4)} for internship_id, score in hits]
+        }) + '\n')
+
 # Register the CLI group with the Flask app
 app.cli.add_command(application_cli)
+
+# Stats Commands
+stats_cli = AppGroup('stats', help='Application counter commands')
+
+@stats_cli.command("rebuild", help="Recompute the per-internship application counters from scratch")
+def rebuild_stats_command():
+    from App.controllers.stats import rebuild_counts
+    print(f"Rebuilt counters for {rebuild_counts()} internships")
+
+@stats_cli.command("employer", help="Show application counts for an employer's internships")
+@click.argument("employer_id", type=int)
+def employer_stats_command(employer_id):
+    from App.controllers.stats import get_employer_counts, STATUSES
+    counts = get_employer_counts(employer_id)
+    for row in counts['internships']:
+        print(f"  Internship {row['internship_id']}: " + ', '.join(f"{status} {row[status]}" for status in STATUSES))
+    print("Total: " + ', '.join(f"{status} {counts['totals'][status]}" for status in STATUSES))
+
+app.cli.add_command(stats_cli)
+
+# Worker Commands
+worker_cli = AppGroup('worker', help='Background worker commands')
+
+@worker_cli.command("run", help="Deliver queued outbox events (notifications) until interrupted")
+@click.option("--batch-size", default=None, type=int, help="Events claimed per batch (default OUTBOX_BATCH_SIZE)")
+@click.option("--poll-interval", default=None, type=float, help="Seconds to wait when idle (default OUTBOX_POLL_SECONDS)")
+@click.option("--once", is_flag=True, help="Process a single batch and exit")
+def worker_run_command(batch_size, poll_interval, once):
+    import logging, signal
+    from App.controllers.outbox import run_worker, run_outbox_batch
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if once:
+        delivered, failed = run_outbox_batch(batch_size=batch_size)
+        print(f"{delivered} delivered, {failed} failed")
+        return
+    stopping = []
+    # finish the event in hand, then exit
+    signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+    try:
+        run_worker(lambda: bool(stopping), batch_size, poll_interval)
+    except KeyboardInterrupt:
+        pass
+
+@worker_cli.command("status", help="Show how many outbox events are pending, delivered and failed")
+def worker_status_command():
+    from App.controllers.outbox import outbox_counts
+    counts = outbox_counts()
+    print(', '.join(f"{key} {value}" for key, value in counts.items()))
+
+@worker_cli.command("retry-failed", help="Queue events that exhausted their attempts for delivery again")
+def worker_retry_command():
+    from App.controllers.outbox import retry_failed_events
+    print(f"Requeued {retry_failed_events()} events")
+
+app.cli.add_command(worker_cli)
+
+# Upload Commands
+uploads_cli = AppGroup('uploads', help='Uploaded file commands')
+
+@uploads_cli.command("gc", help="Delete uploaded files no user or application links to any more")
+def uploads_gc_command():
+    from App.controllers.upload import collect_unused_uploads
+    print(f"Removed {collect_unused_uploads()} unused uploads")
+
+@uploads_cli.command("extract", help="Extract resume text for the applicant search and refresh its index")
+@click.option("--all", "force", is_flag=True, help="Extract every linked upload again, not only new ones")
+def uploads_extract_command(force):
+    from App.controllers.resume import extract_all_uploads, rebuild_applicant_index
+    count = extract_all_uploads(force)
+    rebuild_applicant_index()
+    print(f"Extracted {count} uploads")
+
+app.cli.add_command(uploads_cli)
+
+# Archive Commands
+archive_cli = AppGroup('archive', help='Archive old applications and internships')
+
+@archive_cli.command("run", help="Move decided applications and closed internships older than --older-than days to the archive tables")
+@click.option("--older-than", "days", default=None, type=int, help="Age in days (default ARCHIVE_AFTER_DAYS)")
+@click.option("--batch-size", default=None, type=int, help="Rows moved per transaction (default ARCHIVE_BATCH_SIZE)")
+@click.option("--every", default=None, type=float, help="Keep running, archiving every this many seconds")
+def archive_run_command(days, batch_size, every):
+    import logging, signal
+    from App.controllers.archive import run_archive, run_archive_schedule
+    if not every:
+        moved = run_archive(days, batch_size)
+        print(f"Archived {moved['applications']} applications, {moved['internships']} internships")
+        return
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    stopping = []
+    # finish the batch in hand, then exit
+    signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+    try:
+        run_archive_schedule(lambda: bool(stopping), every, days, batch_size)
+    except KeyboardInterrupt:
+        pass
+
+@archive_cli.command("partitions", help="Create the application archive's term partitions between two dates (Postgres only)")
+@click.argument("start", type=click.DateTime(formats=['%Y-%m-%d']))
+@click.argument("end", type=click.DateTime(formats=['%Y-%m-%d']))
+def archive_partitions_command(start, end):
+    from App.controllers.archive import ensure_archive_partitions
+    names = ensure_archive_partitions(start, end)
+    db.session.commit()
+    print('\n'.join(names) if names else 'Nothing to do: the database does not support partitioning')
+
+app.cli.add_command(archive_cli)